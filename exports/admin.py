@@ -1,2 +1,17 @@
-# Export functionality is available through API endpoints
-# No admin interface needed for exports
+from django.contrib import admin
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Read-only view of background export jobs"""
+    
+    list_display = ['id', 'format', 'status', 'rows_written', 'rows_total', 'bytes_written', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'format']
+    readonly_fields = [
+        'format', 'params', 'digest', 'catalogue_version', 'status', 'rows_total', 'rows_written',
+        'bytes_written', 'file', 'error', 'stats', 'created_by', 'created_at', 'updated_at', 'started_at', 'finished_at'
+    ]
+    
+    def has_add_permission(self, request):
+        return False
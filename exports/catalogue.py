@@ -0,0 +1,232 @@
+"""
+PDF catalogue
+Brochure with one card (thumbnail, title, price, location and key figures)
+per listing, LISTINGS_PER_PAGE cards to a page. Listings are split into parts
+of PAGES_PER_PART pages that are rendered by separate worker processes and
+then concatenated, and the time spent on every page is reported.
+
+Worker processes are spawned, not forked, and only receive plain listing
+dicts and thumbnail paths, so they never touch the database connection.
+"""
+
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.conf import settings
+from django.utils import timezone
+from pypdf import PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from .thumbnails import prefetch_thumbnails
+
+
+CATALOGUE_FIELDS = [
+    'reference', 'title', 'category', 'price', 'square_meters', 'region', 'town',
+    'bedrooms', 'bathrooms', 'energy_rating', 'main_image'
+]
+
+COLUMNS = 2
+ROWS = 2
+LISTINGS_PER_PAGE = COLUMNS * ROWS
+PAGES_PER_PART = 10
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 36
+GUTTER = 18
+HEADER_HEIGHT = 36
+CARD_WIDTH = (PAGE_WIDTH - 2 * MARGIN - (COLUMNS - 1) * GUTTER) / COLUMNS
+CARD_HEIGHT = (PAGE_HEIGHT - 2 * MARGIN - HEADER_HEIGHT - (ROWS - 1) * GUTTER) / ROWS
+IMAGE_HEIGHT = CARD_WIDTH * 3 / 4
+PADDING = 8
+
+
+def _fit(text, font, size, width, max_lines):
+    """``text`` wrapped to ``width``, cut to ``max_lines`` with an ellipsis"""
+    lines = simpleSplit(text or '', font, size, width)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        last = lines[-1]
+        while last and stringWidth(last + '…', font, size) > width:
+            last = last[:-1]
+        lines[-1] = last.rstrip() + '…'
+    return lines
+
+
+def _figures(listing):
+    figures = []
+    if listing['bedrooms'] is not None:
+        figures.append(f"{listing['bedrooms']} bed")
+    if listing['bathrooms'] is not None:
+        figures.append(f"{listing['bathrooms']} bath")
+    if listing['square_meters']:
+        figures.append(f"{listing['square_meters']:,.0f} m²")
+    if listing['energy_rating']:
+        figures.append(f"Energy {listing['energy_rating']}")
+    return ' · '.join(figures)
+
+
+def _draw_card(pdf, listing, x, y):
+    """Draw one listing with its top left corner at ``(x, y)``"""
+    pdf.setStrokeColor(colors.lightgrey)
+    pdf.rect(x, y - CARD_HEIGHT, CARD_WIDTH, CARD_HEIGHT)
+
+    image_bottom = y - IMAGE_HEIGHT
+    if listing['thumbnail']:
+        pdf.drawImage(listing['thumbnail'], x, image_bottom, CARD_WIDTH, IMAGE_HEIGHT,
+                      preserveAspectRatio=True, anchor='c')
+    else:
+        pdf.setFillColor(colors.whitesmoke)
+        pdf.rect(x, image_bottom, CARD_WIDTH, IMAGE_HEIGHT, stroke=0, fill=1)
+        pdf.setFillColor(colors.grey)
+        pdf.setFont('Helvetica', 10)
+        pdf.drawCentredString(x + CARD_WIDTH / 2, image_bottom + IMAGE_HEIGHT / 2, 'No image')
+
+    text_x = x + PADDING
+    text_width = CARD_WIDTH - 2 * PADDING
+    line_y = image_bottom - PADDING - 11
+
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Helvetica-Bold', 11)
+    for line in _fit(listing['title'], 'Helvetica-Bold', 11, text_width, 2):
+        pdf.drawString(text_x, line_y, line)
+        line_y -= 14
+
+    pdf.setFont('Helvetica-Bold', 13)
+    pdf.drawString(text_x, line_y - 2, f"€{listing['price']:,.0f}")
+    line_y -= 20
+
+    pdf.setFont('Helvetica', 9)
+    location = ', '.join(part for part in (listing['town'], listing['region']) if part)
+    category = (listing['category'] or '').capitalize()
+    for line in _fit(' – '.join(part for part in (category, location) if part), 'Helvetica', 9, text_width, 1):
+        pdf.drawString(text_x, line_y, line)
+    line_y -= 13
+    pdf.drawString(text_x, line_y, _figures(listing))
+
+    pdf.setFillColor(colors.grey)
+    pdf.setFont('Helvetica', 8)
+    pdf.drawString(text_x, y - CARD_HEIGHT + PADDING, f"Ref. {listing['reference']}")
+
+
+def _draw_header(pdf, title, page, total_pages):
+    top = PAGE_HEIGHT - MARGIN
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Helvetica-Bold', 14)
+    pdf.drawString(MARGIN, top - 14, title)
+    pdf.setFillColor(colors.grey)
+    pdf.setFont('Helvetica', 9)
+    pdf.drawRightString(PAGE_WIDTH - MARGIN, top - 14, f'Page {page} of {total_pages}')
+    pdf.setStrokeColor(colors.grey)
+    pdf.line(MARGIN, top - HEADER_HEIGHT + 12, PAGE_WIDTH - MARGIN, top - HEADER_HEIGHT + 12)
+
+
+def render_part(listings, path, first_page, total_pages, title):
+    """
+    Render ``listings`` (dicts of CATALOGUE_FIELDS with ``thumbnail`` in place
+    of ``main_image``) as pages numbered from ``first_page`` into the PDF file
+    ``path``. Returns the seconds spent on each page: its drawing time plus
+    an equal share of writing the file.
+    """
+    pdf = canvas.Canvas(path, pagesize=A4)
+    pdf.setTitle(title)
+    page_seconds = []
+
+    for offset in range(0, max(len(listings), 1), LISTINGS_PER_PAGE):
+        start = time.perf_counter()
+        _draw_header(pdf, title, first_page + len(page_seconds), total_pages)
+        page = listings[offset:offset + LISTINGS_PER_PAGE]
+        if not page:
+            pdf.setFont('Helvetica', 11)
+            pdf.drawString(MARGIN, PAGE_HEIGHT - MARGIN - HEADER_HEIGHT - 14, 'No properties match this selection.')
+        for index, listing in enumerate(page):
+            column, row = index % COLUMNS, index // COLUMNS
+            _draw_card(
+                pdf, listing,
+                MARGIN + column * (CARD_WIDTH + GUTTER),
+                PAGE_HEIGHT - MARGIN - HEADER_HEIGHT - row * (CARD_HEIGHT + GUTTER)
+            )
+        pdf.showPage()
+        page_seconds.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pdf.save()
+    share = (time.perf_counter() - start) / len(page_seconds)
+    return [seconds + share for seconds in page_seconds]
+
+
+def build_catalogue(queryset, output, workers=None, progress=None, title='Property Catalogue', thumbnail_deadline=None):
+    """
+    Write the catalogue of ``queryset`` to the file object ``output`` using up
+    to ``workers`` processes (default CATALOGUE_WORKERS; 1 renders in this
+    process). ``progress`` is called with the number of listings rendered so
+    far. Images not downloaded within ``thumbnail_deadline`` seconds are
+    rendered as "No image". Returns generation statistics, including
+    ``page_seconds``.
+    """
+    started = time.perf_counter()
+    listings = list(queryset.values(*CATALOGUE_FIELDS).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE))
+    # Downloads report no rendered listings but keep a job's heartbeat going
+    thumbnails, thumbnail_counts = prefetch_thumbnails(
+        (listing['main_image'] for listing in listings),
+        progress=(lambda fetched: progress(0)) if progress else None,
+        deadline=thumbnail_deadline
+    )
+    for listing in listings:
+        listing['thumbnail'] = thumbnails.get(listing.pop('main_image'))
+    thumbnails_done = time.perf_counter()
+
+    part_size = LISTINGS_PER_PAGE * PAGES_PER_PART
+    parts = [listings[offset:offset + part_size] for offset in range(0, len(listings), part_size)] or [[]]
+    total_pages = max(math.ceil(len(listings) / LISTINGS_PER_PAGE), 1)
+    workers = max(min(workers or settings.CATALOGUE_WORKERS, len(parts)), 1)
+    title = f"{title} – {timezone.now():%d %B %Y}"
+
+    page_seconds = [None] * len(parts)
+    rendered = 0
+    with tempfile.TemporaryDirectory(prefix='catalogue-') as directory:
+        jobs = [
+            (part, os.path.join(directory, f'part-{index:05d}.pdf'), index * PAGES_PER_PART + 1, total_pages, title)
+            for index, part in enumerate(parts)
+        ]
+        if workers == 1:
+            for index, job in enumerate(jobs):
+                page_seconds[index] = render_part(*job)
+                rendered += len(parts[index])
+                if progress:
+                    progress(rendered)
+        else:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = {executor.submit(render_part, *job): index for index, job in enumerate(jobs)}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    page_seconds[index] = future.result()
+                    rendered += len(parts[index])
+                    if progress:
+                        progress(rendered)
+        rendering_done = time.perf_counter()
+
+        merged = PdfWriter()
+        for _, path, *_ in jobs:
+            merged.append(path)
+        merged.write(output)
+
+    finished = time.perf_counter()
+    return {
+        'listings': len(listings),
+        'pages': total_pages,
+        'parts': len(parts),
+        'workers': workers,
+        'thumbnails': thumbnail_counts,
+        'thumbnail_seconds': round(thumbnails_done - started, 3),
+        'render_seconds': round(rendering_done - thumbnails_done, 3),
+        'merge_seconds': round(finished - rendering_done, 3),
+        'total_seconds': round(finished - started, 3),
+        'page_seconds': [round(seconds, 4) for part in page_seconds for seconds in part],
+    }
@@ -0,0 +1,84 @@
+"""
+Artifact downloads
+Serves a finished export file with validators, long-lived private caching
+and single-range ``Range`` requests, so interrupted downloads can resume.
+"""
+
+import os
+import re
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from properties.cache import set_validators
+
+
+# Artifacts never change once written
+ARTIFACT_CACHE_CONTROL = 'private, max-age=86400, immutable'
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) of a single-range ``Range`` header, ``None``
+    to serve the whole file (absent, malformed or multi-range headers), or
+    ``False`` when the range cannot be satisfied.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _read(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(READ_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def serve_artifact(request, path, content_type, filename, etag, last_modified):
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+
+    size = os.path.getsize(path)
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if_range = request.headers.get('If-Range')
+    if byte_range is not None and if_range and if_range != etag:
+        # The client holds a different version of the file; send all of it
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type, as_attachment=True, filename=filename)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read(path, start, end - start + 1), content_type=content_type, status=206)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = ARTIFACT_CACHE_CONTROL
+    return set_validators(response, etag, last_modified)
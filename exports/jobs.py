@@ -0,0 +1,257 @@
+"""
+Background export jobs
+A POSTed export request becomes an ExportJob row. The run_export_jobs worker
+claims pending jobs, streams the export into a file under
+MEDIA_ROOT/EXPORT_JOBS_DIR with progress updates, and renames it into place
+when complete. Identical requests against the same catalogue version share
+one job and therefore one artifact.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from datetime import timedelta
+import orjson
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from properties.cache import get_catalogue_version, normalize_query_params
+from properties.filters import UNORDERED_FILTER_PARAMS, PropertyFilter
+from properties.slow_queries import QueryRecorder, capture_queries, record_slow_queries, should_capture
+from .catalogue import build_catalogue
+from .models import ExportJob
+from .parquet import PARQUET_AVAILABLE, open_writer, write_row_groups
+from .pdf import write_properties_table
+from .selection import parse_property_ids, select_properties
+from .streaming import csv_chunks, json_chunks, ndjson_chunks
+
+logger = logging.getLogger(__name__)
+
+
+# Route under which slow statements of background jobs are recorded (see properties.slow_queries)
+JOB_ROUTE_PREFIX = 'jobs/export/'
+
+# Format: (file extension, content type)
+FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'json': ('json', 'application/json'),
+    'ndjson': ('ndjson', 'application/x-ndjson'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'pdf': ('pdf', 'application/pdf'),
+    'catalogue': ('pdf', 'application/pdf'),
+}
+
+# PDFs are assembled in memory, so PDF jobs stay small
+JOB_MAX_ROWS = {
+    'pdf': 5000,
+    'catalogue': 2000,
+}
+
+# Seconds between progress writes while a job runs
+PROGRESS_INTERVAL = 1.0
+
+FILTER_PARAMS = [name for name in PropertyFilter.base_filters if name not in ('page', 'page_size')] + ['ordering']
+
+
+def _filter_query(filters):
+    """QueryDict of list filter parameters from a JSON object"""
+    query = QueryDict(mutable=True)
+    for name, value in filters.items():
+        values = value if isinstance(value, list) else [value]
+        query.setlist(name, [str(item) for item in values])
+    return query
+
+
+def job_queryset(job):
+    """Properties exported by ``job``, in export order"""
+    params = job.params
+    properties = select_properties(_filter_query(dict(params['filters'])), params['property_ids'])
+    return properties[:params['limit']] if params['limit'] else properties
+
+
+def request_job(export_format, filters=None, property_ids=None, limit=None, pretty=False, user=None):
+    """
+    Return ``(job, created)`` for an export request, reusing the job of an
+    identical request against the current catalogue version. A failed job is
+    queued again. Raises ValidationError for invalid parameters.
+    """
+    if export_format not in FORMATS:
+        raise ValidationError({'format': f"Must be one of: {', '.join(FORMATS)}"})
+    if export_format == 'parquet' and not PARQUET_AVAILABLE:
+        raise ValidationError({'format': 'Parquet export requires pyarrow'})
+    if not isinstance(filters or {}, dict):
+        raise ValidationError({'filters': 'Must be an object of list filter parameters'})
+    property_ids = parse_property_ids(property_ids)
+    max_rows = JOB_MAX_ROWS.get(export_format)
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1 or (max_rows and limit > max_rows)):
+        raise ValidationError({'limit': 'Must be a positive integer' + (f' up to {max_rows}' if max_rows else '')})
+
+    query = _filter_query(filters or {})
+    params = {
+        'filters': normalize_query_params(query, FILTER_PARAMS, unordered=UNORDERED_FILTER_PARAMS),
+        'property_ids': sorted(set(property_ids)) if property_ids is not None else None,
+        'limit': limit,
+        'pretty': bool(pretty) if export_format == 'json' else False,
+    }
+    # Validates the filters
+    properties = select_properties(_filter_query(dict(params['filters'])), params['property_ids'])
+    if max_rows and not limit and properties.count() > max_rows:
+        raise ValidationError({'limit': f'Maximum {max_rows} properties allowed for {export_format} export jobs'})
+
+    digest = hashlib.sha1(orjson.dumps([export_format, params], option=orjson.OPT_SORT_KEYS)).hexdigest()
+    version = get_catalogue_version()
+    lookup = {'digest': digest, 'catalogue_version': version}
+    job = ExportJob.objects.filter(**lookup).first()
+    if job is None:
+        try:
+            with transaction.atomic():
+                return ExportJob.objects.create(format=export_format, params=params, created_by=user, **lookup), True
+        except IntegrityError:
+            job = ExportJob.objects.get(**lookup)
+
+    artifact_missing = job.status == ExportJob.DONE and not os.path.exists(artifact_path(job))
+    if job.status == ExportJob.FAILED or artifact_missing:
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.PENDING, error='', rows_written=0, bytes_written=0, stats={}, started_at=None,
+            finished_at=None
+        )
+        job.refresh_from_db()
+        return job, True
+    return job, False
+
+
+def artifact_path(job):
+    return os.path.join(settings.MEDIA_ROOT, job.file) if job.file else ''
+
+
+def claim_next_job():
+    """Mark the oldest pending job (or one whose worker stopped reporting) as running and return it"""
+    stale_before = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=ExportJob.PENDING) | Q(status=ExportJob.RUNNING, updated_at__lt=stale_before))
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.RUNNING
+        job.started_at = timezone.now()
+        job.rows_written = 0
+        job.bytes_written = 0
+        job.save(update_fields=['status', 'started_at', 'rows_written', 'bytes_written', 'updated_at'])
+    return job
+
+
+class _Progress:
+    """Writes rows/bytes progress to the job at most every PROGRESS_INTERVAL seconds"""
+
+    def __init__(self, job):
+        self.job = job
+        self.rows = 0
+        self.bytes = 0
+        self._saved_at = time.monotonic()
+
+    def __call__(self, rows):
+        self.rows = rows
+        if time.monotonic() - self._saved_at >= PROGRESS_INTERVAL:
+            self.save()
+
+    def save(self):
+        ExportJob.objects.filter(pk=self.job.pk).update(
+            rows_written=self.rows, bytes_written=self.bytes, updated_at=timezone.now()
+        )
+        self._saved_at = time.monotonic()
+
+
+def _write_chunks(chunks, output, progress):
+    for chunk in chunks:
+        output.write(chunk)
+        progress.bytes += len(chunk)
+
+
+def run_job(job):
+    """
+    Produce the artifact of a claimed job; failures are recorded on the job.
+    Slow statements are captured like those of the export routes, under the
+    route ``jobs/export/<format>``.
+    """
+    route = f'{JOB_ROUTE_PREFIX}{job.format}'
+    if not should_capture(route):
+        return _run_job(job)
+    recorder = QueryRecorder(keep_seconds=settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+    try:
+        with capture_queries(recorder):
+            return _run_job(job)
+    finally:
+        record_slow_queries(route, recorder.queries)
+
+
+def _run_job(job):
+    extension, _ = FORMATS[job.format]
+    relative = os.path.join(settings.EXPORT_JOBS_DIR, f'{job.digest}-{job.catalogue_version}.{extension}')
+    path = os.path.join(settings.MEDIA_ROOT, relative)
+    partial = f'{path}.{os.getpid()}.part'  # Per worker, in case a stale job is reclaimed
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    progress = _Progress(job)
+    stats = {}
+    try:
+        properties = job_queryset(job)
+        rows_total = properties.count()
+        ExportJob.objects.filter(pk=job.pk).update(rows_total=rows_total)
+
+        if job.format == 'parquet':
+            with open_writer(partial) as writer:
+                for written in write_row_groups(writer, properties):
+                    progress(written)
+            progress.bytes = os.path.getsize(partial)
+        else:
+            with open(partial, 'wb') as output:
+                if job.format == 'csv':
+                    _write_chunks(csv_chunks(properties, progress=progress), output, progress)
+                elif job.format == 'json':
+                    _write_chunks(json_chunks(properties, pretty=job.params['pretty'], progress=progress), output, progress)
+                elif job.format == 'ndjson':
+                    _write_chunks(ndjson_chunks(properties, progress=progress), output, progress)
+                elif job.format == 'catalogue':
+                    stats = build_catalogue(properties, output, progress=progress)
+                    progress.bytes = output.tell()
+                else:
+                    write_properties_table(properties, output)
+                    progress.rows = rows_total
+                    progress.bytes = output.tell()
+        os.replace(partial, path)
+    except Exception as e:
+        logger.exception(f"Export job {job.pk} failed")
+        if os.path.exists(partial):
+            os.remove(partial)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.FAILED, error=str(e), finished_at=timezone.now()
+        )
+        return False
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        status=ExportJob.DONE, file=relative, rows_written=progress.rows, bytes_written=progress.bytes,
+        stats=stats, finished_at=timezone.now()
+    )
+    return True
+
+
+def purge_expired_jobs():
+    """Delete finished jobs older than EXPORT_JOB_RETENTION_HOURS together with their files"""
+    cutoff = timezone.now() - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+    expired = ExportJob.objects.filter(status__in=[ExportJob.DONE, ExportJob.FAILED], finished_at__lt=cutoff)
+    count = 0
+    for job in expired:
+        path = artifact_path(job)
+        if path and os.path.exists(path):
+            os.remove(path)
+        job.delete()
+        count += 1
+    return count
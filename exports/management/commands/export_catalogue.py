@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from rest_framework.exceptions import ValidationError
+from exports.catalogue import build_catalogue
+from exports.selection import select_properties
+
+
+class Command(BaseCommand):
+    help = 'Render a PDF catalogue of properties and report the generation time of every page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Output file'
+        )
+        parser.add_argument(
+            '--filter',
+            type=str,
+            default='',
+            help='List endpoint query string, e.g. "region=Palma&price_min=500000&ordering=-price"'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=200,
+            help='Maximum number of properties (default: 200)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Rendering processes (default: CATALOGUE_WORKERS)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            properties = select_properties(QueryDict(options['filter']))
+        except ValidationError as e:
+            errors = '; '.join(f'{name}: {" ".join(map(str, messages))}' for name, messages in e.detail.items())
+            raise CommandError(f'Invalid --filter: {errors}')
+
+        with open(options['path'], 'wb') as output:
+            stats = build_catalogue(
+                properties[:options['limit']], output, workers=options['workers'],
+                progress=lambda rendered: self.stdout.write(f'  {rendered:,} listings', ending='\r')
+            )
+
+        page_seconds = stats['page_seconds']
+        if options['verbosity'] > 1:
+            for page, seconds in enumerate(page_seconds, start=1):
+                self.stdout.write(f'  page {page:4d}: {seconds * 1000:7.1f} ms')
+        slowest = max(range(len(page_seconds)), key=page_seconds.__getitem__)
+        thumbnails = stats['thumbnails']
+        self.stdout.write(
+            f"Thumbnails: {thumbnails['cached']} cached, {thumbnails['fetched']} fetched, "
+            f"{thumbnails['missing']} missing ({stats['thumbnail_seconds']:.1f}s)"
+        )
+        self.stdout.write(
+            f"Pages: {stats['pages']} in {stats['parts']} parts on {stats['workers']} workers, "
+            f"mean {sum(page_seconds) / len(page_seconds) * 1000:.1f} ms, "
+            f"slowest page {slowest + 1} at {page_seconds[slowest] * 1000:.1f} ms"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {stats['listings']:,} properties to {options['path']} in {stats['total_seconds']:.1f}s "
+            f"(render {stats['render_seconds']:.1f}s, merge {stats['merge_seconds']:.1f}s)"
+        ))
@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from rest_framework.exceptions import ValidationError
+from exports.parquet import PARQUET_AVAILABLE, open_writer, write_row_groups
+from exports.selection import select_properties
+
+
+class Command(BaseCommand):
+    help = 'Dump properties to a Parquet file (the whole catalogue unless --filter is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Output file'
+        )
+        parser.add_argument(
+            '--filter',
+            type=str,
+            default='',
+            help='List endpoint query string, e.g. "region=Palma&price_min=500000&ordering=-price"'
+        )
+        parser.add_argument(
+            '--row-group-size',
+            type=int,
+            help='Rows per row group (default: PARQUET_ROW_GROUP_SIZE)'
+        )
+
+    def handle(self, *args, **options):
+        if not PARQUET_AVAILABLE:
+            raise CommandError('Parquet export requires pyarrow (pip install pyarrow)')
+
+        try:
+            properties = select_properties(QueryDict(options['filter']))
+        except ValidationError as e:
+            errors = '; '.join(f'{name}: {" ".join(map(str, messages))}' for name, messages in e.detail.items())
+            raise CommandError(f'Invalid --filter: {errors}')
+
+        start = time.perf_counter()
+        written = 0
+        with open_writer(options['path']) as writer:
+            for written in write_row_groups(writer, properties, options['row_group_size']):
+                self.stdout.write(f'  {written:,} rows', ending='\r')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written:,} properties to {options['path']} in {time.perf_counter() - start:.1f}s"
+        ))
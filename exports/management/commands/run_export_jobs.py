@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand
+from exports.jobs import claim_next_job, purge_expired_jobs, run_job
+
+
+# Seconds between purges of expired artifacts
+PURGE_INTERVAL = 600
+
+
+class Command(BaseCommand):
+    help = 'Run queued background export jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the queued jobs and exit instead of polling'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when the queue is empty (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        last_purge = 0
+        while True:
+            if time.monotonic() - last_purge >= PURGE_INTERVAL:
+                purged = purge_expired_jobs()
+                if purged:
+                    self.stdout.write(f'Purged {purged} expired export jobs')
+                last_purge = time.monotonic()
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Running {job}...')
+            start = time.perf_counter()
+            if run_job(job):
+                job.refresh_from_db()
+                self.stdout.write(self.style.SUCCESS(
+                    f'{job} finished: {job.rows_written:,} rows, {job.bytes_written:,} bytes '
+                    f'in {time.perf_counter() - start:.1f}s'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'Export job {job.pk} failed'))
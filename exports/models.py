@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import models
+
+
+class ExportJob(models.Model):
+    """Export produced in the background by the run_export_jobs worker"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+        ('ndjson', 'NDJSON'),
+        ('parquet', 'Parquet'),
+        ('pdf', 'PDF'),
+        ('catalogue', 'PDF catalogue'),
+    ]
+
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    params = models.JSONField(default=dict)  # Normalized filters, property_ids, limit and options
+    digest = models.CharField(max_length=40)  # SHA-1 of format and params
+    catalogue_version = models.BigIntegerField()  # Catalogue version the job was requested against
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    rows_total = models.IntegerField(null=True, blank=True)
+    rows_written = models.IntegerField(default=0)
+    bytes_written = models.BigIntegerField(default=0)
+    file = models.CharField(max_length=255, blank=True, default='')  # Path relative to MEDIA_ROOT
+    error = models.TextField(blank=True, default='')
+    stats = models.JSONField(default=dict, blank=True)  # Format-specific timings, e.g. catalogue page_seconds
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Heartbeat while running
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'export_jobs'
+        verbose_name = 'Export Job'
+        verbose_name_plural = 'Export Jobs'
+        ordering = ['-created_at']
+        constraints = [
+            # One artifact per identical request and catalogue version
+            models.UniqueConstraint(fields=['digest', 'catalogue_version'], name='unique_export_per_version'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='export_jobs_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.format} export #{self.pk} ({self.status})"
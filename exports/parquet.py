@@ -0,0 +1,131 @@
+"""
+Parquet export
+Writes the JSON export's columns with proper types (float prices, integer
+counts, UTC timestamps, list<string> photos) one row group at a time from a
+server-side cursor, so neither the rows nor the file are held in memory.
+
+pyarrow is an optional dependency; ``PARQUET_AVAILABLE`` is False without it.
+"""
+
+from django.conf import settings
+from django.db import models
+from properties.models import Property
+from .streaming import JSON_EXPORT_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+
+PARQUET_COMPRESSION = 'zstd'
+
+# List-valued JSON columns; every other JSON column is written as its JSON text
+LIST_COLUMNS = {'photos'}
+
+
+def _arrow_type(field):
+    if field.name in LIST_COLUMNS:
+        return pa.list_(pa.string())
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    if isinstance(field, (models.BigAutoField, models.BigIntegerField, models.AutoField)):
+        return pa.int64()
+    if isinstance(field, models.IntegerField):
+        return pa.int32()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    return pa.string()
+
+
+def parquet_schema():
+    return pa.schema([
+        pa.field(name, _arrow_type(Property._meta.get_field(name)), nullable=name != 'id')
+        for name in JSON_EXPORT_FIELDS
+    ])
+
+
+def _column(name, values):
+    if name in LIST_COLUMNS:
+        return [[str(item) for item in value] if isinstance(value, list) else None for value in values]
+    return values
+
+
+def write_row_groups(writer, queryset, row_group_size=None):
+    """Write ``queryset`` to a ``pq.ParquetWriter``, one row group per ``row_group_size`` rows"""
+    row_group_size = row_group_size or settings.PARQUET_ROW_GROUP_SIZE
+    schema = writer.schema
+    rows = queryset.values_list(*JSON_EXPORT_FIELDS).iterator(chunk_size=min(row_group_size, settings.EXPORT_CHUNK_SIZE))
+
+    batch = []
+    written = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == row_group_size:
+            written += _write_batch(writer, schema, batch)
+            batch = []
+            yield written
+    if batch:
+        written += _write_batch(writer, schema, batch)
+        yield written
+
+
+def _write_batch(writer, schema, batch):
+    columns = zip(*batch)
+    writer.write_table(pa.Table.from_arrays(
+        [pa.array(_column(name, values), type=schema.field(name).type) for name, values in zip(schema.names, columns)],
+        schema=schema
+    ))
+    return len(batch)
+
+
+def open_writer(sink):
+    return pq.ParquetWriter(sink, parquet_schema(), compression=PARQUET_COMPRESSION)
+
+
+class _ChunkSink:
+    """Write-only file object that hands out whatever was written since the last ``drain``"""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_chunks(queryset, row_group_size=None):
+    """Parquet file of ``queryset``, yielded one encoded row group at a time"""
+    sink = _ChunkSink()
+    writer = open_writer(sink)
+    try:
+        for _ in write_row_groups(writer, queryset, row_group_size):
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
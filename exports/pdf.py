@@ -0,0 +1,49 @@
+"""
+PDF table export
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+from reportlab.lib.styles import getSampleStyleSheet
+
+
+def write_properties_table(properties, output):
+    """Write ``properties`` as a table (the header repeats on every page) to a file object"""
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    elements = []
+    
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    title = Paragraph("Properties Export", title_style)
+    elements.append(title)
+    elements.append(Paragraph("<br/>", styles['Normal']))
+    
+    data = [['Reference', 'Title', 'Price', 'Region', 'Platform']]
+    
+    for prop in properties:
+        data.append([
+            prop.reference,
+            prop.title[:30] + '...' if len(prop.title) > 30 else prop.title,
+            f"€{prop.price:,.0f}",
+            prop.region,
+            prop.platform
+        ])
+    
+    table = Table(data, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(table)
+    doc.build(elements)
@@ -0,0 +1,53 @@
+"""
+Export row selection
+Exports take either an explicit ``property_ids`` list or the filter and
+ordering query parameters of the property list endpoint, so the matching
+rows can be exported without paging through the list first.
+"""
+
+from rest_framework.exceptions import ValidationError
+from properties.filters import DEFAULT_ORDERING, ORDERING_FIELDS, PROPERTY_ID_RANGE, PropertyFilter
+from properties.models import Property
+
+
+def list_ordering(params):
+    """``ordering`` as the list endpoint applies it: unknown fields are ignored"""
+    terms = [term.strip() for term in params.get('ordering', '').split(',') if term.strip()]
+    ordering = [term for term in terms if term.lstrip('-') in ORDERING_FIELDS]
+    return ordering or list(DEFAULT_ORDERING)
+
+
+def parse_property_ids(property_ids):
+    """``property_ids`` of a request body: None, or a non-empty list of ids"""
+    if property_ids is None:
+        return None
+    if not isinstance(property_ids, list) or not property_ids or not all(
+        isinstance(pk, int) and not isinstance(pk, bool) and pk in PROPERTY_ID_RANGE for pk in property_ids
+    ):
+        raise ValidationError({'property_ids': 'Must be a non-empty list of property ids'})
+    return property_ids
+
+
+def select_properties(params, property_ids=None):
+    """
+    Properties to export, ordered with an id tiebreak. ``params`` are list
+    query parameters (search, region, price_min, ordering, ...) and are
+    ignored when ``property_ids`` is given.
+    """
+    if parse_property_ids(property_ids) is not None:
+        return Property.objects.filter(id__in=property_ids).order_by(*Property._meta.ordering, 'id')
+
+    filterset = PropertyFilter(params, queryset=Property.objects.all())
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs.order_by(*list_ordering(params), 'id')
+
+
+def parse_limit(params, max_rows):
+    """Optional ``limit`` query parameter, at most ``max_rows``"""
+    limit = params.get('limit')
+    if limit is None:
+        return None
+    if not limit.isdigit() or not 1 <= int(limit) <= max_rows:
+        raise ValidationError({'limit': f'Must be an integer between 1 and {max_rows}'})
+    return int(limit)
@@ -0,0 +1,119 @@
+"""
+Streaming export encoders
+Each encoder iterates a queryset with a server-side cursor (``iterator()``)
+and yields encoded chunks as rows arrive, so an export's memory use does not
+grow with its size and the first bytes are sent immediately.
+"""
+
+import csv
+import orjson
+from django.conf import settings
+from properties.projections import ALL_FIELDS
+
+
+# Columns read for the CSV export, in output order
+CSV_EXPORT_FIELDS = [
+    'reference', 'title', 'category', 'price', 'square_meters',
+    'region', 'town', 'bedrooms', 'bathrooms', 'platform',
+    'link', 'created_at'
+]
+
+CSV_HEADER = [
+    'Reference', 'Title', 'Category', 'Price', 'Square Meters',
+    'Region', 'Town', 'Bedrooms', 'Bathrooms', 'Platform',
+    'Link', 'Created At'
+]
+
+# The JSON exports carry every public Property column
+JSON_EXPORT_FIELDS = ALL_FIELDS
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_row(row):
+    (reference, title, category, price, square_meters, region, town,
+     bedrooms, bathrooms, platform, link, created_at) = row
+    return [
+        reference,
+        title,
+        category or '',
+        price,
+        square_meters,
+        region,
+        town or '',
+        bedrooms or '',
+        bathrooms or '',
+        platform,
+        link,
+        created_at.strftime('%Y-%m-%d %H:%M:%S')
+    ]
+
+
+def _batches(rows, chunk_size, progress):
+    """Lists of up to ``chunk_size`` items from ``rows``, reporting the running count to ``progress``"""
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk_size:
+            count += len(batch)
+            yield batch
+            if progress:
+                progress(count)
+            batch = []
+    if batch:
+        count += len(batch)
+        yield batch
+        if progress:
+            progress(count)
+
+
+def csv_chunks(queryset, chunk_size=None, progress=None):
+    """
+    UTF-8 encoded CSV of ``queryset``: the header, then one chunk per database
+    fetch. ``progress`` is called with the number of rows sent after each chunk.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER).encode()
+
+    rows = queryset.values_list(*CSV_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for batch in _batches(rows, chunk_size, progress):
+        yield ''.join(writer.writerow(_csv_row(row)) for row in batch).encode()
+
+
+def _rows(queryset, chunk_size):
+    return queryset.values(*JSON_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def json_chunks(queryset, pretty=False, chunk_size=None, progress=None):
+    """
+    JSON array of ``queryset`` encoded row by row with orjson. ``pretty``
+    indents by two spaces, matching ``orjson.dumps(rows, option=OPT_INDENT_2)``.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    # Strings never contain a raw newline, so re-indenting a row is a plain replace
+    if pretty:
+        encode = lambda row: b'  ' + orjson.dumps(row, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+        separator, opening, closing = b',\n', b'[\n', b'\n]'
+    else:
+        encode = orjson.dumps
+        separator, opening, closing = b',', b'[', b']'
+
+    started = False
+    for batch in _batches(_rows(queryset, chunk_size), chunk_size, progress):
+        yield (separator if started else opening) + separator.join(encode(row) for row in batch)
+        started = True
+    yield closing if started else b'[]'
+
+
+def ndjson_chunks(queryset, chunk_size=None, progress=None):
+    """Newline-delimited JSON of ``queryset``: one compact object per line"""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    for batch in _batches(_rows(queryset, chunk_size), chunk_size, progress):
+        yield b''.join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in batch)
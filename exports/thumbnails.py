@@ -0,0 +1,178 @@
+"""
+Listing thumbnails
+Downscaled JPEG copies of ``main_image`` cached under MEDIA_ROOT/THUMBNAILS_DIR,
+keyed by the SHA-1 of the image URL, so PDF catalogues embed small images and
+each image is downloaded once. Failed downloads leave a ``.missing`` marker
+and are retried after THUMBNAIL_RETRY_SECONDS.
+
+Image URLs come from scraped and API-supplied data, so they are only fetched
+from hosts that resolve to public addresses, and every redirect is checked
+the same way.
+"""
+
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from urllib.parse import urljoin, urlsplit
+import requests
+from django.conf import settings
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+# Twice the size of the catalogue card image, so it stays sharp when printed
+THUMBNAIL_SIZE = (560, 420)
+THUMBNAIL_QUALITY = 75
+
+FETCH_TIMEOUT = 10
+FETCH_MAX_BYTES = 15 * 1024 * 1024
+FETCH_WORKERS = 8
+FETCH_MAX_REDIRECTS = 3
+
+THUMBNAIL_RETRY_SECONDS = 24 * 3600
+
+
+def thumbnail_path(url):
+    digest = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(settings.MEDIA_ROOT, settings.THUMBNAILS_DIR, digest[:2], f'{digest}.jpg')
+
+
+def _check_public(url):
+    """Raise ValueError unless ``url`` is http(s) on a host with only public addresses"""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f'Unsupported image URL {url}')
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, parts.port or 80, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as e:
+        raise ValueError(f'Cannot resolve {parts.hostname}: {e}')
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        # Rejects private, loopback, link-local (cloud metadata) and reserved ranges
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f'{parts.hostname} resolves to the non-public address {address}')
+
+
+def _download(url):
+    # Redirects are followed here, so each hop is checked before it is fetched
+    for _ in range(FETCH_MAX_REDIRECTS + 1):
+        _check_public(url)
+        with requests.get(url, timeout=FETCH_TIMEOUT, stream=True, allow_redirects=False) as response:
+            if response.is_redirect:
+                url = urljoin(url, response.headers['Location'])
+                continue
+            response.raise_for_status()
+            data = io.BytesIO()
+            for block in response.iter_content(64 * 1024):
+                data.write(block)
+                if data.tell() > FETCH_MAX_BYTES:
+                    raise ValueError(f'Image larger than {FETCH_MAX_BYTES} bytes')
+        data.seek(0)
+        return data
+    raise ValueError(f'More than {FETCH_MAX_REDIRECTS} redirects')
+
+
+def _downscale(source, path):
+    image = Image.open(source)
+    # JPEGs are decoded at a reduced scale directly
+    image.draft('RGB', THUMBNAIL_SIZE)
+    image = image.convert('RGB')
+    image.thumbnail(THUMBNAIL_SIZE)
+
+    partial = f'{path}.{os.getpid()}.part'
+    image.save(partial, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+    os.replace(partial, path)
+
+
+def _lookup(url):
+    """``(path, status)`` when ``url`` needs no download, otherwise None"""
+    if not url or not url.startswith(('http://', 'https://')):
+        return None, 'missing'
+
+    path = thumbnail_path(url)
+    if os.path.exists(path):
+        return path, 'cached'
+    marker = f'{path}.missing'
+    if os.path.exists(marker) and time.time() - os.path.getmtime(marker) < THUMBNAIL_RETRY_SECONDS:
+        return None, 'missing'
+    return None
+
+
+def get_thumbnail(url):
+    """
+    Return ``(path, status)`` for the thumbnail of ``url``, where ``status`` is
+    ``'cached'``, ``'fetched'`` or ``'missing'`` (``path`` is None when missing).
+    """
+    found = _lookup(url)
+    if found:
+        return found
+
+    path = thumbnail_path(url)
+    marker = f'{path}.missing'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        _downscale(_download(url), path)
+    except Exception as e:
+        logger.warning(f"Thumbnail of {url} unavailable: {e}")
+        with open(marker, 'w'):
+            pass
+        return None, 'missing'
+    if os.path.exists(marker):
+        os.remove(marker)
+    return path, 'fetched'
+
+
+def prefetch_thumbnails(urls, progress=None, deadline=None):
+    """
+    Thumbnails of ``urls``, downloading the uncached ones concurrently;
+    ``progress`` is called with the number of URLs done so far.
+    Returns ``({url: path or None}, {status: count})``.
+
+    Downloads not finished ``deadline`` seconds after the start are left
+    behind: their URLs map to None and are counted as ``'deferred'``.
+    Downloads already running complete in the background and fill the cache
+    for later catalogues; queued ones are dropped.
+    """
+    unique = list(dict.fromkeys(url for url in urls if url))
+    paths = {}
+    counts = {'cached': 0, 'fetched': 0, 'missing': 0, 'deferred': 0}
+
+    def done(url, path, state):
+        paths[url] = path
+        counts[state] += 1
+        if progress:
+            progress(len(paths))
+
+    # Cached and known-missing images never wait behind downloads
+    downloads = []
+    for url in unique:
+        found = _lookup(url)
+        if found:
+            done(url, *found)
+        else:
+            downloads.append(url)
+    if not downloads:
+        return paths, counts
+
+    executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    futures = {executor.submit(get_thumbnail, url): url for url in downloads}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            done(futures[future], *future.result())
+    except TimeoutError:
+        for url in downloads:
+            if url not in paths:
+                paths[url] = None
+                counts['deferred'] += 1
+        logger.info(f"{counts['deferred']} thumbnails not downloaded within {deadline}s, deferred")
+    finally:
+        executor.shutdown(wait=deadline is None, cancel_futures=True)
+    return paths, counts
@@ -5,6 +5,12 @@ app_name = 'exports'
 
 urlpatterns = [
     path('pdf/', views.export_properties_pdf, name='export-pdf'),
+    path('catalogue/', views.export_properties_catalogue, name='export-catalogue'),
     path('csv/', views.export_properties_csv, name='export-csv'),
     path('json/', views.export_properties_json, name='export-json'),
+    path('ndjson/', views.export_properties_ndjson, name='export-ndjson'),
+    path('parquet/', views.export_properties_parquet, name='export-parquet'),
+    path('export-jobs/', views.create_export_job, name='export-job-create'),
+    path('export-jobs/<int:pk>/', views.get_export_job, name='export-job-detail'),
+    path('export-jobs/<int:pk>/download/', views.download_export_job, name='export-job-download'),
 ]
@@ -2,57 +2,69 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.db.models import Q
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-import csv
 import io
-import json
-from properties.models import Property
+import os
+from .catalogue import build_catalogue
+from .downloads import serve_artifact
+from .jobs import FORMATS, artifact_path, request_job
+from .models import ExportJob
+from .parquet import PARQUET_AVAILABLE, parquet_chunks
+from .pdf import write_properties_table
+from .selection import parse_limit, select_properties
+from .streaming import csv_chunks, json_chunks, ndjson_chunks
+
+
+# The PDF table is laid out for at most this many properties
+PDF_MAX_ROWS = 4
+
+# Catalogues of up to this many properties are rendered in the request; larger ones run as export jobs
+CATALOGUE_MAX_ROWS = 40
+
+
+def _selected_properties(request, max_rows, label):
+    """
+    Properties chosen by ``property_ids`` in the body or by the list filter
+    query parameters, capped by ``limit``. Returns ``(queryset, None)``, or
+    ``(None, response)`` for ``?dry_run=true`` (the match count), for a body
+    that is not a JSON object and when more than ``max_rows`` properties match
+    without a ``limit``.
+    """
+    if not isinstance(request.data, dict):
+        return None, Response({'error': 'Request body must be a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+    params = request.query_params
+    properties = select_properties(params, request.data.get('property_ids'))
+    limit = parse_limit(params, max_rows)
+    count = properties.count()
+    
+    if params.get('dry_run', '').lower() in ('1', 'true', 'yes'):
+        return None, Response({
+            'count': count,
+            'export_count': min(count, limit or max_rows),
+            'max_rows': max_rows,
+        })
+    if limit is None and count > max_rows:
+        return None, Response(
+            {'error': f'Maximum {max_rows} properties allowed for {label} export', 'count': count},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return (properties[:limit] if limit else properties), None
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def export_properties_csv(request):
     """Export properties to CSV format"""
-    property_ids = request.data.get('property_ids', [])
-    
-    if not property_ids:
-        return Response({'error': 'property_ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+    properties, early_response = _selected_properties(request, settings.EXPORT_MAX_ROWS, 'CSV')
+    if early_response is not None:
+        return early_response
     
-    properties = Property.objects.filter(id__in=property_ids)
-    
-    response = HttpResponse(content_type='text/csv')
+    response = StreamingHttpResponse(csv_chunks(properties), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="properties.csv"'
     
-    writer = csv.writer(response)
-    
-    writer.writerow([
-        'Reference', 'Title', 'Category', 'Price', 'Square Meters',
-        'Region', 'Town', 'Bedrooms', 'Bathrooms', 'Platform',
-        'Link', 'Created At'
-    ])
-    
-    for property_obj in properties:
-        writer.writerow([
-            property_obj.reference,
-            property_obj.title,
-            property_obj.category or '',
-            property_obj.price,
-            property_obj.square_meters,
-            property_obj.region,
-            property_obj.town or '',
-            property_obj.bedrooms or '',
-            property_obj.bathrooms or '',
-            property_obj.platform,
-            property_obj.link,
-            property_obj.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        ])
-    
     return response
 
 
@@ -60,58 +72,36 @@ def export_properties_csv(request):
 @permission_classes([IsAuthenticated])
 def export_properties_pdf(request):
     """Export properties to PDF format"""
-    property_ids = request.data.get('property_ids', [])
+    properties, early_response = _selected_properties(request, PDF_MAX_ROWS, 'PDF')
+    if early_response is not None:
+        return early_response
     
-    if not property_ids:
-        return Response({'error': 'property_ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+    buffer = io.BytesIO()
+    write_properties_table(properties, buffer)
     
-    if len(property_ids) > 4:
-        return Response({'error': 'Maximum 4 properties allowed for PDF export'}, status=status.HTTP_400_BAD_REQUEST)
+    buffer.seek(0)
+    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    response['Content-Disposition'] = 'attachment; filename="properties.pdf"'
     
-    properties = Property.objects.filter(id__in=property_ids)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_properties_catalogue(request):
+    """Export properties as a PDF catalogue with photos (POST /api/export-jobs/ for larger selections)"""
+    properties, early_response = _selected_properties(request, CATALOGUE_MAX_ROWS, 'catalogue')
+    if early_response is not None:
+        return early_response
     
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    title = Paragraph("Properties Export", title_style)
-    elements.append(title)
-    elements.append(Paragraph("<br/>", styles['Normal']))
-    
-    data = [['Reference', 'Title', 'Price', 'Region', 'Platform']]
-    
-    for prop in properties:
-        data.append([
-            prop.reference,
-            prop.title[:30] + '...' if len(prop.title) > 30 else prop.title,
-            f"€{prop.price:,.0f}",
-            prop.region,
-            prop.platform
-        ])
-    
-    table = Table(data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
+    # Images still downloading at the deadline are left to the cache (and export jobs)
+    stats = build_catalogue(properties, buffer, workers=1, thumbnail_deadline=settings.CATALOGUE_THUMBNAIL_DEADLINE)
     
-    buffer.seek(0)
     response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="properties.pdf"'
+    response['Content-Disposition'] = 'attachment; filename="catalogue.pdf"'
+    response['X-Catalogue-Pages'] = str(stats['pages'])
+    response['X-Catalogue-Deferred-Images'] = str(stats['thumbnails']['deferred'])
     
     return response
 
@@ -120,50 +110,122 @@ def export_properties_pdf(request):
 @permission_classes([IsAuthenticated])
 def export_properties_json(request):
     """Export properties to JSON format"""
-    property_ids = request.data.get('property_ids', [])
-    
-    if not property_ids:
-        return Response({'error': 'property_ids is required'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    properties = Property.objects.filter(id__in=property_ids)
-    serializer_data = []
-    
-    for property_obj in properties:
-        property_data = {
-            'id': property_obj.id,
-            'reference': property_obj.reference,
-            'title': property_obj.title,
-            'category': property_obj.category,
-            'price': property_obj.price,
-            'square_meters': property_obj.square_meters,
-            'region': property_obj.region,
-            'town': property_obj.town,
-            'street_address': property_obj.street_address,
-            'address_city': property_obj.address_city,
-            'address_state': property_obj.address_state,
-            'address_country': property_obj.address_country,
-            'bedrooms': property_obj.bedrooms,
-            'bathrooms': property_obj.bathrooms,
-            'land_area': property_obj.land_area,
-            'built_up': property_obj.built_up,
-            'description': property_obj.description,
-            'photos': property_obj.photos,
-            'main_image': property_obj.main_image,
-            'features': property_obj.features,
-            'platform': property_obj.platform,
-            'link': property_obj.link,
-            'energy_rating': property_obj.energy_rating,
-            'company_id': property_obj.company_id,
-            'company_name': property_obj.company_name,
-            'property_created_at': property_obj.property_created_at,
-            'on_off': property_obj.on_off,
-            'entity_id': property_obj.entity_id,
-            'created_at': property_obj.created_at.isoformat(),
-            'updated_at': property_obj.updated_at.isoformat()
-        }
-        serializer_data.append(property_data)
-    
-    response = HttpResponse(json.dumps(serializer_data, indent=2), content_type='application/json')
+    properties, early_response = _selected_properties(request, settings.EXPORT_MAX_ROWS, 'JSON')
+    if early_response is not None:
+        return early_response
+    
+    pretty = request.query_params.get('pretty', '').lower() in ('1', 'true', 'yes')
+    response = StreamingHttpResponse(json_chunks(properties, pretty=pretty), content_type='application/json')
     response['Content-Disposition'] = 'attachment; filename="properties.json"'
     
     return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_properties_ndjson(request):
+    """Export properties as newline-delimited JSON (one property per line)"""
+    properties, early_response = _selected_properties(request, settings.EXPORT_MAX_ROWS, 'NDJSON')
+    if early_response is not None:
+        return early_response
+    
+    response = StreamingHttpResponse(ndjson_chunks(properties), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="properties.ndjson"'
+    
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_properties_parquet(request):
+    """Export properties as a Parquet file with typed columns"""
+    if not PARQUET_AVAILABLE:
+        return Response({'error': 'Parquet export requires pyarrow'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    
+    properties, early_response = _selected_properties(request, settings.EXPORT_MAX_ROWS, 'Parquet')
+    if early_response is not None:
+        return early_response
+    
+    response = StreamingHttpResponse(parquet_chunks(properties), content_type='application/vnd.apache.parquet')
+    response['Content-Disposition'] = 'attachment; filename="properties.parquet"'
+    
+    return response
+
+
+def _job_data(request, job):
+    if job.rows_total:
+        progress = round(job.rows_written / job.rows_total, 4)
+    else:
+        progress = 1.0 if job.status == ExportJob.DONE else 0.0
+    data = {
+        'id': job.pk,
+        'format': job.format,
+        'status': job.status,
+        'params': job.params,
+        'catalogue_version': job.catalogue_version,
+        'rows_total': job.rows_total,
+        'rows_written': job.rows_written,
+        'progress': progress,
+        'bytes_written': job.bytes_written,
+        'error': job.error or None,
+        'stats': job.stats or None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'download_url': None,
+    }
+    if job.status == ExportJob.DONE:
+        data['download_url'] = request.build_absolute_uri(reverse('exports:export-job-download', args=[job.pk]))
+    return data
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_export_job(request):
+    """Queue a background export, or return the job of an identical request for the current catalogue"""
+    data = request.data
+    if not isinstance(data, dict):
+        return Response({'error': 'Request body must be a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+    job, created = request_job(
+        data.get('format'),
+        filters=data.get('filters'),
+        property_ids=data.get('property_ids'),
+        limit=data.get('limit'),
+        pretty=data.get('pretty', False),
+        user=request.user,
+    )
+    return Response(
+        {**_job_data(request, job), 'reused': not created},
+        status=status.HTTP_202_ACCEPTED if job.status != ExportJob.DONE else status.HTTP_200_OK
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_export_job(request, pk):
+    """Status and progress of an export job"""
+    job = ExportJob.objects.filter(pk=pk).first()
+    if job is None:
+        return Response({'error': 'Export job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_job_data(request, job))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_export_job(request, pk):
+    """Download a finished export; supports Range requests for resuming"""
+    job = ExportJob.objects.filter(pk=pk).first()
+    if job is None:
+        return Response({'error': 'Export job not found'}, status=status.HTTP_404_NOT_FOUND)
+    if job.status != ExportJob.DONE:
+        return Response({'error': f'Export job is {job.status}'}, status=status.HTTP_409_CONFLICT)
+    path = artifact_path(job)
+    if not os.path.exists(path):
+        return Response({'error': 'Export file has expired'}, status=status.HTTP_410_GONE)
+    
+    extension, content_type = FORMATS[job.format]
+    return serve_artifact(
+        request, path, content_type, f'properties-{job.pk}.{extension}',
+        etag=f'"{job.digest[:24]}-{job.catalogue_version}"',
+        last_modified=int(job.finished_at.timestamp()),
+    )
@@ -1,5 +1,31 @@
+import json
 from django.contrib import admin
-from .models import Property
+from django.utils.html import format_html
+from .models import Property, Region, Town, MarketSummary, SlowQuery, PropertyEnrichment, LLMResponse, PropertyAmenity
+
+
+class PropertyEnrichmentInline(admin.StackedInline):
+    """Language model output stored by enrich_properties"""
+    
+    model = PropertyEnrichment
+    fields = ['model', 'summary', 'analysis', 'suggested_features', 'enriched_at']
+    readonly_fields = fields
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class PropertyAmenityInline(admin.TabularInline):
+    """Amenity tags extracted from the property text (read-only, maintained on ingest)"""
+    model = PropertyAmenity
+    fields = ['tag']
+    readonly_fields = ['tag']
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Property)
@@ -21,14 +47,16 @@ class PropertyAdmin(admin.ModelAdmin):
         'street_address', 'address_city'
     ]
     
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['region_ref', 'town_ref', 'created_at', 'updated_at']
+    
+    inlines = [PropertyAmenityInline, PropertyEnrichmentInline]
     
     fieldsets = (
         ('Basic Information', {
             'fields': ('reference', 'title', 'category', 'price', 'square_meters')
         }),
         ('Location', {
-            'fields': ('region', 'town', 'street_address', 'address_city', 'address_state', 'address_country')
+            'fields': ('region', 'town', 'region_ref', 'town_ref', 'street_address', 'address_city', 'address_state', 'address_country')
         }),
         ('Features', {
             'fields': ('bedrooms', 'bathrooms', 'land_area', 'built_up', 'energy_rating')
@@ -60,3 +88,103 @@ class PropertyAdmin(admin.ModelAdmin):
         queryset.delete()
         self.message_user(request, f'Successfully deleted {count} properties.')
     bulk_delete_properties.short_description = "Delete selected properties"
+
+
+class TownInline(admin.TabularInline):
+    """Towns of a region (read-only, maintained on ingest)"""
+    model = Town
+    fields = ['name', 'normalized_name', 'property_count']
+    readonly_fields = ['name', 'normalized_name', 'property_count']
+    extra = 0
+    can_delete = False
+
+
+@admin.register(Region)
+class RegionAdmin(admin.ModelAdmin):
+    """Admin configuration for the region dimension"""
+    
+    list_display = ['name', 'normalized_name', 'property_count', 'updated_at']
+    search_fields = ['name', 'normalized_name']
+    readonly_fields = ['normalized_name', 'property_count', 'created_at', 'updated_at']
+    inlines = [TownInline]
+    ordering = ['name']
+
+
+@admin.register(Town)
+class TownAdmin(admin.ModelAdmin):
+    """Admin configuration for the town dimension"""
+    
+    list_display = ['name', 'region', 'normalized_name', 'property_count', 'updated_at']
+    list_filter = ['region']
+    search_fields = ['name', 'normalized_name']
+    readonly_fields = ['normalized_name', 'property_count', 'created_at', 'updated_at']
+    ordering = ['name']
+
+
+@admin.register(MarketSummary)
+class MarketSummaryAdmin(admin.ModelAdmin):
+    """Read-only view of the market statistics summary tables"""
+    
+    list_display = ['__str__', 'listing_count', 'refreshed_at']
+    list_filter = ['platform', 'category']
+    readonly_fields = [
+        'region', 'category', 'platform', 'listing_count', 'price_stats', 'price_per_m2_stats',
+        'price_histogram', 'price_per_m2_histogram', 'refreshed_at'
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Statements over the slow-query threshold, worst offenders first"""
+    
+    list_display = [
+        'short_sql', 'route', 'occurrences', 'total_duration_ms', 'avg_duration_ms',
+        'max_duration_ms', 'last_seen'
+    ]
+    list_filter = ['route']
+    search_fields = ['normalized_sql', 'route']
+    ordering = ['-total_duration_ms']
+    fields = [
+        'normalized_sql', 'params_shape', 'route', 'occurrences', 'total_duration_ms',
+        'max_duration_ms', 'last_duration_ms', 'formatted_plan', 'explained_at',
+        'first_seen', 'last_seen'
+    ]
+    readonly_fields = fields
+    
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+    
+    @admin.display(description='Avg duration ms')
+    def avg_duration_ms(self, obj):
+        return round(obj.total_duration_ms / obj.occurrences, 2) if obj.occurrences else 0
+    
+    @admin.display(description='Explain plan')
+    def formatted_plan(self, obj):
+        if obj.explain_plan is None:
+            return '-'
+        return format_html('<pre>{}</pre>', json.dumps(obj.explain_plan, indent=2))
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LLMResponse)
+class LLMResponseAdmin(admin.ModelAdmin):
+    """Cached language model answers"""
+    
+    list_display = ['method', 'model', 'prompt_hash', 'created_at']
+    list_filter = ['method', 'model']
+    readonly_fields = ['method', 'model', 'prompt_hash', 'response', 'created_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
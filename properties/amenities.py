@@ -0,0 +1,88 @@
+"""
+Stored amenities
+Amenity tags extracted from the title, description and features of a
+listing (see properties.amenity_matcher) are stored as PropertyAmenity rows,
+whose (tag, property) index serves the ``features`` list filter.
+"""
+
+import time
+from dataclasses import dataclass
+from django.db import transaction
+from .amenity_matcher import SOURCE_FIELDS, extract_amenities
+from .models import Property, PropertyAmenity
+
+
+def sync_property_amenities(property_id, tags, created=False):
+    """Make the stored tags of a property equal to ``tags``"""
+    current = set() if created else set(
+        PropertyAmenity.objects.filter(property_id=property_id).values_list('tag', flat=True)
+    )
+    tags = set(tags)
+    if current - tags:
+        PropertyAmenity.objects.filter(property_id=property_id, tag__in=current - tags).delete()
+    if tags - current:
+        PropertyAmenity.objects.bulk_create(
+            [PropertyAmenity(property_id=property_id, tag=tag) for tag in sorted(tags - current)],
+            ignore_conflicts=True
+        )
+
+
+@dataclass
+class AmenityRun:
+    """Counters of one rebuild_amenities run"""
+
+    properties: int = 0
+    changed: int = 0
+    added: int = 0
+    removed: int = 0
+    extract_seconds: float = 0.0
+
+
+def rebuild_amenities(batch_size=2000, queryset=None, progress=None):
+    """
+    Re-extract the amenities of every property (or of ``queryset``).
+
+    Used after bulk operations that bypass model signals and when the
+    dictionaries change. Rows are read in id order one chunk at a time and
+    only tags that differ from the stored ones are written.
+    """
+    run = AmenityRun()
+    rows = (queryset if queryset is not None else Property.objects.all()).order_by('id').values_list('id', *SOURCE_FIELDS)
+    last_id = 0
+    while True:
+        chunk = list(rows.filter(id__gt=last_id)[:batch_size])
+        if not chunk:
+            break
+        last_id = chunk[-1][0]
+
+        start = time.perf_counter()
+        extracted = {row[0]: set(extract_amenities(*row[1:])) for row in chunk}
+        run.extract_seconds += time.perf_counter() - start
+
+        stored = {property_id: set() for property_id in extracted}
+        for property_id, tag in PropertyAmenity.objects.filter(
+            property_id__in=extracted
+        ).values_list('property_id', 'tag'):
+            stored[property_id].add(tag)
+
+        added = []
+        removed = []
+        for property_id, tags in extracted.items():
+            if tags != stored[property_id]:
+                run.changed += 1
+                added.extend(PropertyAmenity(property_id=property_id, tag=tag) for tag in sorted(tags - stored[property_id]))
+                removed.extend((property_id, tag) for tag in stored[property_id] - tags)
+        with transaction.atomic():
+            for tag in {tag for _, tag in removed}:
+                PropertyAmenity.objects.filter(
+                    tag=tag, property_id__in=[property_id for property_id, removed_tag in removed if removed_tag == tag]
+                ).delete()
+            PropertyAmenity.objects.bulk_create(added, batch_size=batch_size, ignore_conflicts=True)
+        run.added += len(added)
+        run.removed += len(removed)
+        run.properties += len(chunk)
+        if progress:
+            progress(run)
+        if len(chunk) < batch_size:
+            break
+    return run
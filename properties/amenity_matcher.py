@@ -0,0 +1,274 @@
+"""
+Rule-based amenity matching
+Listings mention their amenities in free text, in English, German or
+Spanish. Every phrase of the AMENITIES dictionaries is compiled into one
+Aho-Corasick automaton, so a description is scanned once whatever the number
+of phrases. Matches are mapped to normalized tags.
+
+Phrases match whole words. A leading ``*`` also lets a phrase end a compound
+word and a trailing ``*`` lets it start one (German: Privatpool, Tiefgarage,
+Dachterrasse). Where matches overlap the longest wins, so "whirlpool" is a
+jacuzzi and not a pool. EXCLUSIONS use the same rule to hide false positives
+inside longer words, and a phrase after a negation ("no lift", "sin
+ascensor", "ohne einen Aufzug") is ignored; articles and determiners between
+the two are skipped.
+
+This module imports no models, so migrations can use it.
+"""
+
+import unicodedata
+from collections import deque
+
+
+AMENITIES = {
+    'pool': {
+        'en': ['pool', 'swimming pool', 'swimming-pool', 'swimmingpool'],
+        'de': ['*pool', 'pool*', 'schwimmbad*', '*schwimmbecken'],
+        'es': ['piscina', 'piscinas'],
+    },
+    'sea_view': {
+        'en': ['sea view', 'sea views', 'sea-view', 'sea-views', 'ocean view', 'ocean views', 'views of the sea',
+               'views to the sea', 'view of the sea', 'views over the sea'],
+        'de': ['*meerblick*', '*meersicht', 'blick aufs meer', 'blick auf das meer', 'blick auf das mittelmeer'],
+        'es': ['vistas al mar', 'vista al mar', 'vistas del mar', 'vista mar', 'vistas panoramicas al mar'],
+    },
+    'mountain_view': {
+        'en': ['mountain view', 'mountain views', 'views of the mountains', 'views to the mountains'],
+        'de': ['*bergblick*', 'blick auf die berge'],
+        'es': ['vistas a la montana', 'vistas a las montanas', 'vistas a la sierra', 'vistas de montana'],
+    },
+    'beachfront': {
+        'en': ['beachfront', 'beach front', 'frontline', 'front line', 'first line', 'seafront'],
+        'de': ['erste meereslinie', 'erste linie', 'direkt am meer', 'direkt am strand'],
+        'es': ['primera linea', 'primera linea de mar', 'primera linea de playa', 'frente al mar'],
+    },
+    'garage': {
+        'en': ['garage', 'garages'],
+        'de': ['*garage*'],
+        'es': ['garaje', 'garajes', 'cochera', 'plaza de garaje'],
+    },
+    'parking': {
+        'en': ['parking', 'parking space', 'car port', 'carport', 'driveway'],
+        'de': ['*stellplatz*', '*parkplatz*', '*parkplatze', 'carport'],
+        'es': ['aparcamiento', 'plaza de aparcamiento', 'plaza de parking', 'parking'],
+    },
+    'lift': {
+        'en': ['lift', 'elevator'],
+        'de': ['*aufzug', 'fahrstuhl', 'personenlift'],
+        'es': ['ascensor'],
+    },
+    'terrace': {
+        'en': ['terrace', 'terraces', 'roof terrace', 'sun terrace'],
+        'de': ['*terrasse*'],
+        'es': ['terraza', 'terrazas', 'solarium'],
+    },
+    'balcony': {
+        'en': ['balcony', 'balconies'],
+        'de': ['*balkon*'],
+        'es': ['balcon', 'balcones'],
+    },
+    'garden': {
+        'en': ['garden', 'gardens'],
+        'de': ['*garten*'],
+        'es': ['jardin', 'jardines'],
+    },
+    'air_conditioning': {
+        'en': ['air conditioning', 'air-conditioning', 'air conditioned', 'air-conditioned', 'aircon'],
+        'de': ['klimaanlage*', 'klimatisiert*'],
+        'es': ['aire acondicionado', 'climatizacion', 'climatizado', 'climatizada'],
+    },
+    'heating': {
+        'en': ['heating', 'central heating', 'underfloor heating'],
+        'de': ['*heizung*'],
+        'es': ['calefaccion', 'suelo radiante'],
+    },
+    'fireplace': {
+        'en': ['fireplace', 'fire place', 'wood burner', 'log burner'],
+        'de': ['*kamin*'],
+        'es': ['chimenea'],
+    },
+    'jacuzzi': {
+        'en': ['jacuzzi', 'hot tub', 'whirlpool'],
+        'de': ['*whirlpool*'],
+        'es': ['hidromasaje'],
+    },
+    'sauna': {
+        'en': ['sauna'],
+        'de': ['*sauna*'],
+        'es': ['sauna'],
+    },
+    'gym': {
+        'en': ['gym', 'fitness room', 'fitness centre', 'fitness center'],
+        'de': ['fitnessraum', '*fitnessstudio', 'fitnessbereich'],
+        'es': ['gimnasio', 'sala de fitness'],
+    },
+    'cellar': {
+        'en': ['cellar', 'basement', 'wine cellar'],
+        'de': ['*keller*'],
+        'es': ['sotano', 'bodega'],
+    },
+    'storage_room': {
+        'en': ['storage room', 'store room', 'storeroom'],
+        'de': ['abstellraum', 'lagerraum'],
+        'es': ['trastero'],
+    },
+    'furnished': {
+        'en': ['furnished', 'fully furnished'],
+        'de': ['mobliert', 'moebliert', 'voll mobliert', 'voll moebliert'],
+        'es': ['amueblado', 'amueblada', 'amueblados'],
+    },
+    'solar_panels': {
+        'en': ['solar panels', 'photovoltaic', 'photovoltaics'],
+        'de': ['*solaranlage*', 'photovoltaik*', 'solarmodule'],
+        'es': ['placas solares', 'paneles solares', 'fotovoltaica', 'fotovoltaicas'],
+    },
+    'tennis_court': {
+        'en': ['tennis court'],
+        'de': ['tennisplatz'],
+        'es': ['pista de tenis'],
+    },
+    'alarm': {
+        'en': ['alarm', 'alarm system', 'security system'],
+        'de': ['alarmanlage'],
+        'es': ['alarma'],
+    },
+    'barbecue': {
+        'en': ['barbecue', 'bbq'],
+        'de': ['grillplatz', 'grillecke'],
+        'es': ['barbacoa'],
+    },
+}
+
+AMENITY_TAGS = sorted(AMENITIES)
+
+# Words that contain a phrase but are not the amenity; they match and are dropped
+EXCLUSIONS = ['kindergarten', 'liverpool', 'carpool', 'ski lift', 'lift pass']
+
+# Words that cancel the phrase after them, possibly with DETERMINERS in between
+NEGATIONS = frozenset({'no', 'not', 'without', 'sin', 'kein', 'keine', 'keinen', 'ohne'})
+
+# Articles skipped when looking for a negation ("without a lift", "sin un ascensor", "ohne einen Aufzug")
+DETERMINERS = frozenset({'a', 'an', 'the', 'any', 'un', 'una', 'unos', 'unas', 'ein', 'eine', 'einen', 'einem', 'einer'})
+
+# Characters before a phrase searched for its negation
+NEGATION_WINDOW = 32
+
+# Property columns amenities are extracted from
+SOURCE_FIELDS = ('title', 'description', 'features')
+
+# Lowercase accent folding as a translate table, so texts are folded in C
+_FOLD = {
+    code: unicodedata.normalize('NFKD', chr(code))[0].lower()
+    for code in range(0xC0, 0x250)
+    if unicodedata.normalize('NFKD', chr(code))[0].isascii()
+}
+_FOLD.update({ord('ß'): 'ss', ord('ẞ'): 'ss'})
+
+
+def normalize_text(text):
+    """Lowercase and strip accents (ß becomes ss)"""
+    return text.lower().translate(_FOLD)
+
+
+class AmenityMatcher:
+    """Aho-Corasick automaton over the phrases of ``dictionary`` ({tag: {language: [phrase]}})"""
+
+    def __init__(self, dictionary, exclusions=()):
+        self.goto = [{}]
+        self.fail = [0]
+        # Per state: (phrase length, tag, may follow a letter, may precede a letter)
+        self.outputs = [[]]
+        for tag, languages in dictionary.items():
+            for phrases in languages.values():
+                for phrase in phrases:
+                    self._add(normalize_text(phrase), tag)
+        for phrase in exclusions:
+            self._add(normalize_text(phrase), None)
+        self._link()
+
+    def _add(self, phrase, tag):
+        open_start = phrase.startswith('*')
+        open_end = phrase.endswith('*')
+        phrase = phrase.strip('*')
+        state = 0
+        for char in phrase:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.outputs[state].append((len(phrase), tag, open_start, open_end))
+
+    def _link(self):
+        """Breadth-first failure links; each state also reports the outputs of its suffix states"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def matches(self, text):
+        """(start, end, tag) of every phrase occurrence that respects word boundaries"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        size = len(text)
+        found = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for length, tag, open_start, open_end in outputs[state]:
+                    start = end - length
+                    if not open_start and start and text[start - 1].isalnum():
+                        continue
+                    if not open_end and end < size and text[end].isalnum():
+                        continue
+                    found.append((start, end, tag))
+        return found
+
+    @staticmethod
+    def _negated(text, start):
+        """Whether the first word before ``start`` that is not a determiner is a negation"""
+        if start and text[start - 1].isalnum():
+            return False  # The phrase ends a compound word
+        window = max(0, start - NEGATION_WINDOW)
+        words = text[window:start].split()
+        if window and words and not text[window - 1].isspace():
+            words.pop(0)  # Cut off by the window
+        for word in reversed(words):
+            word = word.strip(',.;:()')
+            if word not in DETERMINERS:
+                return word in NEGATIONS
+        return False
+
+    def extract(self, text):
+        """Set of tags mentioned in ``text``, not negated and not part of an exclusion"""
+        text = normalize_text(text)
+        tags = set()
+        covered = 0
+        # Leftmost-longest: skip matches inside a longer one already taken
+        for start, end, tag in sorted(self.matches(text), key=lambda match: (match[0], -match[1])):
+            if start < covered:
+                continue
+            covered = end
+            if self._negated(text, start):
+                continue
+            tags.add(tag)
+        tags.discard(None)
+        return tags
+
+
+matcher = AmenityMatcher(AMENITIES, EXCLUSIONS)
+
+
+def extract_amenities(*texts):
+    """Sorted amenity tags mentioned in any of ``texts`` (None is skipped)"""
+    return sorted(set().union(*(matcher.extract(text) for text in texts if text)))
@@ -0,0 +1,319 @@
+"""
+Versioned response cache for Property endpoints
+Every write to Property bumps a global catalogue version; cache keys embed the
+version, so invalidation is a single counter increment and entries written
+for an older catalogue are simply never read again
+"""
+
+import hashlib
+import secrets
+import time
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+CATALOGUE_VERSION_KEY = 'properties:catalogue_version'
+CATALOGUE_BUMPED_AT_KEY = 'properties:catalogue_bumped_at'
+CACHE_STATS_PREFIX = 'properties:cache_stats'
+CACHE_STATS_COUNTERS = ('hits', 'misses', 'stale_served', 'coalesced', 'bytes_served', 'bytes_stored')
+
+
+def get_catalogue_version():
+    """Return the current catalogue version, initialising it if needed"""
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        # A cold cache cannot know when the catalogue last changed; assume now,
+        # and start from a time-based value so versions (and ETags) issued
+        # before a cache flush or restart are never reused
+        now = time.time()
+        cache.add(CATALOGUE_BUMPED_AT_KEY, now, timeout=None)
+        cache.add(CATALOGUE_VERSION_KEY, int(now * 1000), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY, int(now * 1000))
+    return version
+
+
+def get_catalogue_modified():
+    """Unix time of the last catalogue change, or None if unknown"""
+    return cache.get(CATALOGUE_BUMPED_AT_KEY)
+
+
+def bump_catalogue_version():
+    """Invalidate every cached Property response"""
+    cache.set(CATALOGUE_BUMPED_AT_KEY, time.time(), timeout=None)
+    try:
+        return cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        # Counter evicted or never set; start a fresh sequence
+        get_catalogue_version()
+        return cache.incr(CATALOGUE_VERSION_KEY)
+
+
+def _incr_stat(name, delta=1):
+    key = f'{CACHE_STATS_PREFIX}:{name}'
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def get_cache_stats():
+    """Return hit/miss counters and byte totals for the response cache"""
+    keys = {name: f'{CACHE_STATS_PREFIX}:{name}' for name in CACHE_STATS_COUNTERS}
+    values = cache.get_many(keys.values())
+    stats = {name: values.get(key, 0) for name, key in keys.items()}
+    lookups = stats['hits'] + stats['misses']
+    served = stats['hits'] + stats['stale_served'] + stats['coalesced']
+    stats['hit_ratio'] = round(served / lookups, 4) if lookups else 0.0
+    stats['catalogue_version'] = get_catalogue_version()
+    return stats
+
+
+def reset_cache_stats():
+    """Zero the response cache counters"""
+    cache.delete_many([f'{CACHE_STATS_PREFIX}:{name}' for name in CACHE_STATS_COUNTERS])
+
+
+def normalize_query_params(query_params, allowed, defaults=None, unordered=()):
+    """
+    Build a canonical representation of a query string.
+
+    Unknown parameters and empty values are dropped, defaults are filled in
+    and keys are sorted, so equivalent requests produce the same cache key.
+    Comma-separated values of parameters listed in ``unordered`` (set-like
+    filters such as ``region``) are sorted as well.
+    """
+    normalized = dict(defaults or {})
+    for name in allowed:
+        values = [value for value in query_params.getlist(name) if value != '']
+        if not values:
+            continue
+        parts = [part.strip() for value in values for part in value.split(',') if part.strip()]
+        if name in unordered:
+            parts = sorted(set(parts))
+        normalized[name] = ','.join(parts)
+    return sorted((name, str(value)) for name, value in normalized.items())
+
+
+class ResponseCache:
+    """Cache of rendered response bodies keyed on catalogue version"""
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout if timeout is not None else settings.PROPERTY_RESPONSE_CACHE_TIMEOUT
+
+    def make_digest(self, request, params):
+        """Version-independent digest of the normalized parameters"""
+        raw = '&'.join(f'{name}={value}' for name, value in params)
+        # Host and scheme end up in pagination links, so they are part of the key
+        raw = f'{request.scheme}://{request.get_host()}?{raw}'
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def make_key(self, request, params, version=None):
+        """Cache key for the given normalized parameters"""
+        if version is None:
+            version = get_catalogue_version()
+        return f'properties:response:{self.namespace}:v{version}:{self.make_digest(request, params)}'
+
+    def make_stale_key(self, request, params):
+        """Key of the pointer to the most recently stored version of a response"""
+        return f'properties:stale:{self.namespace}:{self.make_digest(request, params)}'
+
+    def get(self, key):
+        content = cache.get(key)
+        if content is None:
+            _incr_stat('misses')
+        else:
+            _incr_stat('hits')
+            _incr_stat('bytes_served', len(content))
+        return content
+
+    def set(self, key, content, stale_key=None):
+        cache.set(key, content, timeout=self.timeout)
+        if stale_key:
+            cache.set(stale_key, key, timeout=self.timeout)
+        _incr_stat('bytes_stored', len(content))
+
+    def get_stale(self, stale_key):
+        """
+        Return the last stored body for these parameters, whatever its version,
+        provided the catalogue changed less than PROPERTY_CACHE_STALE_SECONDS ago
+        """
+        bumped_at = cache.get(CATALOGUE_BUMPED_AT_KEY)
+        if bumped_at is not None and time.time() - bumped_at > settings.PROPERTY_CACHE_STALE_SECONDS:
+            return None
+        previous_key = cache.get(stale_key)
+        if previous_key is None:
+            return None
+        content = cache.get(previous_key)
+        if content is not None:
+            _incr_stat('stale_served')
+            _incr_stat('bytes_served', len(content))
+        return content
+
+
+class SingleFlight:
+    """
+    Per-key lock held in the Django cache.
+
+    The first worker to miss a key recomputes it; the others either serve a
+    stale copy or wait for the fresh one instead of running the same query.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, lock_timeout=None, wait_timeout=None):
+        self.lock_timeout = lock_timeout if lock_timeout is not None else settings.PROPERTY_CACHE_LOCK_TIMEOUT
+        self.wait_timeout = wait_timeout if wait_timeout is not None else settings.PROPERTY_CACHE_LOCK_WAIT
+
+    # Deletes KEYS[1] only while it still holds the token ARGV[1]
+    release_script = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def acquire(self, key):
+        """Token of the new lock holder, or None while another worker holds the lock"""
+        # An int, so the Redis backend stores it unpickled and the release script can compare it
+        token = secrets.randbits(62) + 1
+        if cache.add(f'{key}:lock', token, timeout=self.lock_timeout):
+            return token
+        return None
+
+    def release(self, key, token):
+        """
+        Delete the lock if it is still the one taken with ``token``; after a
+        slow compute it may have expired and been acquired by another worker.
+        """
+        lock_key = f'{key}:lock'
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        if isinstance(backend, RedisCache):
+            lock_key = backend.make_and_validate_key(lock_key)
+            client = backend._cache.get_client(lock_key, write=True)
+            client.eval(self.release_script, 1, lock_key, token)
+        elif cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def wait(self, key):
+        """Poll for the value the lock holder is computing"""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            content = cache.get(key)
+            if content is not None:
+                _incr_stat('coalesced')
+                _incr_stat('bytes_served', len(content))
+                return content
+            if cache.get(f'{key}:lock') is None:
+                # Holder gave up (error or uncacheable response)
+                return None
+        return None
+
+
+single_flight = SingleFlight()
+
+
+def catalogue_validators(key):
+    """Strong ETag and Last-Modified for a response derived from the catalogue version"""
+    etag = '"%s"' % hashlib.sha1(key.encode()).hexdigest()[:24]
+    modified = get_catalogue_modified()
+    return etag, int(modified) if modified is not None else None
+
+
+def row_validators(queryset, params):
+    """
+    Strong ETag and Last-Modified for a single-row response, from ``updated_at``.
+    Returns None when the row does not exist.
+    """
+    row = queryset.order_by().values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    pk, updated_at = row
+    raw = '&'.join(f'{name}={value}' for name, value in params)
+    digest = hashlib.sha1(f'{pk}:{updated_at.isoformat()}:{raw}'.encode()).hexdigest()[:24]
+    return f'"{digest}"', int(updated_at.timestamp())
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _serve_uncached(request, compute, validators):
+    if validators is None:
+        return compute()
+    etag, last_modified = validators
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+    response = compute()
+    if response.status_code != 200:
+        return response
+    return set_validators(response, etag, last_modified)
+
+
+def serve_cached(request, response_cache, params, compute, renderer_context=None, validators=None):
+    """
+    Return ``compute()``'s response from the cache when possible.
+
+    Only JSON-negotiated, successful responses are cached; the rendered body
+    is stored so hits skip both the query and serialization. Concurrent misses
+    for the same key are coalesced through ``single_flight``.
+
+    Responses carry a strong ETag and Last-Modified (from ``validators`` or the
+    catalogue version); conditional requests that match get a 304 before any
+    cache lookup or query.
+
+    Without a shared cache (PROPERTY_RESPONSE_CACHE off) nothing is cached and
+    only row-derived validators are used, since a per-process catalogue
+    version does not see writes made by other processes.
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    if renderer is None or renderer.format != 'json':
+        return compute()
+    if not settings.PROPERTY_RESPONSE_CACHE:
+        return _serve_uncached(request, compute, validators)
+
+    key = response_cache.make_key(request, params)
+    etag, last_modified = validators or catalogue_validators(key)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+
+    stale_key = response_cache.make_stale_key(request, params)
+    content = response_cache.get(key)
+    cache_status = 'HIT'
+
+    lock_token = None
+    if content is None:
+        lock_token = single_flight.acquire(key)
+        if lock_token is None:
+            # Someone else is recomputing this key
+            content = response_cache.get_stale(stale_key)
+            cache_status = 'STALE'
+            if content is None:
+                content = single_flight.wait(key)
+                cache_status = 'COALESCED'
+
+    if content is None:
+        # Lock holder, or a waiter that timed out
+        try:
+            response = compute()
+            if response.status_code != 200:
+                return response
+            content = renderer.render(response.data, request.accepted_media_type, renderer_context or {'request': request})
+            response_cache.set(key, content, stale_key)
+        finally:
+            if lock_token is not None:
+                single_flight.release(key, lock_token)
+        cache_status = 'MISS'
+
+    response = HttpResponse(content, content_type=renderer.media_type)
+    response['X-Cache'] = cache_status
+    if cache_status == 'STALE':
+        # A stale body must not be validated as the current version
+        return response
+    return set_validators(response, etag, last_modified)
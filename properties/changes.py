@@ -0,0 +1,112 @@
+"""
+Delta sync feed for Property mirrors
+Changes are read in ``(updated_at, id)`` keyset order from the property table
+and merged with tombstones of deleted rows in ``(deleted_at, id)`` order. The
+cursor is the position of the last change returned, so a client that stores
+it can resume exactly where it stopped.
+"""
+
+import base64
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Property, PropertyTombstone
+from .fast_serializers import property_values, serialize_row, format_datetime
+from .projections import ALL_FIELDS
+
+
+# Change kinds; upserts sort before deletes recorded at the same instant
+UPSERT = 0
+DELETE = 1
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp, kind, pk):
+    raw = json.dumps([timestamp.isoformat(), kind, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(timestamp, kind, pk)`` for a cursor, or None for an empty one"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, kind, pk = json.loads(raw)
+        timestamp = parse_datetime(timestamp)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if timestamp is None or kind not in (UPSERT, DELETE) or not isinstance(pk, int):
+        raise InvalidCursor(cursor)
+    return timestamp, kind, pk
+
+
+def _after(position, timestamp_field, kind):
+    """Rows of ``kind`` strictly after the cursor position"""
+    if position is None:
+        return Q()
+    timestamp, cursor_kind, pk = position
+    later = Q(**{f'{timestamp_field}__gt': timestamp})
+    if kind > cursor_kind:
+        return later | Q(**{timestamp_field: timestamp})
+    if kind == cursor_kind:
+        return later | Q(**{timestamp_field: timestamp, 'id__gt': pk})
+    return later
+
+
+def read_changes(cursor=None, limit=500, fields=None):
+    """
+    Return ``(changes, next_cursor, has_more)`` after ``cursor``.
+
+    Rows written in the last PROPERTY_CHANGES_SETTLE_SECONDS are held back:
+    ``updated_at`` and ``deleted_at`` are taken before the transaction
+    commits, so a recent row could still become visible behind a cursor that
+    has moved past it. Transactions writing properties must therefore commit
+    within that window.
+    """
+    position = decode_cursor(cursor)
+    horizon = timezone.now() - timedelta(seconds=settings.PROPERTY_CHANGES_SETTLE_SECONDS)
+    fields = fields or ALL_FIELDS
+    select = fields if 'updated_at' in fields else fields + ['updated_at']
+
+    upserts = property_values(
+        Property.objects.filter(_after(position, 'updated_at', UPSERT), updated_at__lt=horizon)
+        .order_by('updated_at', 'id'),
+        select
+    )[:limit + 1]
+    deletes = (
+        PropertyTombstone.objects.filter(_after(position, 'deleted_at', DELETE), deleted_at__lt=horizon)
+        .order_by('deleted_at', 'id')
+        .values('id', 'property_id', 'reference', 'deleted_at')
+    )[:limit + 1]
+
+    merged = [(row['updated_at'], UPSERT, row['id'], row) for row in upserts]
+    merged += [(row['deleted_at'], DELETE, row['id'], row) for row in deletes]
+    merged.sort(key=lambda change: change[:3])
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    changes = []
+    for timestamp, kind, pk, row in merged:
+        if kind == UPSERT:
+            if 'updated_at' not in fields:
+                row = {name: value for name, value in row.items() if name != 'updated_at'}
+            changes.append({'op': 'upsert', 'id': pk, 'property': serialize_row(row, fields)})
+        else:
+            changes.append({
+                'op': 'delete',
+                'id': row['property_id'],
+                'reference': row['reference'],
+                'deleted_at': format_datetime(row['deleted_at']),
+            })
+
+    if merged:
+        timestamp, kind, pk, _ = merged[-1]
+        cursor = encode_cursor(timestamp, kind, pk)
+    return changes, cursor or '', has_more
@@ -0,0 +1,135 @@
+"""
+Facet counts for the property search UI
+The match count and all facets for the current filter are computed in one
+round trip: a single GROUPING SETS query on PostgreSQL, or a single scan
+aggregated in Python on other backends. Region names are joined in the same
+query.
+"""
+
+from collections import Counter
+from django.db import connections
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import Cast
+
+
+# Bedroom counts at or above this value share one bucket
+BEDROOM_BUCKET_CAP = 5
+
+# Facet name -> column selected from the filtered queryset
+FACET_COLUMNS = {
+    'region': 'region_ref_id',
+    'category': 'category',
+    'platform': 'platform',
+    'energy_rating': 'energy_rating',
+    'bedrooms': 'bedroom_bucket',
+}
+
+
+def _bedroom_bucket():
+    return Case(
+        When(bedrooms__isnull=True, then=Value(None, output_field=CharField())),
+        When(bedrooms__gte=BEDROOM_BUCKET_CAP, then=Value(f'{BEDROOM_BUCKET_CAP}+')),
+        default=Cast('bedrooms', CharField()),
+        output_field=CharField(),
+    )
+
+
+def _facet_rows(queryset):
+    """
+    Filtered queryset reduced to the facet columns and the region name, in
+    SQL column order (the annotation is selected after the model columns)
+    """
+    return (
+        queryset.order_by()
+        .annotate(bedroom_bucket=_bedroom_bucket())
+        .values_list('region_ref', 'category', 'platform', 'energy_rating', 'region_ref__name', 'bedroom_bucket')
+    )
+
+
+def _count_with_grouping_sets(queryset):
+    """One GROUPING SETS query over the filtered rows (PostgreSQL)"""
+    rows = _facet_rows(queryset)
+    sql, params = rows.query.sql_with_params()
+    columns = list(FACET_COLUMNS.values())
+    column_list = ', '.join(columns)
+    # The region name is functionally dependent on the id; the empty set gives the total
+    grouping_sets = ', '.join(
+        ['(region_ref_id, region_name)'] + [f'({column})' for column in columns[1:]] + ['()']
+    )
+    query = (
+        f'SELECT {column_list}, region_name, GROUPING({column_list}), COUNT(*) '
+        f'FROM ({sql}) AS filtered '
+        f'("region_ref_id", "category", "platform", "energy_rating", "region_name", "bedroom_bucket") '
+        f'GROUP BY GROUPING SETS ({grouping_sets})'
+    )
+
+    # GROUPING() sets a bit for every column *not* in the row's grouping set
+    full_mask = (1 << len(columns)) - 1
+    facet_by_mask = {
+        full_mask ^ (1 << (len(columns) - 1 - index)): name
+        for index, name in enumerate(FACET_COLUMNS)
+    }
+
+    total = 0
+    counts = {name: Counter() for name in FACET_COLUMNS}
+    region_names = {}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(query, params)
+        for row in cursor.fetchall():
+            *values, region_name, mask, count = row
+            if mask == full_mask:
+                total = count
+                continue
+            name = facet_by_mask.get(mask)
+            if name is None:
+                continue
+            value = values[list(FACET_COLUMNS).index(name)]
+            if value is not None:
+                counts[name][value] += count
+                if name == 'region':
+                    region_names[value] = region_name
+    return total, counts, region_names
+
+
+def _count_in_python(queryset):
+    """One scan over the filtered rows, aggregated in Python"""
+    total = 0
+    counts = {name: Counter() for name in FACET_COLUMNS}
+    region_names = {}
+    names = list(FACET_COLUMNS)
+    for region_id, category, platform, energy_rating, region_name, bedroom_bucket in (
+        _facet_rows(queryset).iterator(chunk_size=2000)
+    ):
+        total += 1
+        row = (region_id, category, platform, energy_rating, bedroom_bucket)
+        for name, value in zip(names, row):
+            if value is not None:
+                counts[name][value] += 1
+        if row[0] is not None:
+            region_names[row[0]] = region_name
+    return total, counts, region_names
+
+
+def compute_facets(queryset):
+    """
+    Return the number of rows in ``queryset`` and its facet counts:
+    ``{facet: [{'value': ..., 'count': n}, ...]}`` ordered by count descending.
+    Region entries also carry the region ``id``.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        total, counts, region_names = _count_with_grouping_sets(queryset)
+    else:
+        total, counts, region_names = _count_in_python(queryset)
+
+    facets = {}
+    facets['region'] = [
+        {'id': region_id, 'value': region_names.get(region_id), 'count': total}
+        for region_id, total in counts['region'].most_common()
+    ]
+    for name in ('category', 'platform', 'energy_rating'):
+        facets[name] = [{'value': value, 'count': total} for value, total in counts[name].most_common()]
+    facets['bedrooms'] = [
+        {'value': value, 'count': counts['bedrooms'][value]}
+        for value in sorted(counts['bedrooms'], key=lambda bucket: int(bucket.rstrip('+')))
+    ]
+    return total, facets
@@ -0,0 +1,51 @@
+"""
+Fast-path serialization for Property rows
+Builds response dicts straight from ``QuerySet.values()`` instead of
+instantiating ``PropertySerializer`` for every row. Output matches
+``PropertySerializer`` field for field.
+"""
+
+from django.db import models
+from django.utils import timezone
+from .models import Property
+from .projections import ALL_FIELDS
+
+
+DATETIME_FIELDS = frozenset(
+    field.name for field in Property._meta.concrete_fields
+    if isinstance(field, models.DateTimeField)
+)
+
+
+def format_datetime(value):
+    """Format a datetime exactly like DRF's ``DateTimeField``"""
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def property_values(queryset, fields=None):
+    """Return a ``values()`` queryset for the given projection"""
+    return queryset.values(*(fields or ALL_FIELDS))
+
+
+def serialize_rows(rows, fields=None):
+    """Convert ``values()`` rows into PropertySerializer-compatible dicts"""
+    fields = fields or ALL_FIELDS
+    datetime_fields = [name for name in fields if name in DATETIME_FIELDS]
+    data = []
+    for row in rows:
+        for name in datetime_fields:
+            row[name] = format_datetime(row[name])
+        data.append(row)
+    return data
+
+
+def serialize_row(row, fields=None):
+    """Convert a single ``values()`` row"""
+    return serialize_rows([row], fields)[0]
@@ -1,5 +1,28 @@
 import django_filters
-from .models import Property
+from django.db.models import Exists, OuterRef, Q
+from .amenity_matcher import AMENITY_TAGS
+from .models import Property, PropertyAmenity
+
+
+# Filter parameters whose comma-separated values are order-independent
+UNORDERED_FILTER_PARAMS = ('region', 'category', 'energy_rating', 'region_id', 'town_id', 'features')
+
+# Fields the property list can be ordered by, and its default ordering
+ORDERING_FIELDS = ['price', 'square_meters', 'created_at', 'updated_at']
+DEFAULT_ORDERING = ['-created_at']
+
+# Range of the bigint primary key; other ids cannot exist and would fail in the database
+PROPERTY_ID_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    """Comma-separated list of numbers (e.g. ids)"""
+    pass
+
+
+class AmenityInFilter(django_filters.BaseInFilter, django_filters.ChoiceFilter):
+    """Comma-separated list of amenity tags"""
+    pass
 
 
 class PropertyFilter(django_filters.FilterSet):
@@ -13,6 +36,13 @@ class PropertyFilter(django_filters.FilterSet):
     category = django_filters.BaseInFilter()
     energy_rating = django_filters.BaseInFilter()
     
+    # Amenities extracted from the listing text; a property must have all of them
+    features = AmenityInFilter(method='filter_features', choices=[(tag, tag) for tag in AMENITY_TAGS])
+    
+    # Location dimension ids (see /api/properties/regions/?detailed=true)
+    region_id = NumberInFilter(field_name='region_ref_id', lookup_expr='in')
+    town_id = NumberInFilter(field_name='town_ref_id', lookup_expr='in')
+    
     # Range filters - match API docs exactly
     price_min = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
     price_max = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
@@ -47,13 +77,19 @@ class PropertyFilter(django_filters.FilterSet):
         """Search in title, description, region, and town fields"""
         if value:
             return queryset.filter(
-                django_filters.Q(title__icontains=value) |
-                django_filters.Q(description__icontains=value) |
-                django_filters.Q(region__icontains=value) |
-                django_filters.Q(town__icontains=value)
+                Q(title__icontains=value) |
+                Q(description__icontains=value) |
+                Q(region__icontains=value) |
+                Q(town__icontains=value)
             )
         return queryset
     
+    def filter_features(self, queryset, name, value):
+        """Properties tagged with every requested amenity (see properties.amenity_matcher)"""
+        for tag in dict.fromkeys(value):
+            queryset = queryset.filter(Exists(PropertyAmenity.objects.filter(property=OuterRef('pk'), tag=tag)))
+        return queryset
+    
     def filter_page(self, queryset, name, value):
         """Handle page parameter for pagination"""
         if value and value >= 1:
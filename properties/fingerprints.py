@@ -0,0 +1,60 @@
+"""
+Content fingerprints for Property rows
+A fingerprint is a hash of the scraped content fields only (no ids, derived
+location references or timestamps), so a client can tell whether a payload
+it is about to upload differs from what is stored without fetching the row.
+"""
+
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+import orjson
+from django.utils import timezone
+from .models import Property
+
+
+# Fields written by scrapers; everything else on Property is derived or bookkeeping
+NON_CONTENT_FIELDS = ('id', 'region_ref', 'town_ref', 'content_fingerprint', 'created_at', 'updated_at')
+CONTENT_FIELDS = [
+    field for field in Property._meta.concrete_fields
+    if field.name not in NON_CONTENT_FIELDS
+]
+
+
+def _canonical(field, value):
+    if value is None:
+        return None
+    value = field.to_python(value)
+    if isinstance(value, datetime):
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        value = value.astimezone(dt_timezone.utc)
+    return value
+
+
+def content_fingerprint(data):
+    """
+    Fingerprint of a mapping of Property field names to values.
+    Missing fields take the model default, as they would on create.
+    """
+    canonical = {
+        field.name: _canonical(field, data[field.name] if field.name in data else field.get_default())
+        for field in CONTENT_FIELDS
+    }
+    return hashlib.sha1(orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def fields_fingerprint(data):
+    """
+    Fingerprint of only the content fields present in ``data``, for merge
+    writes that leave the other fields as stored.
+    """
+    canonical = {
+        field.name: _canonical(field, data[field.name])
+        for field in CONTENT_FIELDS if field.name in data
+    }
+    return hashlib.sha1(orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def instance_fingerprint(instance):
+    """Fingerprint of a Property instance's current field values"""
+    return content_fingerprint({field.name: getattr(instance, field.attname) for field in CONTENT_FIELDS})
@@ -0,0 +1,269 @@
+"""
+In-process columnar index for property list filtering
+The columns most list requests filter and sort on are held as NumPy arrays,
+with packed per-value bitmaps for the low-cardinality categorical columns.
+A list request is answered by computing the ordered id list in memory; only
+the rows of the requested page are then fetched from the database by
+primary key.
+
+The index is optional (PROPERTY_HOT_INDEX) and lives in each worker process.
+It is tied to the catalogue version: when the version moves, rows changed
+since the last sync are patched in, or the whole index is rebuilt once it is
+older than PROPERTY_HOT_INDEX_MAX_AGE.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from .cache import get_catalogue_version
+from .filters import PropertyFilter
+from .models import Property, PropertyTombstone
+
+
+NUMERIC_COLUMNS = ('price', 'square_meters', 'bedrooms', 'bathrooms', 'land_area')
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+CATEGORICAL_COLUMNS = ('region', 'category', 'platform', 'energy_rating', 'region_ref_id', 'town_ref_id')
+HOT_COLUMNS = ('id',) + NUMERIC_COLUMNS + TIMESTAMP_COLUMNS + CATEGORICAL_COLUMNS
+
+# Filters that do not restrict rows (handled by the paginator)
+PASSTHROUGH_FILTERS = ('page', 'page_size')
+
+# Categorical columns with more distinct values than this are matched on codes instead of bitmaps
+BITMAP_MAX_VALUES = 256
+
+# A patch touching more than this fraction of the rows falls back to a full rebuild
+PATCH_MAX_FRACTION = 0.1
+
+# Changes are re-read this far behind the last sync, since updated_at is set before commit
+PATCH_OVERLAP_SECONDS = 60
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _microseconds(value):
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _filter_plan():
+    """Map each PropertyFilter filter to how the index evaluates it"""
+    plan = {}
+    for name, filter_ in PropertyFilter.base_filters.items():
+        column = filter_.field_name
+        if name in PASSTHROUGH_FILTERS:
+            plan[name] = None
+        elif getattr(filter_, 'method', None):
+            continue  # e.g. full-text search: not supported
+        elif column in NUMERIC_COLUMNS and filter_.lookup_expr in ('gte', 'lte'):
+            plan[name] = ('range', column, filter_.lookup_expr)
+        elif column in CATEGORICAL_COLUMNS and filter_.lookup_expr in ('in', 'exact'):
+            plan[name] = ('member', column, filter_.lookup_expr)
+    return plan
+
+
+FILTER_PLAN = _filter_plan()
+UNSUPPORTED_FILTERS = [name for name in PropertyFilter.base_filters if name not in FILTER_PLAN]
+
+
+class _Snapshot:
+    """Immutable set of column arrays for one catalogue version"""
+
+    def __init__(self, columns, vocabularies, version, synced_at, built_at):
+        self.ids = columns['id']
+        self.columns = columns
+        self.vocabularies = vocabularies  # column -> {value: code}
+        self.version = version
+        self.synced_at = synced_at
+        self.built_at = built_at
+        self.bitmaps = {}
+        for column, vocabulary in vocabularies.items():
+            if len(vocabulary) <= BITMAP_MAX_VALUES:
+                codes = columns[column]
+                self.bitmaps[column] = {code: np.packbits(codes == code) for code in vocabulary.values()}
+        self._orderings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _member_mask(self, column, values):
+        vocabulary = self.vocabularies[column]
+        codes = [vocabulary[value] for value in values if value in vocabulary]
+        if not codes:
+            return np.zeros(len(self), dtype=bool)
+        bitmaps = self.bitmaps.get(column)
+        if bitmaps is None:
+            return np.isin(self.columns[column], codes)
+        packed = bitmaps[codes[0]]
+        for code in codes[1:]:
+            packed = packed | bitmaps[code]
+        return np.unpackbits(packed, count=len(self)).view(bool)
+
+    def mask(self, filters):
+        """Boolean mask of the rows matching ``[(plan, value), ...]``"""
+        mask = np.ones(len(self), dtype=bool)
+        for (kind, column, lookup), value in filters:
+            if kind == 'range':
+                values = self.columns[column]
+                mask &= values >= float(value) if lookup == 'gte' else values <= float(value)
+            else:
+                values = value if lookup == 'in' else [value]
+                if column in ('region_ref_id', 'town_ref_id'):
+                    values = [int(item) for item in values]
+                mask &= self._member_mask(column, values)
+        return mask
+
+    def _ordering(self, term):
+        """Row permutation for a single ordering term, ties broken by id; cached"""
+        with self._lock:
+            permutation = self._orderings.get(term)
+            if permutation is None:
+                column = term.lstrip('-')
+                values = self.columns[column]
+                permutation = np.lexsort((self.ids, -values if term.startswith('-') else values))
+                self._orderings[term] = permutation
+        return permutation
+
+    def ordered_ids(self, filters, ordering):
+        mask = self.mask(filters)
+        if len(ordering) == 1:
+            permutation = self._ordering(ordering[0])
+            return self.ids[permutation[mask[permutation]]]
+
+        rows = np.flatnonzero(mask)
+        keys = [self.ids[rows]]
+        for term in reversed(ordering):
+            values = self.columns[term.lstrip('-')][rows]
+            keys.append(-values if term.startswith('-') else values)
+        return self.ids[rows[np.lexsort(keys)]]
+
+
+def _encode(rows, vocabularies=None):
+    """Turn ``values_list`` rows into column arrays, extending the vocabularies"""
+    vocabularies = {column: dict(vocabulary) for column, vocabulary in (vocabularies or {}).items()}
+    columns = {}
+    for index, column in enumerate(HOT_COLUMNS):
+        values = [row[index] for row in rows]
+        if column == 'id':
+            columns[column] = np.array(values, dtype=np.int64)
+        elif column in NUMERIC_COLUMNS:
+            columns[column] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        elif column in TIMESTAMP_COLUMNS:
+            columns[column] = np.array([_microseconds(value) for value in values], dtype=np.int64)
+        else:
+            vocabulary = vocabularies.setdefault(column, {})
+            codes = []
+            for value in values:
+                if value is None:
+                    codes.append(-1)
+                    continue
+                code = vocabulary.get(value)
+                if code is None:
+                    code = vocabulary[value] = len(vocabulary)
+                codes.append(code)
+            columns[column] = np.array(codes, dtype=np.int32)
+    return columns, vocabularies
+
+
+def _load_rows(queryset, limit=None):
+    rows = queryset.order_by('id').values_list(*HOT_COLUMNS)
+    if limit is not None:
+        return list(rows[:limit])
+    return list(rows.iterator(chunk_size=10000))
+
+
+class HotIndex:
+    """Process-wide holder of the current snapshot"""
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Load every row and replace the snapshot"""
+        version = get_catalogue_version()
+        synced_at = timezone.now()
+        columns, vocabularies = _encode(_load_rows(Property.objects.all()))
+        self._snapshot = _Snapshot(columns, vocabularies, version, synced_at, time.monotonic())
+        return self._snapshot
+
+    def patch(self, snapshot):
+        """
+        Apply rows written and deleted since ``snapshot`` was synced.
+        Returns None when the change set is too large to patch.
+        """
+        version = get_catalogue_version()
+        synced_at = timezone.now()
+        since = snapshot.synced_at - timedelta(seconds=PATCH_OVERLAP_SECONDS)
+        limit = max(int(len(snapshot) * PATCH_MAX_FRACTION), 1)
+
+        changed = _load_rows(Property.objects.filter(updated_at__gte=since), limit + 1)
+        deleted = list(
+            PropertyTombstone.objects.filter(deleted_at__gte=since)
+            .values_list('property_id', flat=True)[:limit + 1]
+        )
+        if len(changed) + len(deleted) > limit:
+            return None
+
+        columns, vocabularies = _encode(changed, snapshot.vocabularies)
+        stale = np.isin(snapshot.ids, np.array([row[0] for row in changed] + deleted, dtype=np.int64))
+        merged = {
+            column: np.concatenate([snapshot.columns[column][~stale], columns[column]])
+            for column in HOT_COLUMNS
+        }
+        order = np.argsort(merged['id'], kind='stable')
+        merged = {column: values[order] for column, values in merged.items()}
+        self._snapshot = _Snapshot(merged, vocabularies, version, synced_at, snapshot.built_at)
+        return self._snapshot
+
+    def current(self):
+        """
+        Snapshot for the current catalogue version, syncing it if needed.
+        Returns None while another thread is syncing, so callers fall back
+        to the database instead of waiting.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == get_catalogue_version():
+            return snapshot
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == get_catalogue_version():
+                return snapshot
+            if snapshot is not None and time.monotonic() - snapshot.built_at < settings.PROPERTY_HOT_INDEX_MAX_AGE:
+                patched = self.patch(snapshot)
+                if patched is not None:
+                    return patched
+            return self.build()
+        finally:
+            self._lock.release()
+
+    def ordered_ids(self, query_params, ordering):
+        """
+        Ids matching a list request, in order, or None when the request
+        cannot be answered from the index (unsupported or invalid filters).
+        """
+        if any(query_params.get(name) for name in UNSUPPORTED_FILTERS):
+            return None
+        if any(column.lstrip('-') not in NUMERIC_COLUMNS + TIMESTAMP_COLUMNS for column in ordering):
+            return None
+
+        form = PropertyFilter(query_params, queryset=Property.objects.none()).form
+        if not form.is_valid():
+            return None
+        filters = [
+            (FILTER_PLAN[name], value)
+            for name, value in form.cleaned_data.items()
+            if FILTER_PLAN.get(name) and value not in (None, '', [])
+        ]
+
+        snapshot = self.current()
+        if snapshot is None:
+            return None
+        return snapshot.ordered_ids(filters, ordering)
+
+
+hot_index = HotIndex()
@@ -0,0 +1,111 @@
+"""
+Normalized region/town dimension
+Scrapers copy region and town verbatim, so the same place arrives with
+different casing, accents and spacing. Each spelling is folded to a key and
+mapped to a single Region/Town row whose property_count is kept up to date on
+every Property write.
+"""
+
+import re
+import unicodedata
+from django.db import transaction
+from django.db.models import Count, F
+from .models import Property, Region, Town
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_location_name(value):
+    """Collapse whitespace in a display name"""
+    if value is None:
+        return ''
+    return _WHITESPACE.sub(' ', str(value)).strip()
+
+
+def normalize_location_name(value):
+    """Fold case, accents and whitespace so spellings of one place share a key"""
+    value = unicodedata.normalize('NFKD', clean_location_name(value))
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return value.casefold()
+
+
+def resolve_region(name):
+    """Return the Region for a free-text region name, creating it if needed"""
+    normalized = normalize_location_name(name)
+    if not normalized:
+        return None
+    region, _ = Region.objects.get_or_create(
+        normalized_name=normalized,
+        defaults={'name': clean_location_name(name)}
+    )
+    return region
+
+
+def resolve_town(region, name):
+    """Return the Town for a free-text town name within ``region``"""
+    normalized = normalize_location_name(name)
+    if region is None or not normalized:
+        return None
+    town, _ = Town.objects.get_or_create(
+        region=region,
+        normalized_name=normalized,
+        defaults={'name': clean_location_name(name)}
+    )
+    return town
+
+
+def assign_location(instance):
+    """Point ``instance.region_ref``/``town_ref`` at the dimension rows for its text fields"""
+    region = resolve_region(instance.region)
+    instance.region_ref = region
+    instance.town_ref = resolve_town(region, instance.town)
+
+
+def adjust_location_counts(region_id, town_id, delta):
+    """Add ``delta`` to the property counts of a region/town pair"""
+    if region_id:
+        Region.objects.filter(pk=region_id).update(property_count=F('property_count') + delta)
+    if town_id:
+        Town.objects.filter(pk=town_id).update(property_count=F('property_count') + delta)
+
+
+@transaction.atomic
+def rebuild_locations(batch_size=1000):
+    """
+    Backfill region_ref/town_ref for every property and recompute counts.
+
+    Used after bulk operations that bypass model signals (bulk_create,
+    queryset.update) and for the initial migration of existing data.
+    """
+    regions = {}
+    towns = {}
+    pending = []
+
+    rows = Property.objects.values_list('id', 'region', 'town', 'region_ref_id', 'town_ref_id')
+    for property_id, region_name, town_name, region_id, town_id in rows.iterator(chunk_size=batch_size):
+        region_key = normalize_location_name(region_name)
+        if region_key and region_key not in regions:
+            regions[region_key] = resolve_region(region_name)
+        region = regions.get(region_key)
+
+        town_key = (region_key, normalize_location_name(town_name))
+        if region and town_key[1] and town_key not in towns:
+            towns[town_key] = resolve_town(region, town_name)
+        town = towns.get(town_key) if region else None
+
+        new_region_id = region.pk if region else None
+        new_town_id = town.pk if town else None
+        if (new_region_id, new_town_id) != (region_id, town_id):
+            pending.append(Property(pk=property_id, region_ref_id=new_region_id, town_ref_id=new_town_id))
+
+    Property.objects.bulk_update(pending, ['region_ref', 'town_ref'], batch_size=batch_size)
+
+    Region.objects.update(property_count=0)
+    Town.objects.update(property_count=0)
+    for row in Property.objects.exclude(region_ref=None).order_by().values('region_ref').annotate(total=Count('id')):
+        Region.objects.filter(pk=row['region_ref']).update(property_count=row['total'])
+    for row in Property.objects.exclude(town_ref=None).order_by().values('town_ref').annotate(total=Count('id')):
+        Town.objects.filter(pk=row['town_ref']).update(property_count=row['total'])
+
+    return len(pending)
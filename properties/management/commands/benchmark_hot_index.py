@@ -0,0 +1,124 @@
+import statistics
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.http import QueryDict
+from properties.models import Property
+from properties.filters import PropertyFilter
+from properties.fast_serializers import property_values, serialize_rows
+from properties.hot_index import HotIndex
+from properties.projections import PROJECTIONS
+from properties.synthetic import generate_properties
+
+
+# (query string, ordering) pairs resembling list traffic
+SCENARIOS = [
+    ('', '-created_at'),
+    ('price_min=200000&price_max=800000', '-created_at'),
+    ('region=Palma,Calvià&bedrooms=3', 'price'),
+    ('category=villa&platform=idealista&energy_rating=A,B', '-price'),
+    ('square_meters_min=100&bathrooms=2&land_area_min=500', '-updated_at'),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare the in-memory hot index against the ORM list path on synthetic catalogues'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='100000,1000000',
+            help='Comma-separated catalogue sizes to benchmark (default: 100000,1000000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Runs per scenario and path (default: 10)'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Rows per page (default: 100)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+
+        # Synthetic rows are inserted in a transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                for size in sizes:
+                    self._grow_catalogue(size)
+                    self._benchmark(size, options['repeat'], options['page_size'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _grow_catalogue(self, size):
+        existing = Property.objects.count()
+        missing = size - existing
+        if missing <= 0:
+            return
+
+        self.stdout.write(f'Inserting {missing:,} synthetic properties...')
+        rows = generate_properties(missing, seed=size, start=existing, prefix='benchmark-')
+        while batch := list(islice(rows, 5000)):
+            Property.objects.bulk_create(batch)
+
+    def _benchmark(self, size, repeat, page_size):
+        fields = PROJECTIONS['card']
+        index = HotIndex()
+        start = time.perf_counter()
+        index.build()
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n{size:,} rows - index built in {time.perf_counter() - start:.2f}s'
+        ))
+        self.stdout.write(f"{'scenario':<72} {'matches':>9} {'ORM ms':>9} {'index ms':>9} {'speedup':>8}")
+
+        for query, ordering in SCENARIOS:
+            params = QueryDict(query)
+
+            def orm_path():
+                queryset = PropertyFilter(params, queryset=Property.objects.all()).qs.order_by(ordering)
+                count = queryset.count()
+                rows = serialize_rows(property_values(queryset, fields)[:page_size], fields)
+                return count, [row['id'] for row in rows]
+
+            def index_path():
+                ordered_ids = index.ordered_ids(params, [ordering])
+                page_ids = [int(pk) for pk in ordered_ids[:page_size]]
+                rows = {row['id']: row for row in property_values(Property.objects.filter(pk__in=page_ids), fields)}
+                rows = serialize_rows([rows[pk] for pk in page_ids], fields)
+                return len(ordered_ids), [row['id'] for row in rows]
+
+            # Ties are broken by id in the index; compare against the same order
+            expected_queryset = PropertyFilter(params, queryset=Property.objects.all()).qs.order_by(ordering, 'id')
+            expected = (expected_queryset.count(), list(expected_queryset.values_list('id', flat=True)[:page_size]))
+            if index_path() != expected:
+                self.stdout.write(self.style.WARNING(f'Results differ for {query or "(no filter)"}'))
+
+            timings = {}
+            for name, func in (('orm', orm_path), ('index', index_path)):
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    func()
+                    samples.append((time.perf_counter() - start) * 1000)
+                timings[name] = statistics.median(samples)
+
+            label = f"{query or '(no filter)'} ordering={ordering}"
+            self.stdout.write(
+                f"{label:<72} {expected[0]:>9,} {timings['orm']:>9.2f} {timings['index']:>9.2f} "
+                f"{timings['orm'] / timings['index']:>7.1f}x"
+            )
@@ -0,0 +1,73 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from properties.models import Property
+from properties.serializers import PropertySerializer
+from properties.fast_serializers import property_values, serialize_rows
+from properties.projections import PROJECTIONS
+from properties.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Compare PropertySerializer + JSONRenderer against the values()/orjson fast path'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='Rows per page to serialize (default: 100)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Number of pages to serialize per path (default: 50)'
+        )
+        parser.add_argument(
+            '--fields',
+            type=str,
+            default='full',
+            choices=sorted(PROJECTIONS),
+            help='Projection profile to benchmark (default: full)'
+        )
+    
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+        fields = PROJECTIONS[options['fields']]
+        
+        queryset = Property.objects.all()
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        queryset = queryset.order_by('-created_at')[:rows]
+        
+        sample_size = queryset.count()
+        if not sample_size:
+            raise CommandError('No properties in the database to benchmark')
+        
+        def serializer_path():
+            data = PropertySerializer(list(queryset), many=True, fields=fields).data
+            return JSONRenderer().render(data)
+        
+        def fast_path():
+            data = serialize_rows(property_values(queryset, fields), fields)
+            return ORJSONRenderer().render(data)
+        
+        if serializer_path() != fast_path():
+            self.stdout.write(self.style.WARNING('Outputs differ between the two paths'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Outputs are byte-identical'))
+        
+        results = {}
+        for name, func in (('PropertySerializer', serializer_path), ('fast path', fast_path)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            elapsed = time.perf_counter() - start
+            results[name] = sample_size * repeat / elapsed
+            self.stdout.write(f'{name:<20} {results[name]:>12,.0f} rows/s  ({elapsed:.3f}s for {repeat} x {sample_size} rows)')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"Speedup: {results['fast path'] / results['PropertySerializer']:.1f}x")
+        )
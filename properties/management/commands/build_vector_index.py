@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from utils.embeddings import get_embedding_backend
+from utils.vector_index import build_index
+
+
+class Command(BaseCommand):
+    help = 'Compile the stored property embeddings into the vector search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            type=str,
+            help='Embedding backend whose vectors are indexed (default: EMBEDDING_BACKEND)'
+        )
+        parser.add_argument(
+            '--lists',
+            type=int,
+            help='Number of IVF lists (default: 1 below 10,000 vectors, else the square root of the count)'
+        )
+
+    def handle(self, *args, **options):
+        model = get_embedding_backend(options['backend']).name
+        start = time.perf_counter()
+        count = build_index(model, lists=options['lists'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {count:,} {model} embeddings in {time.perf_counter() - start:.1f}s'
+        ))
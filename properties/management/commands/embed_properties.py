@@ -0,0 +1,81 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from utils.embedding_pipeline import embed_stale_properties
+from utils.embeddings import get_embedding_backend
+from utils.vector_index import build_index
+
+
+class Command(BaseCommand):
+    help = 'Embed properties whose embedding text changed since the last run, then rebuild the vector index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            type=str,
+            help='Embedding backend (default: EMBEDDING_BACKEND)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=256,
+            help='Texts per embedding request (default: 256)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Embedding requests in flight (default: 4)'
+        )
+        parser.add_argument(
+            '--max-retries',
+            type=int,
+            default=5,
+            help='Retries per failed request, with exponential backoff (default: 5)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Stop after this many candidate properties'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Compare the text hash of every property, not only those updated since their last check'
+        )
+        parser.add_argument(
+            '--no-index',
+            action='store_true',
+            help='Do not rebuild the vector index afterwards'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1 or options['max_retries'] < 0:
+            raise CommandError('--batch-size and --concurrency must be positive, --max-retries must not be negative')
+
+        backend = get_embedding_backend(options['backend'])
+        start = time.perf_counter()
+        run = embed_stale_properties(
+            backend,
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            max_retries=options['max_retries'],
+            full=options['full'],
+            limit=options['limit'],
+            progress=lambda run: self.stdout.write(f'  {run.embedded:,} embedded, {run.failed:,} failed', ending='\r'),
+        )
+        self.stdout.write(
+            f'{backend.name}: {run.candidates:,} candidates, {run.unchanged:,} unchanged, '
+            f'{run.embedded:,} embedded in {run.batches:,} batches ({run.retries:,} retries) '
+            f'in {time.perf_counter() - start:.1f}s'
+        )
+        if run.failed:
+            self.stdout.write(self.style.ERROR(
+                f'{run.failed:,} properties failed and will be retried next run: '
+                f'{", ".join(map(str, run.failed_ids[:20]))}{" ..." if run.failed > 20 else ""}'
+            ))
+
+        if run.embedded and not options['no_index']:
+            start = time.perf_counter()
+            count = build_index(backend.name)
+            self.stdout.write(f'Indexed {count:,} embeddings in {time.perf_counter() - start:.1f}s')
+        self.stdout.write(self.style.SUCCESS('Embeddings are up to date' if not run.failed else 'Done with failures'))
@@ -0,0 +1,76 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from utils.enrichment import enrich_properties
+from utils.openai_service import OpenAIService
+
+
+class Command(BaseCommand):
+    help = 'Store language model analysis, summary and feature suggestions for new and updated properties'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            type=str,
+            help='Language model backend (default: LLM_BACKEND)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Model calls in flight (default: 4)'
+        )
+        parser.add_argument(
+            '--rate-limit',
+            type=float,
+            help='Model calls per second (default: LLM_RATE_LIMIT; 0 for no limit)'
+        )
+        parser.add_argument(
+            '--max-retries',
+            type=int,
+            default=3,
+            help='Retries per failed call, with exponential backoff (default: 3)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100,
+            help='Properties read and written per batch (default: 100)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Stop after this many properties'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Process every property, not only new and updated ones (cached answers are reused)'
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['chunk_size'] < 1 or options['max_retries'] < 0:
+            raise CommandError('--concurrency and --chunk-size must be positive, --max-retries must not be negative')
+        rate_limit = options['rate_limit'] if options['rate_limit'] is not None else settings.LLM_RATE_LIMIT
+
+        service = OpenAIService(options['backend'])
+        start = time.perf_counter()
+        run = enrich_properties(
+            service,
+            concurrency=options['concurrency'],
+            rate_limit=rate_limit,
+            max_retries=options['max_retries'],
+            force=options['force'],
+            limit=options['limit'],
+            chunk_size=options['chunk_size'],
+            progress=lambda run: self.stdout.write(f'  {run.enriched:,} enriched, {run.failed:,} failed', ending='\r'),
+        )
+        self.stdout.write(
+            f'{service.backend.name}: {run.properties:,} properties, {run.enriched:,} enriched, '
+            f'{run.model_calls:,} model calls ({run.retries:,} retries), {run.cache_hits:,} cached answers '
+            f'in {time.perf_counter() - start:.1f}s'
+        )
+        if run.failed:
+            self.stdout.write(self.style.ERROR(f'{run.failed:,} properties failed and will be retried next run'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Enrichment is up to date'))
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from properties.amenities import rebuild_amenities
+from properties.cache import bump_catalogue_version
+
+
+class Command(BaseCommand):
+    help = 'Re-extract amenity tags from the text of every property (after bulk imports or dictionary changes)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Properties read per database round trip (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        run = rebuild_amenities(
+            batch_size=options['batch_size'],
+            progress=lambda run: self.stdout.write(f'  {run.properties:,} properties', ending='\r'),
+        )
+        elapsed = time.perf_counter() - start
+        if run.changed:
+            bump_catalogue_version()
+        rate = run.properties / run.extract_seconds if run.extract_seconds else 0
+        self.stdout.write(
+            f'{run.properties:,} properties in {elapsed:.1f}s '
+            f'(extraction {run.extract_seconds:.1f}s, {rate:,.0f} properties/s)'
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Amenities extracted ({run.changed:,} properties changed, '
+                               f'{run.added:,} tags added, {run.removed:,} removed)')
+        )
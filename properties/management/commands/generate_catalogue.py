@@ -0,0 +1,101 @@
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from properties.amenities import rebuild_amenities
+from properties.cache import bump_catalogue_version
+from properties.locations import rebuild_locations
+from properties.market_stats import refresh_market_stats
+from properties.models import Property, PropertyAmenity, PropertyEmbedding, PropertyEnrichment, PropertyTombstone
+from properties.synthetic import REFERENCE_PREFIX, generate_properties
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate a reproducible synthetic catalogue of Mallorca listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'count',
+            type=int,
+            help='Number of synthetic properties the catalogue should contain'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed; the same seed always produces the same rows (default: 42)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert (default: 5000)'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated synthetic properties first'
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        seed = options['seed']
+        batch_size = options['batch_size']
+        if count < 0 or seed < 0 or batch_size < 1:
+            raise CommandError('count and --seed must not be negative, --batch-size must be positive')
+
+        synthetic = Property.objects.filter(reference__startswith=REFERENCE_PREFIX)
+        if options['clear']:
+            self._clear(synthetic, batch_size)
+
+        # Rows are numbered, so an interrupted or smaller earlier run is topped up
+        existing = synthetic.filter(reference__startswith=f'{REFERENCE_PREFIX}{seed}-').count()
+        missing = count - existing
+        if missing > 0:
+            self.stdout.write(f'Generating {missing:,} properties (seed {seed})...')
+            start = time.perf_counter()
+            rows = generate_properties(missing, seed=seed, start=existing)
+            inserted = 0
+            while batch := list(islice(rows, batch_size)):
+                with transaction.atomic():
+                    Property.objects.bulk_create(batch, batch_size=batch_size)
+                inserted += len(batch)
+                self.stdout.write(f'  {inserted:,}/{missing:,}', ending='\r')
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'  {inserted:,} rows in {elapsed:.1f}s ({inserted / elapsed:,.0f} rows/s)')
+
+        # bulk_create bypasses the signals that maintain the derived data
+        self.stdout.write('Recomputing location counts, amenities and market statistics...')
+        rebuild_locations(batch_size=batch_size)
+        rebuild_amenities(queryset=synthetic)
+        refresh_market_stats(full=True)
+        bump_catalogue_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Synthetic catalogue ready ({max(count, existing):,} properties, seed {seed})')
+        )
+
+    def _clear(self, synthetic, batch_size):
+        """
+        Delete synthetic rows in bulk, leaving the tombstones the delete signal
+        would. Rows referencing them are deleted first, so no foreign key
+        blocks the bulk delete. Every batch commits on its own, so tombstones
+        never commit behind a delta sync cursor (PROPERTY_CHANGES_SETTLE_SECONDS).
+        """
+        deleted = 0
+        table = connection.ops.quote_name(Property._meta.db_table)
+        # Deleted rows drop out of the query, so it always returns the next batch
+        while batch := list(synthetic.values_list('id', 'reference')[:batch_size]):
+            ids = [pk for pk, _ in batch]
+            with transaction.atomic():
+                for model in (PropertyAmenity, PropertyEmbedding, PropertyEnrichment):
+                    model.objects.filter(property_id__in=ids).delete()
+                PropertyTombstone.objects.bulk_create(
+                    [PropertyTombstone(property_id=pk, reference=reference) for pk, reference in batch]
+                )
+                # A queryset delete would run the per-row delete signals
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DELETE FROM {table} WHERE id IN ({", ".join(["%s"] * len(ids))})', ids)
+            deleted += len(batch)
+            self.stdout.write(f'  {deleted:,} deleted', ending='\r')
+        self.stdout.write(f'Deleted {deleted:,} synthetic properties')
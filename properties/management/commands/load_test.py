@@ -0,0 +1,230 @@
+import json
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from properties.synthetic import CATEGORIES, PLATFORMS, REFERENCE_PREFIX, REGIONS
+
+
+# Scenario: relative weight in the request mix
+SCENARIO_WEIGHTS = {
+    'list': 25,
+    'filter': 30,
+    'search': 10,
+    'detail': 15,
+    'reference': 10,
+    'facets': 4,
+    'export_csv': 3,
+    'export_json': 3,
+}
+
+SEARCH_TERMS = ['pool', 'sea views', 'Meerblick', 'piscina', 'terrace', 'Port', 'villa', 'Garten']
+
+EXPORT_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = 'Drive the API with a seeded, concurrent request mix and report latency percentiles per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default=settings.BOT_API_URL,
+            help='API root to test (default: BOT_API_URL)'
+        )
+        parser.add_argument('--username', type=str, default=settings.BOT_USERNAME)
+        parser.add_argument('--password', type=str, default=settings.BOT_PASSWORD)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Total requests to send (default: 2000)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Concurrent clients (default: 8)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Seed of the request mix and of the synthetic catalogue to target (default: 42)'
+        )
+        parser.add_argument(
+            '--catalogue-size',
+            type=int,
+            default=10000,
+            help='Size of the synthetic catalogue generated with generate_catalogue (default: 10000)'
+        )
+        parser.add_argument(
+            '--scenarios',
+            type=str,
+            default=','.join(SCENARIO_WEIGHTS),
+            help=f"Comma-separated scenarios to include (default: {','.join(SCENARIO_WEIGHTS)})"
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Also write the results as JSON to this file'
+        )
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIO_WEIGHTS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['catalogue_size'] < 1:
+            raise CommandError('--requests, --concurrency and --catalogue-size must be positive')
+
+        self.base_url = options['base_url'].rstrip('/')
+        self.token = self._login(options['username'], options['password'])
+        rng = random.Random(options['seed'])
+
+        references = [
+            f"{REFERENCE_PREFIX}{options['seed']}-{number}"
+            for number in rng.sample(range(options['catalogue_size']), min(options['catalogue_size'], 2000))
+        ]
+        self.ids = self._resolve_ids(references)
+        if not self.ids:
+            raise CommandError(
+                f"No synthetic properties found for seed {options['seed']}; "
+                f"run generate_catalogue {options['catalogue_size']} --seed {options['seed']} first"
+            )
+        self.references = [reference for reference in references if reference in self.ids]
+
+        plan = [self._make_request(rng, name) for name in rng.choices(
+            scenarios, weights=[SCENARIO_WEIGHTS[name] for name in scenarios], k=options['requests']
+        )]
+
+        self.stdout.write(
+            f"Sending {len(plan):,} requests to {self.base_url} with {options['concurrency']} clients..."
+        )
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        local = threading.local()
+
+        def send(item):
+            name, method, path, body = item
+            session = getattr(local, 'session', None)
+            if session is None:
+                session = local.session = requests.Session()
+                session.headers['Authorization'] = f'Bearer {self.token}'
+            start = time.perf_counter()
+            try:
+                response = session.request(method, f'{self.base_url}/{path}', json=body, timeout=60)
+                response.content  # include the body transfer in the timing
+                failed = response.status_code >= 400
+            except requests.RequestException:
+                failed = True
+            return name, time.perf_counter() - start, failed
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            for name, duration, failed in executor.map(send, plan):
+                samples[name].append(duration)
+                errors[name] += int(failed)
+        elapsed = time.perf_counter() - start
+
+        results = {name: self._summarize(samples[name], errors[name], elapsed) for name in scenarios if samples[name]}
+        results['total'] = self._summarize([d for name in samples for d in samples[name]], sum(errors.values()), elapsed)
+        self._report(results, elapsed)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'options': {
+                    key: options[key] for key in ('base_url', 'requests', 'concurrency', 'seed', 'catalogue_size')
+                }, 'elapsed_s': elapsed, 'results': results}, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _login(self, username, password):
+        try:
+            response = requests.post(
+                f'{self.base_url}/login/', json={'username': username, 'password': password}, timeout=30
+            )
+        except requests.RequestException as e:
+            raise CommandError(f'Cannot reach {self.base_url}: {e}')
+        if response.status_code != 200:
+            raise CommandError(f'Login failed ({response.status_code}): {response.text[:200]}')
+        return response.json()['access']
+
+    def _resolve_ids(self, references):
+        response = requests.post(
+            f'{self.base_url}/properties/lookup/',
+            json={'references': references, 'exists_only': True},
+            headers={'Authorization': f'Bearer {self.token}'},
+            timeout=60
+        )
+        if response.status_code != 200:
+            raise CommandError(f'Lookup failed ({response.status_code}): {response.text[:200]}')
+        return {reference: item['id'] for reference, item in response.json()['results'].items()}
+
+    def _make_request(self, rng, name):
+        """(scenario, method, path, body) of one request, drawn from the seeded RNG"""
+        if name == 'list':
+            return name, 'GET', f'properties/?page={rng.randint(1, 20)}&page_size=20', None
+        if name == 'filter':
+            low = rng.choice([100000, 250000, 500000, 1000000])
+            params = {
+                'region': rng.choice(list(REGIONS)),
+                'price_min': low,
+                'price_max': low * rng.choice([2, 4, 10]),
+            }
+            if rng.random() < 0.5:
+                params['category'] = rng.choice(list(CATEGORIES))
+            if rng.random() < 0.4:
+                params['bedrooms'] = rng.randint(1, 5)
+            if rng.random() < 0.3:
+                params['platform'] = rng.choice(list(PLATFORMS))
+            params['ordering'] = rng.choice(['-created_at', 'price', '-price', 'square_meters'])
+            return name, 'GET', f'properties/?{urlencode(params)}&page_size=20', None
+        if name == 'search':
+            return name, 'GET', f"properties/?{urlencode({'search': rng.choice(SEARCH_TERMS)})}&page_size=20", None
+        if name == 'detail':
+            return name, 'GET', f'properties/{self.ids[rng.choice(self.references)]}/', None
+        if name == 'reference':
+            return name, 'GET', f'properties/reference/{rng.choice(self.references)}/', None
+        if name == 'facets':
+            return name, 'GET', f"properties/facets/?{urlencode({'region': rng.choice(list(REGIONS))})}", None
+        ids = [self.ids[reference] for reference in rng.sample(self.references, min(EXPORT_SIZE, len(self.references)))]
+        path = 'csv/' if name == 'export_csv' else 'json/'
+        return name, 'POST', path, {'property_ids': ids}
+
+    def _summarize(self, durations, errors, elapsed):
+        durations = sorted(durations)
+        if len(durations) > 1:
+            cuts = statistics.quantiles(durations, n=100, method='inclusive')
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = durations[0]
+        return {
+            'requests': len(durations),
+            'errors': errors,
+            'p50_ms': round(p50 * 1000, 2),
+            'p95_ms': round(p95 * 1000, 2),
+            'p99_ms': round(p99 * 1000, 2),
+            'max_ms': round(durations[-1] * 1000, 2),
+            'throughput_rps': round(len(durations) / elapsed, 1),
+        }
+
+    def _report(self, results, elapsed):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nCompleted in {elapsed:.1f}s'))
+        self.stdout.write(
+            f"{'endpoint':<14} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'max ms':>9} {'req/s':>8}"
+        )
+        for name, result in results.items():
+            line = (
+                f"{name:<14} {result['requests']:>9,} {result['errors']:>7,} {result['p50_ms']:>9.2f} "
+                f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['max_ms']:>9.2f} "
+                f"{result['throughput_rps']:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
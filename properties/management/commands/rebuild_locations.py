@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from properties.cache import bump_catalogue_version
+from properties.locations import rebuild_locations
+
+
+class Command(BaseCommand):
+    help = 'Re-resolve region/town references for every property and recompute location counts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk update (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        updated = rebuild_locations(batch_size=options['batch_size'])
+        bump_catalogue_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Location dimension rebuilt ({updated} properties re-linked)')
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from properties.market_stats import refresh_market_stats
+
+
+class Command(BaseCommand):
+    help = 'Refresh market statistics summary tables from queued property changes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every summary group instead of only the changed ones'
+        )
+    
+    def handle(self, *args, **options):
+        refreshed = refresh_market_stats(full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Refreshed {refreshed} market summary groups')
+        )
@@ -0,0 +1,188 @@
+"""
+Market statistics summary tables
+Property writes queue the (region, category, platform) group they touch in
+MarketSummaryChange. ``refresh_market_stats`` then recomputes only the summary
+rows those groups roll up into, so /api/properties/stats/ is a single indexed
+lookup instead of a scan of the properties table.
+"""
+
+from itertools import product
+import numpy as np
+from django.db import transaction
+from .models import Property, MarketSummary, MarketSummaryChange
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+PRICE_HISTOGRAM_EDGES = [
+    0, 100_000, 200_000, 300_000, 500_000, 750_000,
+    1_000_000, 1_500_000, 2_000_000, 3_000_000, 5_000_000, 10_000_000
+]
+PRICE_PER_M2_HISTOGRAM_EDGES = [0, 1000, 2000, 3000, 4000, 5000, 6000, 8000, 10_000, 15_000, 20_000]
+
+
+def market_stats_key(region_id, category, platform):
+    """Finest-grain group a property belongs to"""
+    return (region_id, category or None, platform or None)
+
+
+def mark_market_stats_dirty(keys):
+    """Queue groups for the next refresh (duplicates are ignored)"""
+    MarketSummaryChange.objects.bulk_create(
+        [MarketSummaryChange(region_key=region_id, category=category, platform=platform)
+         for region_id, category, platform in keys],
+        ignore_conflicts=True
+    )
+
+
+def summary_groups_for_key(key):
+    """Every summary group (region, category, platform) a finest-grain key rolls up into"""
+    region_id, category, platform = key
+    regions = [None] + ([region_id] if region_id else [])
+    categories = [''] + ([category] if category else [])
+    platforms = [''] + ([platform] if platform else [])
+    return set(product(regions, categories, platforms))
+
+
+def _stats(values):
+    if not len(values):
+        return {}
+    stats = {
+        'min': round(float(values.min()), 2),
+        'max': round(float(values.max()), 2),
+        'mean': round(float(values.mean()), 2),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats['median' if percentile == 50 else f'p{percentile}'] = round(float(value), 2)
+    return stats
+
+
+def _histogram(values, edges):
+    counts, _ = np.histogram(values, bins=edges + [np.inf])
+    return [
+        {'min': low, 'max': high, 'count': int(count)}
+        for low, high, count in zip(edges, edges[1:] + [None], counts)
+    ]
+
+
+def _summary(prices, square_meters):
+    """Summary row values for the listings of one group"""
+    per_m2 = prices[square_meters > 0] / square_meters[square_meters > 0]
+    return {
+        'listing_count': len(prices),
+        'price_stats': _stats(prices),
+        'price_per_m2_stats': _stats(per_m2),
+        'price_histogram': _histogram(prices, PRICE_HISTOGRAM_EDGES),
+        'price_per_m2_histogram': _histogram(per_m2, PRICE_PER_M2_HISTOGRAM_EDGES),
+    }
+
+
+def _group_summary(group):
+    """Summary of one group, reading only the prices and areas of its listings"""
+    region_id, category, platform = group
+    properties = Property.objects.order_by()
+    if region_id:
+        properties = properties.filter(region_ref_id=region_id)
+    if category:
+        properties = properties.filter(category=category)
+    if platform:
+        properties = properties.filter(platform=platform)
+    values = np.array(list(properties.values_list('price', 'square_meters')), dtype=np.float64).reshape(-1, 2)
+    return _summary(values[:, 0], values[:, 1])
+
+
+class _Catalogue:
+    """Columns needed for the summaries, loaded in one scan, with text columns factorized"""
+
+    def __init__(self):
+        rows = list(
+            Property.objects.order_by()
+            .values_list('region_ref_id', 'category', 'platform', 'price', 'square_meters')
+            .iterator(chunk_size=5000)
+        )
+        # Integer codes per column; code 0 is "none" (no region, empty category/platform)
+        self.regions, self.region = np.unique(np.array([row[0] or 0 for row in rows], dtype=np.int64), return_inverse=True)
+        self.categories, self.category = np.unique(np.array([row[1] or '' for row in rows], dtype=object), return_inverse=True)
+        self.platforms, self.platform = np.unique(np.array([row[2] or '' for row in rows], dtype=object), return_inverse=True)
+        self.price = np.array([row[3] for row in rows], dtype=np.float64)
+        self.square_meters = np.array([row[4] for row in rows], dtype=np.float64)
+
+    def _code(self, values, codes):
+        """Codes shifted so that 0 means "none" whether or not the data has empty values"""
+        return codes + (0 if len(values) and not values[0] else 1)
+
+    def summaries(self):
+        """
+        Yield ``(group, summary)`` for every group present in the data. Each
+        roll-up level (which of region, category and platform it groups by) is
+        one sort of the combined codes followed by a pass over the runs.
+        """
+        if not len(self.price):
+            return
+        columns = [
+            (self.regions, self._code(self.regions, self.region)),
+            (self.categories, self._code(self.categories, self.category)),
+            (self.platforms, self._code(self.platforms, self.platform)),
+        ]
+        sizes = [len(values) + 1 for values, _ in columns]
+        for level in product((False, True), repeat=3):
+            key = np.zeros(len(self.price), dtype=np.int64)
+            selected = np.ones(len(self.price), dtype=bool)
+            for used, (_, codes), size in zip(level, columns, sizes):
+                key *= size
+                if used:
+                    # Listings without a value only count towards the groups that ignore the column
+                    key += codes
+                    selected &= codes > 0
+            rows = np.flatnonzero(selected)
+            rows = rows[np.argsort(key[rows], kind='stable')]
+            starts = np.flatnonzero(np.r_[True, np.diff(key[rows]) != 0])
+            for start, end in zip(starts, np.r_[starts[1:], len(rows)]):
+                members = rows[start:end]
+                first = members[0]
+                group = (
+                    (int(self.regions[self.region[first]]) or None) if level[0] else None,
+                    self.categories[self.category[first]] if level[1] else '',
+                    self.platforms[self.platform[first]] if level[2] else '',
+                )
+                yield group, _summary(self.price[members], self.square_meters[members])
+
+
+def refresh_market_stats(full=False):
+    """
+    Recompute the summary rows affected by queued changes (or all rows with
+    ``full=True``). Returns the number of summary groups written.
+
+    A full refresh loads the catalogue once; an incremental one reads only the
+    listings of the affected groups.
+    """
+    changes = list(MarketSummaryChange.objects.values_list('id', 'region_key', 'category', 'platform'))
+    if not changes and not full:
+        return 0
+
+    with transaction.atomic():
+        if full:
+            summaries = [
+                MarketSummary(region_id=region_id, category=category, platform=platform, **values)
+                for (region_id, category, platform), values in _Catalogue().summaries()
+            ]
+            MarketSummary.objects.all().delete()
+            MarketSummary.objects.bulk_create(summaries)
+            written = len(summaries)
+        else:
+            groups = set()
+            for _, region_id, category, platform in changes:
+                groups |= summary_groups_for_key((region_id, category, platform))
+            for region_id, category, platform in groups:
+                values = _group_summary((region_id, category, platform))
+                lookup = {'region_id': region_id, 'category': category, 'platform': platform}
+                if values['listing_count']:
+                    MarketSummary.objects.update_or_create(defaults=values, **lookup)
+                else:
+                    MarketSummary.objects.filter(**lookup).delete()
+            written = len(groups)
+
+        # Only clear the changes we processed; writes queued meanwhile stay pending
+        MarketSummaryChange.objects.filter(pk__in=[change[0] for change in changes]).delete()
+
+    return written
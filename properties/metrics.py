@@ -0,0 +1,217 @@
+"""
+Per-view request metrics
+Latency histograms, SQL query counts, database time, bytes out and response
+cache hits are aggregated per (method, route). Each worker buffers its
+increments in memory and flushes them to the Django cache at most once per
+FLUSH_INTERVAL seconds, so with a shared cache (Redis) the metrics endpoint
+reports totals across all workers.
+"""
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from django.core.cache import cache
+
+
+METRICS_PREFIX = 'properties:metrics'
+# Series are registered in numbered slots; the counter holds the highest slot in use
+SERIES_COUNT_KEY = f'{METRICS_PREFIX}:series_count'
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTERS = (
+    'requests', 'server_errors', 'duration_us', 'queries', 'db_time_us',
+    'bytes_out', 'cache_hits', 'cache_misses', 'over_query_budget',
+) + tuple(f'bucket_{index}' for index in range(len(LATENCY_BUCKETS) + 1))
+
+# Seconds between flushes of a worker's buffered increments
+FLUSH_INTERVAL = 1.0
+
+# X-Cache values that count as served from the response cache
+CACHE_HIT_STATUSES = ('HIT', 'STALE', 'COALESCED')
+
+
+def _series_id(method, route):
+    return hashlib.sha1(f'{method} {route}'.encode()).hexdigest()[:16]
+
+
+def _counter_key(series_id, counter):
+    return f'{METRICS_PREFIX}:{series_id}:{counter}'
+
+
+def _slot_key(slot):
+    return f'{METRICS_PREFIX}:series:{slot}'
+
+
+def _claim_key(series_id):
+    return f'{METRICS_PREFIX}:registered:{series_id}'
+
+
+def _incr(key, value):
+    try:
+        return cache.incr(key, value)
+    except ValueError:
+        if cache.add(key, value, timeout=None):
+            return value
+        return cache.incr(key, value)
+
+
+def _register_series(series_id, labels):
+    """
+    Add a series to the shared registry, once across all workers. Every step
+    is an atomic cache operation (add/incr), so concurrent workers never
+    overwrite each other's series.
+    """
+    if not cache.add(_claim_key(series_id), 1, timeout=None):
+        return  # Registered by this or another worker
+    try:
+        slot = _incr(SERIES_COUNT_KEY, 1)
+        cache.set(_slot_key(slot), (series_id, labels), timeout=None)
+    except Exception:
+        cache.delete(_claim_key(series_id))
+        raise
+
+
+def _series_registry():
+    """``{series_id: (method, route)}`` of every registered series"""
+    count = cache.get(SERIES_COUNT_KEY) or 0
+    slots = cache.get_many([_slot_key(slot) for slot in range(1, count + 1)])
+    return dict(slots.values())
+
+
+def _bucket_index(duration):
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if duration <= bound:
+            return index
+    return len(LATENCY_BUCKETS)
+
+
+class MetricsCollector:
+    """Buffers metric increments per worker and flushes them to the cache"""
+
+    def __init__(self):
+        self._pending = defaultdict(int)
+        self._series = {}
+        self._registered = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _add(self, method, route, values):
+        series_id = _series_id(method, route)
+        with self._lock:
+            self._series[series_id] = (method, route)
+            for counter, value in values.items():
+                if value:
+                    self._pending[(series_id, counter)] += value
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def record_request(self, method, route, duration, queries, db_time, bytes_out, cache_status, status_code, over_budget):
+        self._add(method, route, {
+            'requests': 1,
+            'server_errors': int(status_code >= 500),
+            'duration_us': int(duration * 1_000_000),
+            f'bucket_{_bucket_index(duration)}': 1,
+            'queries': queries,
+            'db_time_us': int(db_time * 1_000_000),
+            'bytes_out': bytes_out,
+            'cache_hits': int(cache_status in CACHE_HIT_STATUSES),
+            'cache_misses': int(cache_status == 'MISS'),
+            'over_query_budget': int(over_budget),
+        })
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            new_series = {key: value for key, value in self._series.items() if key not in self._registered}
+            self._last_flush = time.monotonic()
+
+        for series_id, labels in new_series.items():
+            _register_series(series_id, labels)
+            # Only marked once written, so a failed registration is retried on the next flush
+            with self._lock:
+                self._registered.add(series_id)
+
+        for (series_id, counter), value in pending.items():
+            _incr(_counter_key(series_id, counter), value)
+
+    def snapshot(self):
+        """``{(method, route): {counter: value}}`` across all workers"""
+        self.flush()
+        registry = _series_registry()
+        keys = {
+            _counter_key(series_id, counter): (series_id, counter)
+            for series_id in registry for counter in COUNTERS
+        }
+        values = cache.get_many(keys)
+        result = {labels: dict.fromkeys(COUNTERS, 0) for labels in registry.values()}
+        for key, value in values.items():
+            series_id, counter = keys[key]
+            result[registry[series_id]][counter] = value
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._registered.clear()
+        count = cache.get(SERIES_COUNT_KEY) or 0
+        registry = _series_registry()
+        cache.delete_many(
+            [_counter_key(series_id, counter) for series_id in registry for counter in COUNTERS]
+            + [_claim_key(series_id) for series_id in registry]
+            + [_slot_key(slot) for slot in range(1, count + 1)]
+            + [SERIES_COUNT_KEY]
+        )
+
+
+collector = MetricsCollector()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(method, route, **extra):
+    labels = {'method': method, 'route': route, **extra}
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def render_prometheus(snapshot):
+    """Render a collector snapshot in the Prometheus text exposition format"""
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    series = sorted(snapshot.items(), key=lambda item: (item[0][1], item[0][0]))
+
+    family('http_request_duration_seconds', 'histogram', 'Request latency per route')
+    for (method, route), values in series:
+        cumulative = 0
+        for index, bound in enumerate(LATENCY_BUCKETS + (float('inf'),)):
+            cumulative += values[f'bucket_{index}']
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'http_request_duration_seconds_bucket{_labels(method, route, le=le)} {cumulative}')
+        lines.append(f'http_request_duration_seconds_sum{_labels(method, route)} {values["duration_us"] / 1_000_000}')
+        lines.append(f'http_request_duration_seconds_count{_labels(method, route)} {values["requests"]}')
+
+    simple = (
+        ('http_server_errors_total', 'counter', 'Responses with a 5xx status', 'server_errors', 1),
+        ('db_queries_total', 'counter', 'SQL queries executed', 'queries', 1),
+        ('db_query_duration_seconds_total', 'counter', 'Time spent executing SQL', 'db_time_us', 1_000_000),
+        ('http_response_bytes_total', 'counter', 'Response body bytes sent', 'bytes_out', 1),
+        ('response_cache_hits_total', 'counter', 'Responses served from the response cache', 'cache_hits', 1),
+        ('response_cache_misses_total', 'counter', 'Responses computed after a response cache miss', 'cache_misses', 1),
+        ('db_query_budget_exceeded_total', 'counter', 'Requests that ran more SQL queries than the budget', 'over_query_budget', 1),
+    )
+    for name, kind, help_text, counter, scale in simple:
+        family(name, kind, help_text)
+        for (method, route), values in series:
+            value = values[counter] / scale if scale != 1 else values[counter]
+            lines.append(f'{name}{_labels(method, route)} {value}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,74 @@
+import logging
+import time
+from django.conf import settings
+from .metrics import collector
+from .slow_queries import QueryRecorder, capture_queries, record_slow_queries, should_capture
+
+logger = logging.getLogger(__name__)
+
+
+class QueryMetricsMiddleware:
+    """
+    Record latency, SQL query count, database time, bytes out and response
+    cache status per route (see properties.metrics), and log requests that
+    run more queries than REQUEST_QUERY_BUDGET together with their SQL.
+    Statements over SLOW_QUERY_THRESHOLD_MS are kept in the SlowQuery table.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        start = time.perf_counter()
+        with capture_queries(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else '<unmatched>'
+
+        if response.streaming:
+            if not getattr(response, 'is_async', False):
+                # Streamed exports run their queries while the body is sent; keep recording
+                # until it is consumed and record the request then
+                response.streaming_content = self._stream(response.streaming_content, request, route, recorder, duration, response)
+                return response
+            bytes_out = 0
+        else:
+            bytes_out = len(response.content)
+        self._record(request, route, recorder, duration, bytes_out, response)
+        return response
+
+    def _stream(self, content, request, route, recorder, duration, response):
+        sent = 0
+        try:
+            with capture_queries(recorder):
+                for chunk in content:
+                    sent += len(chunk)
+                    yield chunk
+        finally:
+            self._record(request, route, recorder, duration, sent, response)
+
+    def _record(self, request, route, recorder, duration, bytes_out, response):
+        method = request.method
+        budget = settings.REQUEST_QUERY_BUDGET
+        over_budget = bool(budget) and recorder.count > budget
+        if over_budget:
+            logger.warning(
+                '%s %s ran %d SQL queries (budget %d, %.1f ms in the database):\n%s',
+                method, request.get_full_path(), recorder.count, budget, recorder.db_time * 1000,
+                '\n'.join(f'[{seconds * 1000:.2f} ms] {sql}' for sql, _, seconds, *_ in recorder.queries)
+            )
+
+        if should_capture(route):
+            record_slow_queries(route, recorder.queries)
+
+        collector.record_request(
+            method, route, duration, recorder.count, recorder.db_time,
+            bytes_out, response.get('X-Cache'), response.status_code, over_budget
+        )
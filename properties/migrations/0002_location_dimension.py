@@ -0,0 +1,121 @@
+# Generated by Django 5.0.2 on 2026-10-19 08:56
+
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def _clean(value):
+    return ' '.join(str(value).split()) if value is not None else ''
+
+
+def _normalize(value):
+    # Same folding as properties.locations.normalize_location_name, copied so the
+    # migration does not import modules that load the current models
+    value = unicodedata.normalize('NFKD', _clean(value))
+    return ''.join(char for char in value if not unicodedata.combining(char)).casefold()
+
+
+def backfill_locations(apps, schema_editor):
+    """Populate the region/town dimension from existing property rows"""
+    Property = apps.get_model('properties', 'Property')
+    Region = apps.get_model('properties', 'Region')
+    Town = apps.get_model('properties', 'Town')
+
+    regions = {}
+    towns = {}
+    pending = []
+    for property_id, region_name, town_name in Property.objects.values_list('id', 'region', 'town').iterator(chunk_size=1000):
+        region_key = _normalize(region_name)
+        if not region_key:
+            continue
+        if region_key not in regions:
+            regions[region_key], _ = Region.objects.get_or_create(
+                normalized_name=region_key,
+                defaults={'name': _clean(region_name)}
+            )
+        region = regions[region_key]
+
+        town = None
+        town_key = _normalize(town_name)
+        if town_key:
+            if (region_key, town_key) not in towns:
+                towns[(region_key, town_key)], _ = Town.objects.get_or_create(
+                    region=region,
+                    normalized_name=town_key,
+                    defaults={'name': _clean(town_name)}
+                )
+            town = towns[(region_key, town_key)]
+
+        pending.append(Property(pk=property_id, region_ref=region, town_ref=town))
+        if len(pending) >= 1000:
+            Property.objects.bulk_update(pending, ['region_ref', 'town_ref'])
+            pending = []
+    Property.objects.bulk_update(pending, ['region_ref', 'town_ref'])
+
+    for row in Property.objects.exclude(region_ref=None).order_by().values('region_ref').annotate(total=Count('id')):
+        Region.objects.filter(pk=row['region_ref']).update(property_count=row['total'])
+    for row in Property.objects.exclude(town_ref=None).order_by().values('town_ref').annotate(total=Count('id')):
+        Town.objects.filter(pk=row['town_ref']).update(property_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Region',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField()),
+                ('normalized_name', models.TextField(unique=True)),
+                ('property_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Region',
+                'verbose_name_plural': 'Regions',
+                'db_table': 'regions',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='region_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='properties', to='properties.region'),
+        ),
+        migrations.CreateModel(
+            name='Town',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField()),
+                ('normalized_name', models.TextField()),
+                ('property_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='towns', to='properties.region')),
+            ],
+            options={
+                'verbose_name': 'Town',
+                'verbose_name_plural': 'Towns',
+                'db_table': 'towns',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='town_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='properties', to='properties.town'),
+        ),
+        migrations.AddConstraint(
+            model_name='town',
+            constraint=models.UniqueConstraint(fields=('region', 'normalized_name'), name='unique_town_per_region'),
+        ),
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
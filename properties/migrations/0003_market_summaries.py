@@ -0,0 +1,55 @@
+# Generated by Django 5.0.2 on 2026-10-19 08:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0002_location_dimension'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketSummaryChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region_key', models.BigIntegerField(blank=True, null=True)),
+                ('category', models.TextField(blank=True, null=True)),
+                ('platform', models.TextField(blank=True, null=True)),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'market_summary_changes',
+            },
+        ),
+        migrations.CreateModel(
+            name='MarketSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.TextField(blank=True, default='')),
+                ('platform', models.TextField(blank=True, default='')),
+                ('listing_count', models.IntegerField(default=0)),
+                ('price_stats', models.JSONField(default=dict)),
+                ('price_per_m2_stats', models.JSONField(default=dict)),
+                ('price_histogram', models.JSONField(default=list)),
+                ('price_per_m2_histogram', models.JSONField(default=list)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('region', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='market_summaries', to='properties.region')),
+            ],
+            options={
+                'verbose_name': 'Market Summary',
+                'verbose_name_plural': 'Market Summaries',
+                'db_table': 'market_summaries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='marketsummarychange',
+            constraint=models.UniqueConstraint(fields=('region_key', 'category', 'platform'), name='unique_market_summary_change', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='marketsummary',
+            constraint=models.UniqueConstraint(fields=('region', 'category', 'platform'), name='unique_market_summary_group', nulls_distinct=False),
+        ),
+    ]
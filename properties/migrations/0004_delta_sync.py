@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0003_market_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('property_id', models.BigIntegerField()),
+                ('reference', models.TextField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'property_tombstones',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['updated_at', 'id'], name='properties_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertytombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstones_deleted_id_idx'),
+        ),
+    ]
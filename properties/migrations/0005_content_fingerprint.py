@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:04
+
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint the content of existing property rows"""
+    from properties.fingerprints import CONTENT_FIELDS, content_fingerprint
+
+    Property = apps.get_model('properties', 'Property')
+    names = [field.attname for field in CONTENT_FIELDS]
+    pending = []
+    for row in Property.objects.values('id', *names).iterator(chunk_size=1000):
+        pending.append(Property(pk=row.pop('id'), content_fingerprint=content_fingerprint(row)))
+    Property.objects.bulk_update(pending, ['content_fingerprint'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0004_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='content_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_content_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('params_shape', models.JSONField(default=list)),
+                ('route', models.CharField(max_length=255)),
+                ('occurrences', models.IntegerField(default=0)),
+                ('total_duration_ms', models.FloatField(default=0)),
+                ('max_duration_ms', models.FloatField(default=0)),
+                ('last_duration_ms', models.FloatField(default=0)),
+                ('explain_plan', models.JSONField(blank=True, null=True)),
+                ('explained_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'db_table': 'slow_queries',
+                'ordering': ['-total_duration_ms'],
+            },
+        ),
+    ]
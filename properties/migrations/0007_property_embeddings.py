@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0006_slow_queries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyEmbedding',
+            fields=[
+                ('property', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='properties.property')),
+                ('model', models.CharField(max_length=100)),
+                ('text_hash', models.CharField(max_length=40)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'property_embeddings',
+                'indexes': [models.Index(fields=['model', 'updated_at'], name='embeddings_model_updated_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_property_embeddings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyembedding',
+            name='checked_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
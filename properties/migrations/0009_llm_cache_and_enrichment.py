@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_embedding_checked_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=100)),
+                ('prompt_hash', models.CharField(max_length=64)),
+                ('response', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'llm_responses',
+            },
+        ),
+        migrations.CreateModel(
+            name='PropertyEnrichment',
+            fields=[
+                ('property', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='enrichment', serialize=False, to='properties.property')),
+                ('model', models.CharField(max_length=100)),
+                ('analysis', models.TextField(blank=True, default='')),
+                ('summary', models.TextField(blank=True, default='')),
+                ('suggested_features', models.JSONField(blank=True, default=list)),
+                ('enriched_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'property_enrichments',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='llmresponse',
+            constraint=models.UniqueConstraint(fields=('method', 'model', 'prompt_hash'), name='unique_llm_response'),
+        ),
+    ]
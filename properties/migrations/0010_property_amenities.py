@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_amenities(apps, schema_editor):
+    """Extract the amenities of existing property rows, one chunk at a time"""
+    from properties.amenity_matcher import SOURCE_FIELDS, extract_amenities
+
+    Property = apps.get_model('properties', 'Property')
+    PropertyAmenity = apps.get_model('properties', 'PropertyAmenity')
+    rows = Property.objects.order_by('id').values_list('id', *SOURCE_FIELDS)
+    last_id = 0
+    while chunk := list(rows.filter(id__gt=last_id)[:1000]):
+        last_id = chunk[-1][0]
+        PropertyAmenity.objects.bulk_create(
+            [PropertyAmenity(property_id=row[0], tag=tag) for row in chunk for tag in extract_amenities(*row[1:])]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_llm_cache_and_enrichment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyAmenity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=40)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='amenities', to='properties.property')),
+            ],
+            options={
+                'db_table': 'property_amenities',
+                'indexes': [models.Index(fields=['tag', 'property'], name='amenities_tag_property_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='propertyamenity',
+            constraint=models.UniqueConstraint(fields=('property', 'tag'), name='unique_property_amenity'),
+        ),
+        migrations.RunPython(backfill_amenities, migrations.RunPython.noop),
+    ]
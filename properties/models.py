@@ -1,4 +1,49 @@
 from django.db import models
+from django.utils import timezone
+
+
+class Region(models.Model):
+    """Canonical region, maintained incrementally as properties are ingested"""
+    
+    name = models.TextField(null=False)  # Display name (first spelling seen)
+    normalized_name = models.TextField(unique=True, null=False)  # Case/accent/whitespace-folded key
+    property_count = models.IntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'regions'
+        verbose_name = 'Region'
+        verbose_name_plural = 'Regions'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class Town(models.Model):
+    """Canonical town within a region"""
+    
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='towns')
+    name = models.TextField(null=False)
+    normalized_name = models.TextField(null=False)
+    property_count = models.IntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'towns'
+        verbose_name = 'Town'
+        verbose_name_plural = 'Towns'
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['region', 'normalized_name'], name='unique_town_per_region'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.region.name})"
 
 
 class Property(models.Model):
@@ -30,6 +75,10 @@ class Property(models.Model):
     address_state = models.CharField(max_length=255, null=True, blank=True)
     address_country = models.CharField(max_length=255, null=True, blank=True)
     
+    # Normalized location dimension, resolved from region/town on save
+    region_ref = models.ForeignKey(Region, on_delete=models.SET_NULL, null=True, blank=True, related_name='properties')
+    town_ref = models.ForeignKey(Town, on_delete=models.SET_NULL, null=True, blank=True, related_name='properties')
+    
     # Features
     bedrooms = models.IntegerField(null=True, blank=True)
     bathrooms = models.IntegerField(null=True, blank=True)
@@ -54,6 +103,9 @@ class Property(models.Model):
     on_off = models.BooleanField(null=True, blank=True)
     entity_id = models.CharField(max_length=255, null=True, blank=True)
     
+    # Hash of the scraped content fields, maintained on save (see properties.fingerprints)
+    content_fingerprint = models.CharField(max_length=40, blank=True, default='', editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -63,9 +115,193 @@ class Property(models.Model):
         verbose_name = 'Property'
         verbose_name_plural = 'Properties'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset order of the delta sync feed
+            models.Index(fields=['updated_at', 'id'], name='properties_updated_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.reference} - {self.title} ({self.region})"
     
     def get_absolute_url(self):
         return f"/api/properties/{self.id}/"
+
+
+class MarketSummary(models.Model):
+    """Precomputed market statistics for one region/category/platform group
+    
+    A null region or an empty category/platform means "all", so every
+    combination of filters maps to exactly one row.
+    """
+    
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, null=True, blank=True, related_name='market_summaries')
+    category = models.TextField(blank=True, default='')
+    platform = models.TextField(blank=True, default='')
+    
+    listing_count = models.IntegerField(default=0)
+    price_stats = models.JSONField(default=dict)  # min, max, mean and percentiles
+    price_per_m2_stats = models.JSONField(default=dict)
+    price_histogram = models.JSONField(default=list)  # [{'min', 'max', 'count'}, ...]
+    price_per_m2_histogram = models.JSONField(default=list)
+    
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'market_summaries'
+        verbose_name = 'Market Summary'
+        verbose_name_plural = 'Market Summaries'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['region', 'category', 'platform'],
+                name='unique_market_summary_group',
+                nulls_distinct=False
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.region or 'All regions'} / {self.category or 'all categories'} / {self.platform or 'all platforms'}"
+
+
+class MarketSummaryChange(models.Model):
+    """Finest-grain group whose summaries are stale, queued by property writes"""
+    
+    region_key = models.BigIntegerField(null=True, blank=True)  # Property.region_ref_id
+    category = models.TextField(null=True, blank=True)
+    platform = models.TextField(null=True, blank=True)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'market_summary_changes'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['region_key', 'category', 'platform'],
+                name='unique_market_summary_change',
+                nulls_distinct=False
+            ),
+        ]
+
+
+class PropertyTombstone(models.Model):
+    """Deleted property, kept so delta-sync clients can drop their copy"""
+    
+    property_id = models.BigIntegerField(null=False)
+    reference = models.TextField(null=False)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'property_tombstones'
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstones_deleted_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.reference} (deleted {self.deleted_at})"
+
+
+class SlowQuery(models.Model):
+    """SQL statement that exceeded the slow-query threshold, aggregated by normalized text
+    
+    Parameter values are never stored, only their types (see properties.slow_queries).
+    """
+    
+    fingerprint = models.CharField(max_length=40, unique=True)  # SHA-1 of normalized_sql
+    normalized_sql = models.TextField()
+    params_shape = models.JSONField(default=list)  # e.g. ["float", "str x3", "int"]
+    route = models.CharField(max_length=255)  # URL route of the last request that ran it
+    
+    occurrences = models.IntegerField(default=0)
+    total_duration_ms = models.FloatField(default=0)
+    max_duration_ms = models.FloatField(default=0)
+    last_duration_ms = models.FloatField(default=0)
+    
+    explain_plan = models.JSONField(null=True, blank=True)
+    explained_at = models.DateTimeField(null=True, blank=True)
+    
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'slow_queries'
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+        ordering = ['-total_duration_ms']
+    
+    def __str__(self):
+        return self.normalized_sql[:100]
+
+
+class PropertyEmbedding(models.Model):
+    """Embedding vector of a property's text (see utils.embeddings and utils.vector_index)"""
+    
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model = models.CharField(max_length=100)  # Embedding backend name; vectors of other models are ignored
+    text_hash = models.CharField(max_length=40)  # SHA-1 of the embedded text
+    vector = models.BinaryField()  # Unit-length float32 values
+    updated_at = models.DateTimeField(auto_now=True)  # When the vector was written
+    checked_at = models.DateTimeField(default=timezone.now)  # When the text was last compared with text_hash
+    
+    class Meta:
+        db_table = 'property_embeddings'
+        indexes = [
+            # Rows written since the vector index was built
+            models.Index(fields=['model', 'updated_at'], name='embeddings_model_updated_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Embedding of property {self.property_id} ({self.model})"
+
+
+class LLMResponse(models.Model):
+    """Cached language model answer (see utils.openai_service)"""
+    
+    method = models.CharField(max_length=50)  # OpenAIService method that asked
+    model = models.CharField(max_length=100)
+    prompt_hash = models.CharField(max_length=64)  # SHA-256 of the messages and sampling parameters
+    response = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'llm_responses'
+        constraints = [
+            models.UniqueConstraint(fields=['method', 'model', 'prompt_hash'], name='unique_llm_response'),
+        ]
+    
+    def __str__(self):
+        return f"{self.method} ({self.model}) {self.prompt_hash[:12]}"
+
+
+class PropertyEnrichment(models.Model):
+    """Language model output stored for a property by the enrich_properties command"""
+    
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, primary_key=True, related_name='enrichment')
+    model = models.CharField(max_length=100)
+    analysis = models.TextField(blank=True, default='')
+    summary = models.TextField(blank=True, default='')
+    suggested_features = models.JSONField(default=list, blank=True)
+    enriched_at = models.DateTimeField()  # When the property was read; later updates make it a candidate again
+    
+    class Meta:
+        db_table = 'property_enrichments'
+    
+    def __str__(self):
+        return f"Enrichment of property {self.property_id} ({self.model})"
+
+
+class PropertyAmenity(models.Model):
+    """Amenity tag extracted from a property's text (see properties.amenities)"""
+    
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='amenities')
+    tag = models.CharField(max_length=40)
+    
+    class Meta:
+        db_table = 'property_amenities'
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'tag'], name='unique_property_amenity'),
+        ]
+        indexes = [
+            # Inverted index: properties by amenity, for the features filter
+            models.Index(fields=['tag', 'property'], name='amenities_tag_property_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.tag} (property {self.property_id})"
@@ -0,0 +1,63 @@
+"""
+Field projections for Property responses
+Lets clients request only the columns they render, so both the serializer
+and the SQL SELECT skip the large text/JSON columns
+"""
+
+from rest_framework.exceptions import ValidationError
+from .models import Property
+
+
+# Query parameter used to pick a projection
+PROJECTION_QUERY_PARAM = 'fields'
+
+# Columns maintained on write for internal use (location dimension keys, change
+# detection); they are not part of the public property payload
+INTERNAL_FIELDS = ('region_ref', 'town_ref', 'content_fingerprint')
+
+# All serializable Property columns, in model order
+ALL_FIELDS = [field.name for field in Property._meta.concrete_fields if field.name not in INTERNAL_FIELDS]
+
+# Named projection profiles (None means every field)
+PROJECTIONS = {
+    'card': [
+        'id', 'reference', 'title', 'category', 'price', 'square_meters',
+        'region', 'town', 'bedrooms', 'bathrooms', 'main_image',
+        'platform', 'energy_rating', 'created_at'
+    ],
+    'full': None,
+}
+
+
+def resolve_projection(query_params):
+    """
+    Resolve ``?fields=`` into a list of field names, or None for all fields.
+
+    Accepts either a profile name (``?fields=card``) or a comma-separated
+    list of field names (``?fields=id,title,price``). ``id`` is always kept.
+    """
+    value = (query_params.get(PROJECTION_QUERY_PARAM) or '').strip()
+    if not value:
+        return None
+
+    if value in PROJECTIONS:
+        return PROJECTIONS[value]
+
+    requested = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in requested if name not in ALL_FIELDS]
+    if unknown:
+        raise ValidationError({
+            PROJECTION_QUERY_PARAM: f"Unknown fields: {', '.join(unknown)}. "
+                                    f"Use a profile ({', '.join(PROJECTIONS)}) or any of: {', '.join(ALL_FIELDS)}"
+        })
+
+    fields = ['id'] + [name for name in requested if name != 'id']
+    # Preserve model order so responses stay stable regardless of query order
+    return [name for name in ALL_FIELDS if name in fields]
+
+
+def apply_projection(queryset, fields):
+    """Restrict the SELECT to the projected columns"""
+    if fields is None:
+        return queryset
+    return queryset.only(*fields)
@@ -0,0 +1,32 @@
+"""
+orjson-backed renderer for property endpoints
+Produces the same bytes as DRF's JSONRenderer for compact output, but several
+times faster on large result pages
+"""
+
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for ``JSONRenderer`` using orjson"""
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        # orjson only supports two-space indentation and compact separators;
+        # anything else (e.g. the browsable API) goes through the stock renderer
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+
+        # Same JavaScript-safe escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -44,7 +44,7 @@ PROPERTY_CREATE_SCHEMA = {
 # Property List Schema
 PROPERTY_LIST_SCHEMA = {
     'summary': "List Properties",
-    'description': "List properties with filtering, search, and pagination",
+    'description': "List properties with filtering, search, and pagination. Responses carry ETag and Last-Modified; send If-None-Match or If-Modified-Since to get 304 Not Modified when nothing changed",
     'tags': ["Properties"],
     'parameters': [
         {'name': 'search', 'in': 'query', 'description': 'Search in title, description, region, town', 'schema': {'type': 'string'}},
@@ -52,7 +52,11 @@ PROPERTY_LIST_SCHEMA = {
         {'name': 'price_max', 'in': 'query', 'description': 'Maximum price', 'schema': {'type': 'number'}},
         {'name': 'bedrooms', 'in': 'query', 'description': 'Minimum bedrooms', 'schema': {'type': 'integer'}},
         {'name': 'region', 'in': 'query', 'description': 'Filter by region', 'schema': {'type': 'string'}},
-        {'name': 'ordering', 'in': 'query', 'description': 'Sort by field (e.g., price, -price)', 'schema': {'type': 'string'}}
+        {'name': 'region_id', 'in': 'query', 'description': 'Filter by region ids (comma-separated)', 'schema': {'type': 'string'}},
+        {'name': 'town_id', 'in': 'query', 'description': 'Filter by town ids (comma-separated)', 'schema': {'type': 'string'}},
+        {'name': 'features', 'in': 'query', 'description': 'Amenity tags the property must all have (comma-separated, e.g. pool,sea_view)', 'schema': {'type': 'string'}},
+        {'name': 'ordering', 'in': 'query', 'description': 'Sort by field (e.g., price, -price)', 'schema': {'type': 'string'}},
+        {'name': 'fields', 'in': 'query', 'description': 'Projection profile (card, full) or comma-separated field names', 'schema': {'type': 'string'}}
     ]
 }
 
@@ -60,7 +64,10 @@ PROPERTY_LIST_SCHEMA = {
 PROPERTY_DETAIL_SCHEMA = {
     'summary': "Get Property Details",
     'description': "Retrieve detailed information about a specific property by ID",
-    'tags': ["Properties"]
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'fields', 'in': 'query', 'description': 'Projection profile (card, full) or comma-separated field names', 'schema': {'type': 'string'}}
+    ]
 }
 
 # Property Update Schema
@@ -84,13 +91,153 @@ PROPERTY_BY_REFERENCE_SCHEMA = {
     'tags': ["Properties"]
 }
 
+# Property Lookup Schema
+PROPERTY_LOOKUP_SCHEMA = {
+    'summary': "Batch Lookup Properties",
+    'description': "Fetch up to 5000 properties by reference or id in one request. Results keep the request order; keys that do not exist are listed in missing. With exists_only, returns a map of reference (or id) to id, reference and content fingerprint instead of full rows",
+    'tags': ["Properties"],
+    'request': {
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'references': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Reference numbers to fetch', 'example': ['REF123', 'REF456']},
+                'ids': {'type': 'array', 'items': {'type': 'integer'}, 'description': 'Property ids to fetch (instead of references)', 'example': [1, 2]},
+                'fields': {'oneOf': [{'type': 'string'}, {'type': 'array', 'items': {'type': 'string'}}], 'description': 'Projection profile (card, full), comma-separated field names or a list of field names', 'example': 'card'},
+                'exists_only': {'type': 'boolean', 'description': 'Return only id and fingerprint per key', 'example': False}
+            }
+        }
+    },
+    'responses': {
+        200: {'description': 'Found properties and missing keys'},
+        400: {'description': 'Invalid request body'}
+    }
+}
+
+# Property Upsert by Reference Schema
+PROPERTY_UPSERT_BY_REFERENCE_SCHEMA = {
+    'summary': "Create or Replace Property by Reference",
+    'description': "Idempotent upsert: creates the property or replaces its content atomically in one request. Omitted optional fields are reset to their defaults. Send If-Match with the content fingerprint of the payload (see the lookup endpoint) to skip unchanged payloads with 304 and no write; the response ETag carries the stored fingerprint",
+    'tags': ["Properties"],
+    'request': PROPERTY_CREATE_SCHEMA['request'],
+    'parameters': [
+        {'name': 'If-Match', 'in': 'header', 'description': 'Content fingerprint of the payload', 'schema': {'type': 'string'}}
+    ],
+    'responses': {
+        201: {'description': 'Property created'},
+        200: {'description': 'Property replaced (or already identical)'},
+        304: {'description': 'Payload fingerprint matches the stored property; nothing written'},
+        400: {'description': 'Validation errors'}
+    }
+}
+
+# Property Merge by Reference Schema
+PROPERTY_MERGE_BY_REFERENCE_SCHEMA = {
+    'summary': "Create or Merge Property by Reference",
+    'description': "Idempotent merge: creates the property, or updates only the fields present in the payload and keeps the stored values of the others (use this for partial scraper records). Send If-Match with the fingerprint of the supplied fields to skip unchanged payloads with 304 and no write; the response ETag carries that fingerprint",
+    'tags': ["Properties"],
+    'request': PROPERTY_CREATE_SCHEMA['request'],
+    'parameters': [
+        {'name': 'If-Match', 'in': 'header', 'description': 'Fingerprint of the supplied fields', 'schema': {'type': 'string'}}
+    ],
+    'responses': {
+        201: {'description': 'Property created'},
+        200: {'description': 'Supplied fields merged (or already identical)'},
+        304: {'description': 'Stored values of the supplied fields match; nothing written'},
+        400: {'description': 'Validation errors'}
+    }
+}
+
 # All Regions Schema
 ALL_REGIONS_SCHEMA = {
     'summary': "Get All Regions",
-    'description': "Retrieve a list of all unique regions where properties are located",
+    'description': "Retrieve a list of all unique regions where properties are located. With detailed=true, returns region ids, canonical names, property counts and towns (ids usable with the region_id/town_id list filters)",
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'detailed', 'in': 'query', 'description': 'Return ids, counts and towns instead of plain names', 'schema': {'type': 'boolean'}}
+    ]
+}
+
+# Property Facets Schema
+PROPERTY_FACETS_SCHEMA = {
+    'summary': "Get Property Facet Counts",
+    'description': "Counts per region, category, platform, energy rating and bedroom bucket for the properties matching the given filters. Accepts the same filter parameters as the property list",
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'search', 'in': 'query', 'description': 'Search in title, description, region, town', 'schema': {'type': 'string'}},
+        {'name': 'price_min', 'in': 'query', 'description': 'Minimum price', 'schema': {'type': 'number'}},
+        {'name': 'price_max', 'in': 'query', 'description': 'Maximum price', 'schema': {'type': 'number'}},
+        {'name': 'bedrooms', 'in': 'query', 'description': 'Minimum bedrooms', 'schema': {'type': 'integer'}},
+        {'name': 'region', 'in': 'query', 'description': 'Filter by region', 'schema': {'type': 'string'}},
+        {'name': 'region_id', 'in': 'query', 'description': 'Filter by region ids (comma-separated)', 'schema': {'type': 'string'}}
+    ]
+}
+
+# Semantic Search Schema
+PROPERTY_SEMANTIC_SEARCH_SCHEMA = {
+    'summary': "Semantic Property Search",
+    'description': "Properties whose embedded title, description, region and category are most similar to the query text (cosine similarity over the vector index), most similar first. List filter parameters restrict the candidates before ranking",
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'q', 'in': 'query', 'required': True, 'description': 'Free-text query, e.g. "quiet villa with sea view"', 'schema': {'type': 'string'}},
+        {'name': 'limit', 'in': 'query', 'description': 'Number of results (1-100, default 10)', 'schema': {'type': 'integer'}},
+        {'name': 'price_min', 'in': 'query', 'description': 'Minimum price', 'schema': {'type': 'number'}},
+        {'name': 'price_max', 'in': 'query', 'description': 'Maximum price', 'schema': {'type': 'number'}},
+        {'name': 'bedrooms', 'in': 'query', 'description': 'Minimum bedrooms', 'schema': {'type': 'integer'}},
+        {'name': 'region', 'in': 'query', 'description': 'Filter by region', 'schema': {'type': 'string'}},
+        {'name': 'region_id', 'in': 'query', 'description': 'Filter by region ids (comma-separated)', 'schema': {'type': 'string'}}
+    ],
+    'responses': {
+        200: {'description': 'Matching properties with their similarity'},
+        400: {'description': 'Missing query or invalid filters'}
+    }
+}
+
+# Property Stats Schema
+PROPERTY_STATS_SCHEMA = {
+    'summary': "Get Market Statistics",
+    'description': "Listing counts, price and price per m² percentiles and histograms for a region/category/platform group, served from summary tables refreshed after each ingest batch. Omitted filters mean all; group_by returns one entry per region, category or platform",
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'region_id', 'in': 'query', 'description': 'Region id (see /api/properties/regions/?detailed=true)', 'schema': {'type': 'integer'}},
+        {'name': 'category', 'in': 'query', 'description': 'Property category', 'schema': {'type': 'string'}},
+        {'name': 'platform', 'in': 'query', 'description': 'Source platform', 'schema': {'type': 'string'}},
+        {'name': 'group_by', 'in': 'query', 'description': 'Break down by region, category or platform', 'schema': {'type': 'string', 'enum': ['region', 'category', 'platform']}}
+    ]
+}
+
+# Property Changes Schema
+PROPERTY_CHANGES_SCHEMA = {
+    'summary': "Get Property Changes",
+    'description': "Delta sync feed: properties created or updated and tombstones of deleted ones, in (updated_at, id) order after the given cursor. Store next_cursor and pass it as since on the next call; keep calling while has_more is true",
+    'tags': ["Properties"],
+    'parameters': [
+        {'name': 'since', 'in': 'query', 'description': 'Cursor returned as next_cursor by the previous call (omit to start from the beginning)', 'schema': {'type': 'string'}},
+        {'name': 'limit', 'in': 'query', 'description': 'Maximum number of changes to return (1-5000, default 500)', 'schema': {'type': 'integer'}},
+        {'name': 'fields', 'in': 'query', 'description': 'Projection profile (card, full) or comma-separated field names for upserted properties', 'schema': {'type': 'string'}}
+    ],
+    'responses': {
+        200: {'description': 'Changes after the cursor'},
+        400: {'description': 'Invalid cursor, limit or fields'}
+    }
+}
+
+# Cache Stats Schema
+CACHE_STATS_SCHEMA = {
+    'summary': "Get Response Cache Stats",
+    'description': "Hit/miss counters, hit ratio, bytes served from and stored in the property response cache, and the current catalogue version (Admin only)",
     'tags': ["Properties"]
 }
 
+# Metrics Schema
+METRICS_SCHEMA = {
+    'summary': "Get Request Metrics",
+    'description': "Per-route latency histograms, SQL query counts, database time, response bytes, response cache hits and query budget overruns in Prometheus text format (Admin only)",
+    'tags': ["Monitoring"],
+    'responses': {
+        200: {'description': 'Prometheus text exposition format'}
+    }
+}
+
 # Patch Property Schema
 PATCH_PROPERTY_SCHEMA = {
     'summary': "Patch Property",
@@ -1,14 +1,28 @@
 from rest_framework import serializers
-from .models import Property
+from .models import Property, MarketSummary
+from .projections import INTERNAL_FIELDS
 
 
 class PropertySerializer(serializers.ModelSerializer):
-    """Serializer for Property model"""
+    """Serializer for Property model
+    
+    Accepts an optional ``fields`` argument to restrict the output to a
+    projection (see ``properties.projections``).
+    """
     
     class Meta:
         model = Property
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            allowed = set(fields)
+            for field_name in set(self.fields) - allowed:
+                self.fields.pop(field_name)
 
 
 class PropertyCreateSerializer(serializers.ModelSerializer):
@@ -56,3 +70,17 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
             'platform', 'link', 'energy_rating',
             'company_id', 'company_name', 'property_created_at', 'on_off', 'entity_id'
         ]
+
+
+class MarketSummarySerializer(serializers.ModelSerializer):
+    """Serializer for precomputed market statistics"""
+    
+    region_name = serializers.CharField(source='region.name', read_only=True, default=None)
+    
+    class Meta:
+        model = MarketSummary
+        fields = [
+            'region', 'region_name', 'category', 'platform', 'listing_count',
+            'price_stats', 'price_per_m2_stats', 'price_histogram', 'price_per_m2_histogram',
+            'refreshed_at'
+        ]
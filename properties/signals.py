@@ -0,0 +1,105 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Property, PropertyTombstone
+from .cache import bump_catalogue_version
+from .locations import assign_location, adjust_location_counts
+from .market_stats import mark_market_stats_dirty, market_stats_key
+from .fingerprints import instance_fingerprint
+from .amenities import sync_property_amenities
+from .amenity_matcher import SOURCE_FIELDS as AMENITY_SOURCE_FIELDS, extract_amenities
+
+
+LOCATION_FIELDS = {'region', 'town', 'region_ref', 'town_ref'}
+
+
+@receiver(pre_save, sender=Property)
+def resolve_property_location(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Map region/town text to the location dimension before writing"""
+    previous = None
+    if instance.pk and not raw:
+        previous = Property.objects.filter(pk=instance.pk).values_list(
+            'region_ref_id', 'town_ref_id', 'category', 'platform'
+        ).first()
+    instance._previous_row = previous
+    
+    if raw or (update_fields is not None and not LOCATION_FIELDS & set(update_fields)):
+        instance._previous_location = None
+        return
+    
+    instance._previous_location = previous[:2] if previous else (None, None)
+    assign_location(instance)
+
+
+@receiver(post_save, sender=Property)
+def update_location_counts(sender, instance, update_fields=None, **kwargs):
+    """Move the property between region/town counts when its location changes"""
+    previous = getattr(instance, '_previous_location', None)
+    if previous is None:
+        return
+    
+    current = (instance.region_ref_id, instance.town_ref_id)
+    if update_fields is not None and not {'region_ref', 'town_ref'} <= set(update_fields):
+        Property.objects.filter(pk=instance.pk).update(region_ref_id=current[0], town_ref_id=current[1])
+    
+    if previous != current:
+        adjust_location_counts(*previous, -1)
+        adjust_location_counts(*current, 1)
+
+
+@receiver(post_delete, sender=Property)
+def release_location_counts(sender, instance, **kwargs):
+    adjust_location_counts(instance.region_ref_id, instance.town_ref_id, -1)
+
+
+@receiver(pre_save, sender=Property)
+def compute_content_fingerprint(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.content_fingerprint = instance_fingerprint(instance)
+
+
+@receiver(post_save, sender=Property)
+def store_content_fingerprint(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Partial saves skip the fingerprint column; write it separately"""
+    if raw or update_fields is None or 'content_fingerprint' in update_fields:
+        return
+    Property.objects.filter(pk=instance.pk).update(content_fingerprint=instance.content_fingerprint)
+
+
+@receiver(post_save, sender=Property)
+def mark_saved_property_stats(sender, instance, raw=False, **kwargs):
+    """Queue the market summary groups the property left and joined"""
+    if raw:
+        return
+    keys = {market_stats_key(instance.region_ref_id, instance.category, instance.platform)}
+    previous = getattr(instance, '_previous_row', None)
+    if previous:
+        keys.add(market_stats_key(previous[0], previous[2], previous[3]))
+    mark_market_stats_dirty(keys)
+
+
+@receiver(post_save, sender=Property)
+def extract_property_amenities(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Re-tag the property's amenities when its text changes"""
+    if raw or (update_fields is not None and not set(AMENITY_SOURCE_FIELDS) & set(update_fields)):
+        return
+    tags = extract_amenities(*(getattr(instance, name) for name in AMENITY_SOURCE_FIELDS))
+    sync_property_amenities(instance.pk, tags, created=created)
+
+
+@receiver(post_delete, sender=Property)
+def mark_deleted_property_stats(sender, instance, **kwargs):
+    mark_market_stats_dirty([market_stats_key(instance.region_ref_id, instance.category, instance.platform)])
+
+
+@receiver(post_delete, sender=Property)
+def record_property_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone so delta-sync clients learn about the delete"""
+    PropertyTombstone.objects.create(property_id=instance.pk, reference=instance.reference)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_property_cache(sender, instance, **kwargs):
+    """Bump the catalogue version once the write is committed"""
+    transaction.on_commit(bump_catalogue_version)
@@ -0,0 +1,160 @@
+"""
+Slow-query capture
+Statements that exceed SLOW_QUERY_THRESHOLD_MS on the list, export and admin
+routes are aggregated in the SlowQuery table by normalized SQL, with an
+EXPLAIN plan refreshed at most once per EXPLAIN_INTERVAL.
+
+Only the SQL text and the *types* of its parameters are stored, never the
+values, so capture can stay on in production.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+
+# How often the plan of a known statement is re-explained
+EXPLAIN_INTERVAL = timedelta(hours=1)
+
+_PLACEHOLDER_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+_VALUES_ROWS = re.compile(r'VALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+', re.IGNORECASE)
+_LIMIT_OFFSET = re.compile(r'\b(LIMIT|OFFSET)\s+\d+', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryRecorder:
+    """
+    ``connection.execute_wrapper`` that times SQL statements. Every statement
+    is counted; only those taking at least ``keep_seconds`` are kept in
+    ``queries`` (all of them by default).
+    """
+
+    def __init__(self, keep_seconds=0):
+        self.keep_seconds = keep_seconds
+        self.queries = []  # (sql, params, seconds, alias, many)
+        self.count = 0
+        self.db_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - start
+            self.count += 1
+            self.db_time += seconds
+            if seconds >= self.keep_seconds:
+                self.queries.append((sql, params, seconds, context['connection'].alias, many))
+
+
+@contextmanager
+def capture_queries(recorder):
+    """Install ``recorder`` on every database connection of this thread"""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def normalize_sql(sql):
+    """Collapse placeholder lists, multi-row VALUES and LIMIT/OFFSET literals"""
+    sql = _PLACEHOLDER_LIST.sub('(%s, ...)', sql)
+    sql = _VALUES_ROWS.sub(lambda match: f'VALUES {match.group(1)}, ...', sql)
+    sql = _LIMIT_OFFSET.sub(lambda match: f'{match.group(1).upper()} ?', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def params_shape(params):
+    """Types of the parameters with consecutive repeats folded, e.g. ``["str x3", "int"]``"""
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        params = list(params.values())
+    shape = []
+    for param in params:
+        name = type(param).__name__
+        if shape and shape[-1][0] == name:
+            shape[-1][1] += 1
+        else:
+            shape.append([name, 1])
+    return [name if count == 1 else f'{name} x{count}' for name, count in shape]
+
+
+def explain(alias, sql, params):
+    """Query plan of a SELECT without executing it, or None if unsupported"""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            return json.loads(plan) if isinstance(plan, str) else plan
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [{'id': row[0], 'parent': row[1], 'detail': row[-1]} for row in cursor.fetchall()]
+    return None
+
+
+def should_capture(route):
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if not threshold or route is None:
+        return False
+    if not route.startswith(tuple(settings.SLOW_QUERY_ROUTES)):
+        return False
+    return random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+
+
+def record_slow_queries(route, queries):
+    """
+    Store the statements of one request that ran over the threshold.
+    ``queries`` are ``(sql, params, seconds, alias, many)`` tuples as collected
+    by ``QueryRecorder``. Failures are logged and never reach the caller.
+    """
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    for sql, params, seconds, alias, many in queries:
+        duration_ms = seconds * 1000
+        if duration_ms < threshold:
+            continue
+        try:
+            _record(route, sql, params, duration_ms, alias, many)
+        except Exception as e:
+            logger.error(f"Error recording slow query: {e}")
+
+
+def _record(route, sql, params, duration_ms, alias, many):
+    normalized = normalize_sql(sql)
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()
+
+    slow_query, _ = SlowQuery.objects.get_or_create(
+        fingerprint=fingerprint,
+        defaults={'normalized_sql': normalized, 'params_shape': [] if many else params_shape(params), 'route': route}
+    )
+    SlowQuery.objects.filter(pk=slow_query.pk).update(
+        route=route,
+        occurrences=F('occurrences') + 1,
+        total_duration_ms=F('total_duration_ms') + duration_ms,
+        max_duration_ms=Greatest('max_duration_ms', duration_ms),
+        last_duration_ms=duration_ms,
+        last_seen=timezone.now(),
+    )
+
+    now = timezone.now()
+    if many or (slow_query.explained_at and now - slow_query.explained_at < EXPLAIN_INTERVAL):
+        return
+    plan = explain(alias, sql, params)
+    if plan is not None:
+        SlowQuery.objects.filter(pk=slow_query.pk).update(explain_plan=plan, explained_at=now)
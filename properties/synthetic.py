@@ -0,0 +1,180 @@
+"""
+Synthetic catalogue
+Seeded generator of realistic Mallorca listings for load tests and
+benchmarks. The same seed and offset always produce the same rows.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from .fingerprints import instance_fingerprint
+from .locations import resolve_region, resolve_town
+from .models import Property
+
+
+# Region: (listing weight, median price per m2, towns)
+REGIONS = {
+    'Palma': (30, 4200, ['Palma', 'Son Vida', 'Portixol', 'Santa Catalina', 'El Terreno', 'Son Armadams']),
+    'Calvià': (14, 5600, ['Santa Ponsa', 'Bendinat', 'Portals Nous', 'Costa d\'en Blanes', 'Port Adriano', 'Illetas']),
+    'Andratx': (8, 6100, ['Port d\'Andratx', 'Camp de Mar', 'Sant Elm', 'S\'Arracó']),
+    'Sóller': (5, 4800, ['Port de Sóller', 'Fornalutx', 'Biniaraix']),
+    'Pollença': (7, 3900, ['Port de Pollença', 'Cala Sant Vicenç', 'Pollença']),
+    'Alcúdia': (6, 3300, ['Port d\'Alcúdia', 'Alcúdia', 'Playa de Muro']),
+    'Santanyí': (7, 4300, ['Cala d\'Or', 'Cala Figuera', 'Es Llombards', 'Santanyí']),
+    'Felanitx': (4, 2900, ['Portocolom', 'Felanitx', 'Cas Concos']),
+    'Manacor': (5, 2500, ['Porto Cristo', 'Manacor', 'Cala Romántica']),
+    'Llucmajor': (6, 3100, ['Llucmajor', 'S\'Arenal', 'Badia Gran', 'Puig de Ros']),
+    'Deià': (2, 7200, ['Deià', 'Llucalcari']),
+    'Santa Maria del Camí': (3, 3400, ['Santa Maria del Camí', 'Consell']),
+    'Artà': (3, 2700, ['Artà', 'Colònia de Sant Pere']),
+}
+
+# Category: (listing weight, median m2, m2 spread, price per m2 factor, has land)
+CATEGORIES = {
+    'apartment': (38, 85, 0.35, 1.0, False),
+    'penthouse': (8, 130, 0.35, 1.25, False),
+    'townhouse': (12, 160, 0.35, 0.9, False),
+    'house': (16, 220, 0.4, 0.95, True),
+    'villa': (14, 380, 0.45, 1.35, True),
+    'finca': (8, 450, 0.5, 1.1, True),
+    'plot': (4, 900, 0.6, 0.25, True),
+}
+
+PLATFORMS = {'idealista': 40, 'fotocasa': 25, 'kyero': 20, 'thinkspain': 15}
+
+ENERGY_RATINGS = {'A': 3, 'B': 5, 'C': 8, 'D': 12, 'E': 30, 'F': 12, 'G': 10, None: 20}
+
+COMPANIES = [
+    'Engel & Völkers Mallorca', 'Balearic Properties', 'Mallorca Gold', 'Kühn & Partner',
+    'First Mallorca', 'Porta Mallorquina', 'Minkner & Partner', 'Lucas Fox Mallorca',
+]
+
+# Description templates per language, filled with the listing's attributes
+DESCRIPTIONS = {
+    'en': (
+        'Bright {category} in {town} with {bedrooms} bedrooms and {bathrooms} bathrooms, '
+        '{square_meters} m2 built, {amenities}. Close to the beach and all amenities.'
+    ),
+    'de': (
+        '{category} in {town} mit {bedrooms} Schlafzimmern und {bathrooms} Bädern, '
+        '{square_meters} m2 Wohnfläche, {amenities}. Nahe am Strand und allen Einrichtungen.'
+    ),
+    'es': (
+        '{category} en {town} con {bedrooms} dormitorios y {bathrooms} baños, '
+        '{square_meters} m2 construidos, {amenities}. Cerca de la playa y de todos los servicios.'
+    ),
+}
+
+AMENITIES = {
+    'en': ['sea views', 'private pool', 'garage', 'terrace', 'air conditioning', 'lift', 'garden', 'fireplace'],
+    'de': ['Meerblick', 'privater Pool', 'Garage', 'Terrasse', 'Klimaanlage', 'Aufzug', 'Garten', 'Kamin'],
+    'es': ['vistas al mar', 'piscina privada', 'garaje', 'terraza', 'aire acondicionado', 'ascensor', 'jardín', 'chimenea'],
+}
+
+CATEGORY_NAMES = {
+    'en': {},
+    'de': {'apartment': 'Wohnung', 'penthouse': 'Penthouse', 'townhouse': 'Stadthaus', 'house': 'Haus',
+           'villa': 'Villa', 'finca': 'Finca', 'plot': 'Grundstück'},
+    'es': {'apartment': 'Piso', 'penthouse': 'Ático', 'townhouse': 'Casa adosada', 'house': 'Casa',
+           'villa': 'Villa', 'finca': 'Finca', 'plot': 'Solar'},
+}
+
+LANGUAGE_WEIGHTS = {'en': 45, 'de': 30, 'es': 25}
+
+REFERENCE_PREFIX = 'synthetic-'
+
+# Listing dates count back from a fixed instant so that runs are reproducible
+LISTED_BEFORE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _weighted(rng, choices):
+    return rng.choices(list(choices), weights=[
+        value[0] if isinstance(value, tuple) else value for value in choices.values()
+    ])[0]
+
+
+def _description(rng, category, town, bedrooms, bathrooms, square_meters):
+    languages = [language for language in LANGUAGE_WEIGHTS if rng.random() < LANGUAGE_WEIGHTS[language] / 50]
+    if not languages:
+        languages = [_weighted(rng, LANGUAGE_WEIGHTS)]
+    amenity_indexes = rng.sample(range(len(AMENITIES['en'])), rng.randint(1, 4))
+    return '\n\n'.join(
+        DESCRIPTIONS[language].format(
+            category=CATEGORY_NAMES[language].get(category, category), town=town,
+            bedrooms=bedrooms, bathrooms=bathrooms, square_meters=int(square_meters),
+            amenities=', '.join(AMENITIES[language][index] for index in amenity_indexes),
+        )
+        for language in languages
+    )
+
+
+def generate_properties(count, seed=0, start=0, prefix=REFERENCE_PREFIX):
+    """
+    Yield ``count`` unsaved Property instances numbered from ``start``.
+
+    Each row draws from its own RNG seeded by ``(seed, number)``, so any slice
+    of the catalogue can be regenerated independently. Location references and
+    content fingerprints are filled in because bulk_create bypasses signals.
+    """
+    locations = {}
+
+    for number in range(start, start + count):
+        rng = random.Random(f'{seed}:{number}')
+
+        region = _weighted(rng, REGIONS)
+        _, price_per_m2, towns = REGIONS[region]
+        town = rng.choice(towns)
+        if (region, town) not in locations:
+            region_ref = resolve_region(region)
+            locations[region, town] = (region_ref, resolve_town(region_ref, town))
+        region_ref, town_ref = locations[region, town]
+
+        category = _weighted(rng, CATEGORIES)
+        _, median_m2, spread, price_factor, has_land = CATEGORIES[category]
+        square_meters = round(median_m2 * rng.lognormvariate(0, spread), 1)
+        price = round(square_meters * price_per_m2 * price_factor * rng.lognormvariate(0, 0.3), -3)
+        if category == 'plot':
+            bedrooms, bathrooms = 0, 0
+        else:
+            bedrooms = max(0, min(10, round(square_meters / 45 + rng.gauss(0, 0.8))))
+            bathrooms = max(1, min(bedrooms or 1, round(bedrooms * 0.7 + rng.gauss(0, 0.5))))
+
+        platform = _weighted(rng, PLATFORMS)
+        listing_id = f'{seed:x}{number:08d}'
+        photos = [
+            f'https://img.example.com/{platform}/{listing_id}/{index}.jpg'
+            for index in range(rng.randint(3, 30))
+        ]
+        listed_at = LISTED_BEFORE - timedelta(days=rng.expovariate(1 / 120), seconds=rng.randint(0, 86399))
+
+        instance = Property(
+            reference=f'{prefix}{seed}-{number}',
+            title=f'{category.capitalize()} in {town}, {region}',
+            category=category,
+            price=max(price, 30000.0),
+            square_meters=square_meters,
+            region=region,
+            town=town,
+            region_ref=region_ref,
+            town_ref=town_ref,
+            street_address=f'Carrer {rng.randint(1, 400)}',
+            address_city=town,
+            address_state='Illes Balears',
+            address_country='Spain',
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            land_area=round(square_meters * rng.uniform(2, 40), 1) if has_land else None,
+            built_up=None if category == 'plot' else square_meters,
+            description=_description(rng, category, town, bedrooms, bathrooms, square_meters),
+            photos=photos,
+            main_image=photos[0],
+            platform=platform,
+            link=f'https://www.{platform}.example.com/listing/{listing_id}',
+            energy_rating=_weighted(rng, ENERGY_RATINGS),
+            company_id=str(rng.randint(1000, 9999)),
+            company_name=rng.choice(COMPANIES),
+            property_created_at=listed_at,
+            on_off=rng.random() > 0.05,
+            entity_id=listing_id,
+        )
+        instance.content_fingerprint = instance_fingerprint(instance)
+        yield instance
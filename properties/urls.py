@@ -10,8 +10,15 @@ urlpatterns = [
     path('properties/<int:pk>/update/', views.PropertyUpdateView.as_view(), name='property-update'),
     path('properties/<int:pk>/delete/', views.PropertyDeleteView.as_view(), name='property-delete'),
     path('properties/<int:pk>/patch/', views.patch_property, name='property-patch'),
+    path('properties/lookup/', views.lookup_properties, name='property-lookup'),
     path('properties/reference/<str:reference>/', views.get_property_by_reference, name='property-by-reference'),
     path('properties/regions/', views.get_all_regions, name='all-regions'),
+    path('properties/facets/', views.get_property_facets, name='property-facets'),
+    path('properties/semantic-search/', views.semantic_search_properties, name='property-semantic-search'),
+    path('properties/changes/', views.get_property_changes, name='property-changes'),
+    path('properties/stats/', views.get_property_stats, name='property-stats'),
+    path('properties/cache/stats/', views.get_cache_stats_view, name='property-cache-stats'),
+    path('metrics/', views.get_metrics, name='metrics'),
     
     # Bot control endpoints
     path('bot/scrapers/', views.list_bot_scrapers, name='bot-scrapers'),
@@ -1,14 +1,20 @@
 from rest_framework import status, generics, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.conf import settings
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Property
-from .serializers import PropertySerializer, PropertyCreateSerializer, PropertyUpdateSerializer
-from .filters import PropertyFilter
+from .models import Property, Region, MarketSummary, MarketSummaryChange
+from .serializers import PropertySerializer, PropertyCreateSerializer, PropertyUpdateSerializer, MarketSummarySerializer
+from .filters import DEFAULT_ORDERING, ORDERING_FIELDS, PROPERTY_ID_RANGE, UNORDERED_FILTER_PARAMS, PropertyFilter
 from services.bot_integration import BotIntegrationService
 from drf_spectacular.utils import extend_schema
 from .schemas import (
@@ -18,7 +24,16 @@ from .schemas import (
     PROPERTY_UPDATE_SCHEMA,
     PROPERTY_DELETE_SCHEMA,
     PROPERTY_BY_REFERENCE_SCHEMA,
+    PROPERTY_UPSERT_BY_REFERENCE_SCHEMA,
+    PROPERTY_MERGE_BY_REFERENCE_SCHEMA,
     ALL_REGIONS_SCHEMA,
+    PROPERTY_FACETS_SCHEMA,
+    PROPERTY_SEMANTIC_SEARCH_SCHEMA,
+    PROPERTY_STATS_SCHEMA,
+    CACHE_STATS_SCHEMA,
+    PROPERTY_CHANGES_SCHEMA,
+    PROPERTY_LOOKUP_SCHEMA,
+    METRICS_SCHEMA,
     PATCH_PROPERTY_SCHEMA,
     BOT_SCRAPERS_SCHEMA,
     RUN_BOT_SCRAPER_SCHEMA,
@@ -26,9 +41,33 @@ from .schemas import (
 )
 import logging
 from .pagination import PropertyPagination
+from .projections import resolve_projection, apply_projection
+from .fast_serializers import property_values, serialize_rows, serialize_row
+from .renderers import ORJSONRenderer
+from .cache import ResponseCache, normalize_query_params, serve_cached, get_cache_stats, row_validators
+from .facets import compute_facets
+from .fingerprints import CONTENT_FIELDS, content_fingerprint, fields_fingerprint
+from .changes import read_changes, InvalidCursor
+from .hot_index import hot_index
+from .metrics import collector, render_prometheus
+from utils.vector_search import VectorSearch
 
 logger = logging.getLogger(__name__)
 
+REGIONS_RESPONSE_CACHE = ResponseCache('regions')
+REFERENCE_RESPONSE_CACHE = ResponseCache('reference')
+FACETS_RESPONSE_CACHE = ResponseCache('facets')
+
+# Page size bounds of the delta sync feed
+CHANGES_DEFAULT_LIMIT = 500
+CHANGES_MAX_LIMIT = 5000
+
+# Maximum number of references or ids per batch lookup
+LOOKUP_MAX_ITEMS = 5000
+# Result count bounds of semantic search
+SEMANTIC_SEARCH_DEFAULT_LIMIT = 10
+SEMANTIC_SEARCH_MAX_LIMIT = 100
+
 
 @extend_schema(**PROPERTY_CREATE_SCHEMA)
 class PropertyCreateView(generics.CreateAPIView):
@@ -53,23 +92,110 @@ class PropertyCreateView(generics.CreateAPIView):
         return super().create(request, *args, **kwargs)
 
 
+class PropertyProjectionMixin:
+    """Apply the ``?fields=`` projection to both the queryset and the serializer"""
+
+    def get_projection(self):
+        if not hasattr(self, '_projection'):
+            self._projection = resolve_projection(self.request.query_params)
+        return self._projection
+
+    def get_queryset(self):
+        return apply_projection(super().get_queryset(), self.get_projection())
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_projection())
+        return super().get_serializer(*args, **kwargs)
+
+
 @extend_schema(**PROPERTY_LIST_SCHEMA)
-class PropertyListView(generics.ListAPIView):
+class PropertyListView(PropertyProjectionMixin, generics.ListAPIView):
     """List properties with filtering and pagination"""
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
     filterset_class = PropertyFilter
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    ordering_fields = ['price', 'square_meters', 'created_at', 'updated_at']
-    ordering = ['-created_at']
+    ordering_fields = ORDERING_FIELDS
+    ordering = DEFAULT_ORDERING
     pagination_class = PropertyPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    response_cache = ResponseCache('list')
+
+    def get_cache_params(self):
+        """Normalized query parameters identifying this list response"""
+        allowed = list(self.filterset_class.base_filters) + ['ordering', 'fields']
+        defaults = {
+            'page': 1,
+            'page_size': self.pagination_class.page_size,
+            'ordering': ','.join(self.ordering),
+            'fields': 'full',
+        }
+        return normalize_query_params(
+            self.request.query_params, allowed, defaults,
+            unordered=UNORDERED_FILTER_PARAMS + ('fields',)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return serve_cached(
+            request, self.response_cache, self.get_cache_params(),
+            lambda: self.list_uncached(request, *args, **kwargs),
+            self.get_renderer_context()
+        )
+
+    def list_uncached(self, request, *args, **kwargs):
+        """Serialize the page from ``values()`` rows, bypassing PropertySerializer"""
+        fields = self.get_projection()
+        if settings.PROPERTY_HOT_INDEX:
+            response = self.list_from_hot_index(fields)
+            if response is not None:
+                return response
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        # Break ties by id, as the hot index does, so pages are stable either way
+        queryset = property_values(queryset.order_by(*queryset.query.order_by, 'id'), fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_rows(page, fields))
+
+        return Response(serialize_rows(queryset, fields))
+
+    def list_from_hot_index(self, fields):
+        """
+        Compute the ordered ids in the in-memory index and fetch only the
+        page's rows by primary key. Returns None when the index cannot
+        answer this request.
+        """
+        ordering = OrderingFilter().get_ordering(self.request, self.get_queryset(), self)
+        ordered_ids = hot_index.ordered_ids(self.request.query_params, ordering)
+        if ordered_ids is None:
+            return None
+        
+        page = self.paginate_queryset(ordered_ids)
+        page_ids = [int(pk) for pk in page]
+        rows = {row['id']: row for row in property_values(Property.objects.filter(pk__in=page_ids), fields)}
+        data = serialize_rows([rows[pk] for pk in page_ids if pk in rows], fields)
+        return self.get_paginated_response(data)
 
 
 @extend_schema(**PROPERTY_DETAIL_SCHEMA)
-class PropertyDetailView(generics.RetrieveAPIView):
+class PropertyDetailView(PropertyProjectionMixin, generics.RetrieveAPIView):
     """Retrieve a specific property by ID"""
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    response_cache = ResponseCache('detail')
+
+    def retrieve(self, request, *args, **kwargs):
+        params = normalize_query_params(
+            request.query_params, ['fields'], {'pk': kwargs['pk'], 'fields': 'full'}, unordered=('fields',)
+        )
+        return serve_cached(
+            request, self.response_cache, params,
+            lambda: super(PropertyDetailView, self).retrieve(request, *args, **kwargs),
+            self.get_renderer_context(),
+            validators=row_validators(Property.objects.filter(pk=kwargs['pk']), params)
+        )
 
 
 @extend_schema(**PROPERTY_UPDATE_SCHEMA)
@@ -91,24 +217,375 @@ class PropertyDeleteView(generics.DestroyAPIView):
         return Response({"message": "Property deleted successfully"}, status=status.HTTP_200_OK)
 
 
-@extend_schema(**PROPERTY_BY_REFERENCE_SCHEMA)
-@api_view(['GET'])
+@extend_schema(methods=['GET'], **PROPERTY_BY_REFERENCE_SCHEMA)
+@extend_schema(methods=['PUT'], **PROPERTY_UPSERT_BY_REFERENCE_SCHEMA)
+@extend_schema(methods=['PATCH'], **PROPERTY_MERGE_BY_REFERENCE_SCHEMA)
+@api_view(['GET', 'PUT', 'PATCH'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
 def get_property_by_reference(request, reference):
-    """Get property by reference number"""
-    try:
-        property_obj = Property.objects.get(reference=reference)
-        serializer = PropertySerializer(property_obj)
-        return Response(serializer.data)
-    except Property.DoesNotExist:
+    """Get property by reference number, create/replace it with PUT, or create/merge it with PATCH"""
+    if request.method in ('PUT', 'PATCH') and not isinstance(request.data, dict):
+        return Response({"error": "Request body must be a JSON object"}, status=status.HTTP_400_BAD_REQUEST)
+    if request.method == 'PUT':
+        return _upsert_property_by_reference(request, reference)
+    if request.method == 'PATCH':
+        return _merge_property_by_reference(request, reference)
+    
+    params = normalize_query_params(
+        request.query_params, ['fields'], {'reference': reference, 'fields': 'full'}, unordered=('fields',)
+    )
+    return serve_cached(
+        request, REFERENCE_RESPONSE_CACHE, params,
+        lambda: _property_by_reference_response(request, reference),
+        validators=row_validators(Property.objects.filter(reference=reference), params)
+    )
+
+
+def _property_by_reference_response(request, reference):
+    fields = resolve_projection(request.query_params)
+    row = property_values(Property.objects.filter(reference=reference), fields).first()
+    if row is None:
         return Response({"error": "Property not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(serialize_row(row, fields))
+
+
+@extend_schema(**PROPERTY_LOOKUP_SCHEMA)
+@api_view(['POST'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
+def lookup_properties(request):
+    """Fetch many properties by reference or id in one query"""
+    if not isinstance(request.data, dict):
+        return Response({"error": "Request body must be a JSON object"}, status=status.HTTP_400_BAD_REQUEST)
+    references = request.data.get('references')
+    ids = request.data.get('ids')
+    if (references is None) == (ids is None):
+        return Response({"error": "Provide either references or ids"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    key_field, keys = ('reference', references) if references is not None else ('id', ids)
+    if not isinstance(keys, list) or not keys:
+        return Response({"error": f"{key_field}s must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(keys) > LOOKUP_MAX_ITEMS:
+        return Response({"error": f"At most {LOOKUP_MAX_ITEMS} {key_field}s per request"}, status=status.HTTP_400_BAD_REQUEST)
+    if key_field == 'id' and not all(
+        isinstance(key, int) and not isinstance(key, bool) and key in PROPERTY_ID_RANGE for key in keys
+    ):
+        return Response({"error": "ids must be 64-bit integers"}, status=status.HTTP_400_BAD_REQUEST)
+    if key_field == 'reference' and not all(isinstance(key, str) for key in keys):
+        return Response({"error": "references must be strings"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    keys = list(dict.fromkeys(keys))
+    queryset = Property.objects.filter(**{f'{key_field}__in': keys}).order_by()
+    
+    if request.data.get('exists_only'):
+        found = {}
+        for pk, reference, fingerprint in queryset.values_list('id', 'reference', 'content_fingerprint'):
+            key = reference if key_field == 'reference' else pk
+            found[key] = {'id': pk, 'reference': reference, 'fingerprint': fingerprint}
+        return Response({
+            'results': {str(key): value for key, value in found.items()},
+            'missing': [key for key in keys if key not in found],
+        })
+    
+    projection = request.data.get('fields') or request.query_params.get('fields')
+    if isinstance(projection, list) and all(isinstance(name, str) for name in projection):
+        projection = ','.join(projection)
+    elif projection is not None and not isinstance(projection, str):
+        return Response(
+            {"error": "fields must be a profile name, comma-separated field names or a list of field names"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    fields = resolve_projection({'fields': projection})
+    select = fields if fields is None or key_field in fields else fields + [key_field]
+    rows = {row[key_field]: row for row in property_values(queryset, select)}
+    results = []
+    for key in keys:
+        row = rows.get(key)
+        if row is None:
+            continue
+        if fields is not None and key_field not in fields:
+            row = {name: value for name, value in row.items() if name != key_field}
+        results.append(serialize_row(row, fields))
+    return Response({
+        'results': results,
+        'missing': [key for key in keys if key not in rows],
+    })
+
+
+def _fingerprint_response(response, fingerprint):
+    response['ETag'] = f'"{fingerprint}"'
+    return response
+
+
+def _if_match(request, fingerprint):
+    if_match = request.headers.get('If-Match')
+    return bool(if_match) and f'"{fingerprint}"' in parse_etags(if_match) + [f'"{if_match.strip()}"']
+
+
+def _create_by_reference(reference, values):
+    """Create the property, or lock the row a concurrent request created first (returns instance, created)"""
+    try:
+        with transaction.atomic():
+            return Property.objects.create(reference=reference, **values), True
+    except IntegrityError:
+        # A concurrent request created it first; update that row instead
+        return Property.objects.select_for_update().get(reference=reference), False
+
+
+def _upsert_property_by_reference(request, reference):
+    """
+    Create or fully replace the property with ``reference`` in one transaction.
+    For callers that send complete records; partial records use PATCH (merge).
+
+    ``If-Match`` carries the fingerprint of the payload: when it equals the
+    stored fingerprint the payload is known to be unchanged and the request
+    ends with 304 before validation or any write.
+    """
+    if request.headers.get('If-Match'):
+        stored = Property.objects.filter(reference=reference).values_list('content_fingerprint', flat=True).first()
+        if stored and _if_match(request, stored):
+            return _fingerprint_response(Response(status=status.HTTP_304_NOT_MODIFIED), stored)
+    
+    if request.data.get('reference', reference) != reference:
+        return Response({"error": "Body reference does not match the URL"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = PropertyUpdateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    # PUT replaces the whole content: omitted fields go back to their defaults
+    values = {
+        field.name: serializer.validated_data.get(field.name, field.get_default())
+        for field in CONTENT_FIELDS if field.name != 'reference'
+    }
+    fingerprint = content_fingerprint({'reference': reference, **values})
+    
+    with transaction.atomic():
+        instance = Property.objects.select_for_update().filter(reference=reference).first()
+        created = False
+        if instance is None:
+            instance, created = _create_by_reference(reference, values)
+        
+        if not created and instance.content_fingerprint != fingerprint:
+            for name, value in values.items():
+                setattr(instance, name, value)
+            instance.save()
+    
+    response = Response(
+        PropertySerializer(instance).data,
+        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    )
+    return _fingerprint_response(response, instance.content_fingerprint)
+
+
+def _merge_property_by_reference(request, reference):
+    """
+    Create the property with ``reference``, or update only the fields in the
+    payload and keep the stored values of the others.
+
+    ``If-Match`` carries the fingerprint of the supplied fields
+    (``fields_fingerprint``): when the stored values of those fields match,
+    the request ends with 304 before validation or any write.
+    """
+    if request.data.get('reference', reference) != reference:
+        return Response({"error": "Body reference does not match the URL"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    names = [field.name for field in CONTENT_FIELDS if field.name in request.data and field.name != 'reference']
+    stored = Property.objects.filter(reference=reference).values('reference', *names).first()
+    if stored is not None:
+        fingerprint = fields_fingerprint(stored)
+        if _if_match(request, fingerprint):
+            return _fingerprint_response(Response(status=status.HTTP_304_NOT_MODIFIED), fingerprint)
+    
+    # A new property needs every required field; an existing one only the supplied ones
+    serializer = PropertyUpdateSerializer(data=request.data, partial=stored is not None)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    values = {name: serializer.validated_data[name] for name in names if name in serializer.validated_data}
+    
+    with transaction.atomic():
+        instance = Property.objects.select_for_update().filter(reference=reference).first()
+        created = False
+        if instance is None:
+            if stored is not None:
+                # Deleted since validation; it has to be created from a complete payload
+                serializer = PropertyUpdateSerializer(data=request.data)
+                if not serializer.is_valid():
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            instance, created = _create_by_reference(reference, values)
+        
+        if not created:
+            changed = {name: value for name, value in values.items() if getattr(instance, name) != value}
+            if changed:
+                for name, value in changed.items():
+                    setattr(instance, name, value)
+                instance.save()
+    
+    response = Response(
+        PropertySerializer(instance).data,
+        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    )
+    return _fingerprint_response(
+        response, fields_fingerprint({'reference': reference, **{name: getattr(instance, name) for name in names}})
+    )
 
 
 @extend_schema(**ALL_REGIONS_SCHEMA)
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
 def get_all_regions(request):
-    """Get list of all unique regions"""
-    regions = Property.objects.values_list('region', flat=True).distinct()
-    return Response(list(regions))
+    """Get list of all regions from the location dimension"""
+    detailed = request.query_params.get('detailed', '').lower() in ('1', 'true', 'yes')
+    return serve_cached(
+        request, REGIONS_RESPONSE_CACHE, [('detailed', detailed)],
+        lambda: _all_regions_response(detailed)
+    )
+
+
+def _all_regions_response(detailed):
+    regions = Region.objects.filter(property_count__gt=0)
+    if not detailed:
+        return Response(list(regions.values_list('name', flat=True)))
+    
+    regions = regions.prefetch_related('towns')
+    return Response([
+        {
+            'id': region.id,
+            'name': region.name,
+            'property_count': region.property_count,
+            'towns': [
+                {'id': town.id, 'name': town.name, 'property_count': town.property_count}
+                for town in region.towns.all() if town.property_count > 0
+            ]
+        }
+        for region in regions
+    ])
+
+
+@extend_schema(**PROPERTY_FACETS_SCHEMA)
+@api_view(['GET'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
+def get_property_facets(request):
+    """Counts per region, category, platform, energy rating and bedroom bucket for the current filter"""
+    allowed = [name for name in PropertyFilter.base_filters if name not in ('page', 'page_size')]
+    params = normalize_query_params(request.query_params, allowed, unordered=UNORDERED_FILTER_PARAMS)
+    return serve_cached(request, FACETS_RESPONSE_CACHE, params, lambda: _property_facets_response(request))
+
+
+def _property_facets_response(request):
+    filterset = PropertyFilter(request.query_params, queryset=Property.objects.all(), request=request)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    count, facets = compute_facets(filterset.qs)
+    return Response({'count': count, 'facets': facets})
+
+
+@extend_schema(**PROPERTY_SEMANTIC_SEARCH_SCHEMA)
+@api_view(['GET'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
+def semantic_search_properties(request):
+    """Properties most similar to a free-text query, optionally restricted by list filters"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.query_params.get('limit', SEMANTIC_SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= SEMANTIC_SEARCH_MAX_LIMIT:
+        return Response({'error': f'limit must be between 1 and {SEMANTIC_SEARCH_MAX_LIMIT}'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    restrict = None
+    if any(name in request.query_params for name in PropertyFilter.base_filters if name not in ('page', 'page_size')):
+        filterset = PropertyFilter(request.query_params, queryset=Property.objects.all(), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        restrict = filterset.qs
+    
+    properties = VectorSearch().search_similar_properties(query, limit=limit, queryset=restrict)
+    results = []
+    for property_obj in properties:
+        data = PropertySerializer(property_obj).data
+        data['similarity'] = round(property_obj.similarity, 4)
+        results.append(data)
+    return Response({'count': len(results), 'results': results})
+
+
+@extend_schema(**PROPERTY_STATS_SCHEMA)
+@api_view(['GET'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
+def get_property_stats(request):
+    """Market statistics served from the precomputed summary tables"""
+    region_id = request.query_params.get('region_id') or None
+    if region_id is not None and not region_id.isdigit():
+        return Response({"error": "region_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    lookup = {
+        'region': int(region_id) if region_id else None,
+        'category': request.query_params.get('category', ''),
+        'platform': request.query_params.get('platform', ''),
+    }
+    summaries = MarketSummary.objects.select_related('region')
+    pending_changes = MarketSummaryChange.objects.count()
+    
+    group_by = request.query_params.get('group_by')
+    if group_by:
+        if group_by not in lookup:
+            return Response({"error": "group_by must be one of: region, category, platform"}, status=status.HTTP_400_BAD_REQUEST)
+        lookup.pop(group_by)
+        summaries = summaries.filter(**lookup).exclude(**{group_by: None if group_by == 'region' else ''})
+        return Response({
+            'group_by': group_by,
+            'pending_changes': pending_changes,
+            'results': MarketSummarySerializer(summaries.order_by('-listing_count'), many=True).data,
+        })
+    
+    summary = summaries.filter(**lookup).first()
+    if summary is None:
+        return Response({"error": "No statistics for this group"}, status=status.HTTP_404_NOT_FOUND)
+    data = MarketSummarySerializer(summary).data
+    data['pending_changes'] = pending_changes
+    return Response(data)
+
+
+@extend_schema(**PROPERTY_CHANGES_SCHEMA)
+@api_view(['GET'])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
+def get_property_changes(request):
+    """Properties created, updated or deleted since a cursor"""
+    limit = request.query_params.get('limit', str(CHANGES_DEFAULT_LIMIT))
+    if not limit.isdigit() or not 1 <= int(limit) <= CHANGES_MAX_LIMIT:
+        return Response({"error": f"limit must be an integer between 1 and {CHANGES_MAX_LIMIT}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fields = resolve_projection(request.query_params)
+    try:
+        changes, next_cursor, has_more = read_changes(request.query_params.get('since'), int(limit), fields)
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'changes': changes,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    })
+
+
+@extend_schema(**CACHE_STATS_SCHEMA)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_cache_stats_view(request):
+    """Response cache hit ratio and byte counters"""
+    return Response(get_cache_stats())
+
+
+@extend_schema(**METRICS_SCHEMA)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_metrics(request):
+    """Request metrics in Prometheus text format"""
+    return HttpResponse(
+        render_prometheus(collector.snapshot()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
 
 
 @extend_schema(**PATCH_PROPERTY_SCHEMA)
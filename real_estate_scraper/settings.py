@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'properties.middleware.QueryMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -83,6 +84,80 @@ DATABASES = {
     }
 }
 
+# Cache (shared Redis when REDIS_URL is set, per-process memory otherwise; see PROPERTY_RESPONSE_CACHE)
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'real-estate-scraper',
+        }
+    }
+
+# Cached property responses are only correct when every process (web workers, run_bot,
+# export worker, management commands) sees the same catalogue version, so the response
+# cache is off unless the cache is shared
+PROPERTY_RESPONSE_CACHE = os.getenv('PROPERTY_RESPONSE_CACHE', str(bool(REDIS_URL))).lower() in ('true', '1', 'yes')
+
+# Property response cache lifetime in seconds (entries are also invalidated by catalogue version)
+PROPERTY_RESPONSE_CACHE_TIMEOUT = int(os.getenv('PROPERTY_RESPONSE_CACHE_TIMEOUT', 600))
+
+# Single-flight recomputation of cache misses: how long a stale copy may be served after
+# a catalogue change, how long the recompute lock lives and how long other workers wait for it
+PROPERTY_CACHE_STALE_SECONDS = int(os.getenv('PROPERTY_CACHE_STALE_SECONDS', 30))
+PROPERTY_CACHE_LOCK_TIMEOUT = int(os.getenv('PROPERTY_CACHE_LOCK_TIMEOUT', 30))
+PROPERTY_CACHE_LOCK_WAIT = float(os.getenv('PROPERTY_CACHE_LOCK_WAIT', 5))
+
+# Delta sync feed: rows younger than this are held back until their transaction has surely committed.
+# Mirrors never re-read rows behind their cursor, so it must exceed the longest transaction that
+# writes properties (bulk commands commit per batch); 60s like the hot and vector index overlaps
+PROPERTY_CHANGES_SETTLE_SECONDS = int(os.getenv('PROPERTY_CHANGES_SETTLE_SECONDS', 60))
+
+# In-memory columnar index for property list filtering (per worker process). On catalogue
+# changes it is patched with recent rows, or rebuilt once older than PROPERTY_HOT_INDEX_MAX_AGE seconds
+PROPERTY_HOT_INDEX = os.getenv('PROPERTY_HOT_INDEX', 'False').lower() == 'true'
+PROPERTY_HOT_INDEX_MAX_AGE = int(os.getenv('PROPERTY_HOT_INDEX_MAX_AGE', 300))
+
+# Per-route request metrics served at /api/metrics/; requests running more SQL queries than
+# the budget are logged with their SQL (0 disables the check)
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True').lower() == 'true'
+REQUEST_QUERY_BUDGET = int(os.getenv('REQUEST_QUERY_BUDGET', 50))
+
+# Statements slower than SLOW_QUERY_THRESHOLD_MS on the routes below are stored with their
+# EXPLAIN plan and ranked in the admin (0 disables capture)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 500))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 1.0))
+SLOW_QUERY_ROUTES = [
+    'api/properties/', 'api/pdf/', 'api/catalogue/', 'api/csv/', 'api/json/', 'api/ndjson/', 'api/parquet/', 'admin/',
+    'jobs/export/',  # background export jobs (exports.jobs.run_job)
+]
+
+# Rows fetched per server-side cursor round trip (and per streamed chunk) by the exports
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+# Largest CSV/JSON export served without an explicit ?limit=
+EXPORT_MAX_ROWS = int(os.getenv('EXPORT_MAX_ROWS', 500000))
+# Rows per Parquet row group (each group is encoded and sent as one chunk)
+PARQUET_ROW_GROUP_SIZE = int(os.getenv('PARQUET_ROW_GROUP_SIZE', 50000))
+
+# Background export jobs (run_export_jobs worker): artifacts are written below MEDIA_ROOT and
+# deleted after the retention period; running jobs without progress for the stale timeout are retried
+EXPORT_JOBS_DIR = os.getenv('EXPORT_JOBS_DIR', 'exports')
+EXPORT_JOB_RETENTION_HOURS = int(os.getenv('EXPORT_JOB_RETENTION_HOURS', 24))
+EXPORT_JOB_STALE_SECONDS = int(os.getenv('EXPORT_JOB_STALE_SECONDS', 600))
+
+# PDF catalogues: worker processes rendering page ranges, the main_image thumbnail cache below MEDIA_ROOT,
+# and the seconds a catalogue rendered in the request waits for thumbnail downloads
+CATALOGUE_WORKERS = int(os.getenv('CATALOGUE_WORKERS', 4))
+THUMBNAILS_DIR = os.getenv('THUMBNAILS_DIR', 'thumbnails')
+CATALOGUE_THUMBNAIL_DEADLINE = float(os.getenv('CATALOGUE_THUMBNAIL_DEADLINE', 5))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -194,6 +269,19 @@ SIMPLE_JWT = {
 # OpenAI settings
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 EMBEDDING_DIMENSIONS = int(os.getenv('EMBEDDING_DIMENSIONS', 512))
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')
+# openai, local (offline feature hashing) or a dotted path to a backend class (utils.embeddings)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'openai' if OPENAI_API_KEY else 'local')
+
+# Chat model behind OpenAIService: openai, local (offline stub) or a dotted path (utils.llm); answers are cached in the database
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai' if OPENAI_API_KEY else 'local')
+LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
+# Model calls per second of the enrich_properties command, across all its threads
+LLM_RATE_LIMIT = float(os.getenv('LLM_RATE_LIMIT', 5))
+
+# Vector search: memory-mapped IVF index of stored embeddings (build_vector_index) and lists probed per query
+VECTOR_INDEX_DIR = os.getenv('VECTOR_INDEX_DIR', str(BASE_DIR / 'vector_index'))
+VECTOR_SEARCH_NPROBE = int(os.getenv('VECTOR_SEARCH_NPROBE', 32))
 
 # Bot Integration settings
 BOT_API_URL = os.getenv('BOT_API_URL', 'http://localhost:8000/api')
@@ -1,10 +1,15 @@
+import logging
 import os
 import sys
 import requests
+from urllib.parse import quote
 from django.conf import settings
 from django.core.cache import cache
 from django.contrib.auth import authenticate
 
+logger = logging.getLogger(__name__)
+
+
 class BotIntegrationService:
     """Service for integrating with the existing real estate scraper bot"""
     
@@ -121,41 +126,42 @@ class BotIntegrationService:
             return False
         
         try:
-            reference = property_data.get('reference')
-            if reference:
-                response = self.session.get(
-                    f"{self.api_url}/properties/reference/{reference}/"
-                )
-                
-                if response.status_code == 200:
-                    property_id = response.json().get('id')
-                    update_response = self.session.put(
-                        f"{self.api_url}/properties/{property_id}/update/",
-                        json=property_data,
-                        headers={"Content-Type": "application/json"}
-                    )
-                    
-                    if update_response.status_code == 200:
-                        return True
-                    else:
-                        return False
-                else:
-                    create_response = self.session.post(
-                        f"{self.api_url}/properties/create/",
-                        json=property_data,
-                        headers={"Content-Type": "application/json"}
-                    )
-                    
-                    if create_response.status_code in [200, 201]:
-                        return True
-                    else:
-                        return False
-            else:
+            from properties.fingerprints import fields_fingerprint
+            
+            # Scraped records are partial: only send (and overwrite) the values the scraper found
+            mapped_data = {
+                field: value for field, value in self._map_scraper_data_to_model(property_data).items()
+                if value is not None
+            }
+            reference = mapped_data.get('reference')
+            if not reference:
                 return False
+            
+            # One idempotent merge; If-Match lets the API skip unchanged listings without writing
+            response = self.session.patch(
+                f"{self.api_url}/properties/reference/{quote(reference, safe='')}/",
+                json=mapped_data,
+                headers={
+                    "Content-Type": "application/json",
+                    "If-Match": f'"{fields_fingerprint(mapped_data)}"'
+                }
+            )
+            
+            return response.status_code in [200, 201, 304]
                 
         except Exception as e:
             return False
     
+    def refresh_summaries(self):
+        """Refresh derived tables after an ingest batch (ORM mode only)"""
+        if not self.running_from_django:
+            return
+        try:
+            from properties.market_stats import refresh_market_stats
+            refresh_market_stats()
+        except Exception:
+            logger.exception("Market statistics refresh failed")
+    
     def _map_scraper_data_to_model(self, property_data):
         """Map scraper data structure to Django Property model fields"""
         try:
@@ -381,6 +387,8 @@ class BotIntegrationService:
                             else:
                                 uploaded += 1
                     
+                    self.refresh_summaries()
+                    
                     return {
                         "success": True,
                         "message": f"Bot scraper {scraper_name} completed successfully",
@@ -417,6 +425,8 @@ class BotIntegrationService:
                                 else:
                                     uploaded += 1
                         
+                        self.refresh_summaries()
+                        
                         return {
                             "success": True,
                             "message": f"Bot scraper {scraper_name} completed successfully",
@@ -0,0 +1,163 @@
+"""
+Incremental embedding pipeline
+Only properties written since their embedding was last checked are read. The
+embedding text of each is hashed and compared with the stored ``text_hash``.
+Unchanged texts are just marked as checked, and changed or missing ones are
+sent to the backend in batches with bounded concurrency and retries. Vectors
+are written back with bulk upserts. Each run therefore costs in proportion to
+the catalogue churn, not its size.
+"""
+
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from django.db.models import F, Q
+from django.utils import timezone
+from properties.models import Property, PropertyEmbedding
+from .embeddings import embedding_text_hash, property_embedding_text
+
+logger = logging.getLogger(__name__)
+
+
+# Retry delays grow from RETRY_BASE_DELAY seconds, doubling up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Rows read per database round trip while looking for stale embeddings
+READ_CHUNK_SIZE = 2000
+
+
+@dataclass
+class EmbeddingRun:
+    """Counters of one pipeline run"""
+
+    candidates: int = 0
+    unchanged: int = 0
+    embedded: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    failed_ids: list = field(default_factory=list)
+
+
+def stale_candidates(model, full=False):
+    """
+    Properties whose embedding may be out of date: never embedded, embedded
+    with another model, or updated since the embedding was last checked
+    (every property with ``full``). Read in id order one chunk at a time, so
+    no cursor stays open while embeddings are written.
+    """
+    properties = Property.objects.all()
+    if not full:
+        properties = properties.filter(
+            Q(embedding__isnull=True) |
+            ~Q(embedding__model=model) |
+            Q(updated_at__gt=F('embedding__checked_at'))
+        )
+    rows = properties.order_by('id').values_list(
+        'id', 'title', 'description', 'region', 'category', 'embedding__model', 'embedding__text_hash'
+    )
+    last_id = 0
+    while True:
+        chunk = list(rows.filter(id__gt=last_id)[:READ_CHUNK_SIZE])
+        yield from chunk
+        if len(chunk) < READ_CHUNK_SIZE:
+            return
+        last_id = chunk[-1][0]
+
+
+def _embed_with_retry(backend, texts, max_retries, run):
+    for attempt in range(max_retries + 1):
+        try:
+            return backend.embed(texts)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY) * random.uniform(0.5, 1.0)
+            logger.warning(f"Embedding batch of {len(texts)} failed ({e}); retrying in {delay:.1f}s")
+            run.retries += 1
+            time.sleep(delay)
+
+
+def _write(backend, batch, vectors, checked_at):
+    PropertyEmbedding.objects.bulk_create(
+        [
+            PropertyEmbedding(
+                property_id=property_id, model=backend.name, text_hash=text_hash,
+                vector=vector.tobytes(), updated_at=checked_at, checked_at=checked_at
+            )
+            for (property_id, text_hash, _), vector in zip(batch, vectors)
+        ],
+        update_conflicts=True,
+        unique_fields=['property'],
+        update_fields=['model', 'text_hash', 'vector', 'updated_at', 'checked_at'],
+    )
+
+
+def embed_stale_properties(backend, batch_size=256, concurrency=4, max_retries=5, full=False, limit=None,
+                           progress=None):
+    """
+    Bring the stored embeddings of ``backend`` up to date. ``progress`` is
+    called with the run counters after every batch. Returns the EmbeddingRun.
+    """
+    run = EmbeddingRun()
+    # Taken before reading, so rows updated during the run are seen again next time
+    checked_at = timezone.now()
+    unchanged = []
+    batch = []
+
+    def flush_unchanged():
+        PropertyEmbedding.objects.filter(property_id__in=unchanged).update(checked_at=checked_at)
+        unchanged.clear()
+
+    def collect(done, pending):
+        for future in done:
+            sent = pending.pop(future)
+            try:
+                _write(backend, sent, future.result(), checked_at)
+                run.embedded += len(sent)
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(sent)} properties failed: {e}")
+                run.failed += len(sent)
+                run.failed_ids.extend(property_id for property_id, _, _ in sent)
+            run.batches += 1
+            if progress:
+                progress(run)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+
+        def submit(sent):
+            # At most ``concurrency`` batches in flight; wait for one before sending more
+            if len(pending) >= concurrency:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done, pending)
+            future = executor.submit(_embed_with_retry, backend, [text for _, _, text in sent], max_retries, run)
+            pending[future] = sent
+
+        for row in stale_candidates(backend.name, full):
+            property_id, title, description, region, category, stored_model, stored_hash = row
+            if limit is not None and run.candidates >= limit:
+                break
+            run.candidates += 1
+            text = property_embedding_text(title, description, region, category)
+            text_hash = embedding_text_hash(text)
+            if stored_model == backend.name and stored_hash == text_hash:
+                run.unchanged += 1
+                unchanged.append(property_id)
+                if len(unchanged) >= READ_CHUNK_SIZE:
+                    flush_unchanged()
+                continue
+            batch.append((property_id, text_hash, text))
+            if len(batch) == batch_size:
+                submit(batch)
+                batch = []
+        if batch:
+            submit(batch)
+        while pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED).done, pending)
+
+    if unchanged:
+        flush_unchanged()
+    return run
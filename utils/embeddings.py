@@ -0,0 +1,96 @@
+"""
+Embedding backends
+A backend turns a batch of texts into an ``(n, EMBEDDING_DIMENSIONS)``
+float32 matrix of unit-length rows. ``name`` identifies the model, so stored
+vectors of a different model are never compared with the query.
+
+EMBEDDING_BACKEND selects ``openai``, ``local`` or a dotted path to a class.
+The local backend hashes words and word pairs into the vector (no network,
+deterministic across processes), which keeps search usable offline and in tests.
+"""
+
+import hashlib
+import math
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+def property_embedding_text(title, description, region, category):
+    """Text a property is embedded from"""
+    return f"{title} {description or ''} {region} {category or ''}"
+
+
+def embedding_text_hash(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def normalize_rows(vectors):
+    """Scale rows to unit length in place (zero rows stay zero) and return them"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class LocalEmbeddingBackend:
+    """Feature hashing of lowercase words and adjacent word pairs"""
+
+    _TOKEN = re.compile(r'\w+')
+
+    def __init__(self, dimensions=None):
+        self.dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+        self.name = f'local-hashing-{self.dimensions}'
+
+    def embed(self, texts):
+        rows, columns, weights = [], [], []
+        for row, text in enumerate(texts):
+            tokens = self._TOKEN.findall(text.lower())
+            features = Counter(tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])])
+            for feature, count in features.items():
+                code = zlib.crc32(feature.encode())
+                rows.append(row)
+                columns.append(code % self.dimensions)
+                # Sublinear term frequency, with the sign taken from the hash
+                weight = 1.0 + math.log(count)
+                weights.append(weight if code & 0x80000000 else -weight)
+
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), np.array(weights, dtype=np.float32))
+        return normalize_rows(vectors)
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI embeddings API; one request per batch of texts"""
+
+    def __init__(self, dimensions=None):
+        import openai
+
+        self.dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+        self.model = settings.EMBEDDING_MODEL
+        self.name = f'{self.model}-{self.dimensions}'
+        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+
+    def embed(self, texts):
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        response = self.client.embeddings.create(model=self.model, input=list(texts), dimensions=self.dimensions)
+        data = sorted(response.data, key=lambda item: item.index)
+        return normalize_rows(np.array([item.embedding for item in data], dtype=np.float32))
+
+
+BACKENDS = {
+    'local': LocalEmbeddingBackend,
+    'openai': OpenAIEmbeddingBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_embedding_backend(name=None):
+    """Backend instance for ``name`` (default: EMBEDDING_BACKEND), shared per process"""
+    name = name or settings.EMBEDDING_BACKEND
+    backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+    return backend_class()
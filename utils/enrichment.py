@@ -0,0 +1,190 @@
+"""
+Batch property enrichment
+Runs the OpenAIService analysis, summary and feature suggestion requests for
+many properties and stores the answers as PropertyEnrichment rows. Properties
+are read in chunks. For each chunk the cached answers are fetched in one
+query, and only the missing ones are sent to the model from a thread pool
+under a shared requests-per-second limit. New answers go into the response
+cache, so a property whose prompts did not change costs no model call.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from django.db.models import F, Q
+from django.utils import timezone
+from properties.models import LLMResponse, Property, PropertyEnrichment
+from .openai_service import parse_features
+
+logger = logging.getLogger(__name__)
+
+
+# Property columns the prompts are built from
+SOURCE_FIELDS = ['title', 'region', 'town', 'price', 'square_meters', 'bedrooms', 'bathrooms', 'description']
+
+# Retry delays grow from RETRY_BASE_DELAY seconds, doubling up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+@dataclass
+class EnrichmentRun:
+    """Counters of one enrichment run"""
+
+    properties: int = 0
+    enriched: int = 0
+    failed: int = 0
+    cache_hits: int = 0
+    model_calls: int = 0
+    retries: int = 0
+
+
+class RateLimiter:
+    """Spaces calls from any number of threads at least ``1 / rate`` seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def enrichment_candidates(model, force=False, chunk_size=100):
+    """
+    Chunks of property rows never enriched, enriched with another model, or
+    updated since (every property with ``force``), in id order.
+    """
+    properties = Property.objects.all()
+    if not force:
+        properties = properties.filter(
+            Q(enrichment__isnull=True) |
+            ~Q(enrichment__model=model) |
+            Q(updated_at__gt=F('enrichment__enriched_at'))
+        )
+    rows = properties.order_by('id').values('id', *SOURCE_FIELDS)
+    last_id = 0
+    while True:
+        chunk = list(rows.filter(id__gt=last_id)[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1]['id']
+
+
+def _requests(service, row):
+    """The three requests of a property, keyed by PropertyEnrichment field"""
+    return {
+        'analysis': service.analysis_request(row['description']),
+        'summary': service.summary_request(row),
+        'suggested_features': service.features_request(row['description']),
+    }
+
+
+def enrich_properties(service, concurrency=4, rate_limit=None, max_retries=3, force=False, limit=None,
+                      chunk_size=100, progress=None):
+    """
+    Store enrichments for the candidate properties using ``service``
+    (an OpenAIService). ``rate_limit`` caps model calls per second across
+    all threads. Properties with a failed request are left for the next run.
+    ``progress`` is called with the run counters after every chunk.
+    """
+    run = EnrichmentRun()
+    model = service.backend.name
+    limiter = RateLimiter(rate_limit)
+    chunks = enrichment_candidates(model, force, chunk_size)
+
+    def call(request):
+        method, messages, max_tokens, temperature = request
+        for attempt in range(max_retries + 1):
+            limiter.wait()
+            try:
+                response = service.backend.complete(messages, max_tokens, temperature)
+                # An empty answer (refusal, content filter) counts as failed and is not stored
+                return response if response and response.strip() else None
+            except Exception as e:
+                if attempt == max_retries:
+                    logger.error(f"{method} failed: {e}")
+                    return None
+                delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY) * random.uniform(0.5, 1.0)
+                logger.warning(f"{method} failed ({e}); retrying in {delay:.1f}s")
+                run.retries += 1
+                time.sleep(delay)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            # Taken before reading, so properties updated during the run are enriched again next time
+            enriched_at = timezone.now()
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            if limit is not None:
+                chunk = chunk[:limit - run.properties]
+            run.properties += len(chunk)
+
+            # {property id: {field: ((method, prompt hash), request)}}
+            requests = {
+                row['id']: {
+                    field: ((request[0], service.prompt_hash(*request[1:])), request)
+                    for field, request in _requests(service, row).items()
+                }
+                for row in chunk
+            }
+            answers = {key: None for property_requests in requests.values() for key, _ in property_requests.values()}
+            for method, prompt_hash, response in LLMResponse.objects.filter(
+                model=model, prompt_hash__in={prompt_hash for _, prompt_hash in answers}
+            ).values_list('method', 'prompt_hash', 'response'):
+                if (method, prompt_hash) in answers:
+                    answers[(method, prompt_hash)] = response
+            run.cache_hits += sum(answer is not None for answer in answers.values())
+
+            # Identical prompts of different properties are sent once
+            missing = {
+                key: request
+                for property_requests in requests.values()
+                for key, request in property_requests.values()
+                if answers[key] is None
+            }
+            responses = list(executor.map(call, missing.values()))
+            run.model_calls += len(responses)
+            LLMResponse.objects.bulk_create(
+                [
+                    LLMResponse(method=method, model=model, prompt_hash=prompt_hash, response=response)
+                    for (method, prompt_hash), response in zip(missing, responses) if response is not None
+                ],
+                ignore_conflicts=True
+            )
+            answers.update(zip(missing, responses))
+
+            enrichments = []
+            for property_id, property_requests in requests.items():
+                fields = {field: answers[key] for field, (key, _) in property_requests.items()}
+                if any(answer is None for answer in fields.values()):
+                    run.failed += 1
+                    continue
+                fields['suggested_features'] = parse_features(fields['suggested_features'])
+                enrichments.append(PropertyEnrichment(property_id=property_id, model=model, enriched_at=enriched_at, **fields))
+            PropertyEnrichment.objects.bulk_create(
+                enrichments,
+                update_conflicts=True,
+                unique_fields=['property'],
+                update_fields=['model', 'analysis', 'summary', 'suggested_features', 'enriched_at'],
+            )
+            run.enriched += len(enrichments)
+            if progress:
+                progress(run)
+            if limit is not None and run.properties >= limit:
+                break
+    return run
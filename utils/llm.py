@@ -0,0 +1,69 @@
+"""
+Chat completion backends
+A backend answers a list of chat messages with text. ``name`` identifies the
+model, so responses cached for one model are not served for another.
+
+LLM_BACKEND selects ``openai``, ``local`` or a dotted path to a class. The
+local backend answers without a network call from the prompt itself, which
+keeps the OpenAIService features and enrichment runnable offline.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class LocalChatBackend:
+    """Deterministic stand-in: answers with the first sentences of the last user message"""
+
+    name = 'local-stub'
+
+    _SENTENCE = re.compile(r'(?<=[.!?])\s+')
+
+    def complete(self, messages, max_tokens, temperature):
+        prompt = ' '.join(messages[-1]['content'].split())
+        digest = hashlib.sha1(prompt.encode()).hexdigest()[:8]
+        # Roughly four characters per token
+        budget = max_tokens * 4
+        lines = []
+        for sentence in self._SENTENCE.split(prompt):
+            if sum(len(line) for line in lines) + len(sentence) > budget:
+                break
+            lines.append(sentence)
+        return '\n'.join(lines or [prompt[:budget]]) + f'\n[{self.name} {digest}]'
+
+
+class OpenAIChatBackend:
+    """OpenAI chat completions API"""
+
+    def __init__(self):
+        import openai
+
+        self.name = settings.LLM_MODEL
+        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+
+    def complete(self, messages, max_tokens, temperature):
+        # content is None when the model refuses or the content filter stops it
+        response = self.client.chat.completions.create(
+            model=self.name,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+
+BACKENDS = {
+    'local': LocalChatBackend,
+    'openai': OpenAIChatBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_llm_backend(name=None):
+    """Backend instance for ``name`` (default: LLM_BACKEND), shared per process"""
+    name = name or settings.LLM_BACKEND
+    backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+    return backend_class()
@@ -1,55 +1,57 @@
-import openai
-from django.conf import settings
-from django.core.cache import cache
+import hashlib
+import logging
+import orjson
+from properties.models import LLMResponse
+from .llm import get_llm_backend
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIService:
-    """OpenAI service for property analysis and generation"""
+    """Property analysis and generation with a language model
+    
+    Every answer is cached in the database by (method, model, prompt hash),
+    so repeating a prompt never calls the model again. The model comes from
+    LLM_BACKEND (see utils.llm); the local backend works offline.
+    """
     
-    def __init__(self):
-        self.api_key = settings.OPENAI_API_KEY
-        if self.api_key:
-            openai.api_key = self.api_key
+    def __init__(self, backend=None):
+        self.backend = get_llm_backend(backend)
     
     def analyze_property_description(self, description):
         """Analyze property description and extract key features"""
-        if not self.api_key:
-            return None
-        
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a real estate expert. Analyze the property description and extract key features, amenities, and characteristics."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this property description: {description}"
-                    }
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error analyzing property description: {e}")
-            return None
+        return self.complete(*self.analysis_request(description))
     
     def generate_property_summary(self, property_data):
         """Generate a summary for a property"""
-        if not self.api_key:
-            return None
-        
-        try:
-            # Create a prompt from property data
-            prompt = f"""
+        return self.complete(*self.summary_request(property_data))
+    
+    def suggest_property_features(self, description):
+        """Suggest additional features based on property description"""
+        return parse_features(self.complete(*self.features_request(description)))
+    
+    # Each request is (method, messages, max_tokens, temperature)
+    
+    def analysis_request(self, description):
+        return 'analyze_property_description', [
+            {
+                "role": "system",
+                "content": "You are a real estate expert. Analyze the property description and extract key features, amenities, and characteristics."
+            },
+            {
+                "role": "user",
+                "content": f"Analyze this property description: {description}"
+            }
+        ], 200, 0.3
+    
+    def summary_request(self, property_data):
+        price = property_data.get('price')
+        # Create a prompt from property data
+        prompt = f"""
             Create a compelling summary for this property:
             - Title: {property_data.get('title', 'N/A')}
             - Location: {property_data.get('region', 'N/A')}, {property_data.get('town', 'N/A')}
-            - Price: €{property_data.get('price', 'N/A'):,.0f}
+            - Price: €{f'{price:,.0f}' if isinstance(price, (int, float)) else 'N/A'}
             - Size: {property_data.get('square_meters', 'N/A')} m²
             - Bedrooms: {property_data.get('bedrooms', 'N/A')}
             - Bathrooms: {property_data.get('bathrooms', 'N/A')}
@@ -57,62 +59,67 @@ class OpenAIService:
             
             Write a 2-3 sentence summary that highlights the key selling points.
             """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a real estate marketing expert. Write compelling property summaries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error generating property summary: {e}")
-            return None
+        return 'generate_property_summary', [
+            {
+                "role": "system",
+                "content": "You are a real estate marketing expert. Write compelling property summaries."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ], 150, 0.7
     
-    def suggest_property_features(self, description):
-        """Suggest additional features based on property description"""
-        if not self.api_key:
-            return []
+    def features_request(self, description):
+        return 'suggest_property_features', [
+            {
+                "role": "system",
+                "content": "You are a real estate expert. Suggest relevant features that might be present in this type of property."
+            },
+            {
+                "role": "user",
+                "content": f"Based on this description, what features might this property have? {description}"
+            }
+        ], 200, 0.5
+    
+    def prompt_hash(self, messages, max_tokens, temperature):
+        return hashlib.sha256(orjson.dumps([messages, max_tokens, temperature])).hexdigest()
+    
+    def complete(self, method, messages, max_tokens, temperature):
+        """Cached answer to a request, asking the model on a miss; None if the model call fails or answers nothing"""
+        prompt_hash = self.prompt_hash(messages, max_tokens, temperature)
+        cached = self.get_cached_response(method, prompt_hash)
+        if cached is not None:
+            return cached
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a real estate expert. Suggest relevant features that might be present in this type of property."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Based on this description, what features might this property have? {description}"
-                    }
-                ],
-                max_tokens=200,
-                temperature=0.5
-            )
-            
-            # Parse response into a list of features
-            features_text = response.choices[0].message.content
-            features = [feature.strip() for feature in features_text.split('\n') if feature.strip()]
-            return features
+            response = self.backend.complete(messages, max_tokens, temperature)
         except Exception as e:
-            print(f"Error suggesting features: {e}")
-            return []
+            logger.error(f"Error in {method}: {e}")
+            return None
+        if not response or not response.strip():
+            # Refusals and content-filter stops come back without content; not cached, so they are retried
+            logger.warning(f"Empty response in {method}")
+            return None
+        self.cache_response(method, prompt_hash, response)
+        return response
     
-    def get_cached_response(self, cache_key):
-        """Get cached OpenAI response"""
-        return cache.get(cache_key)
+    def get_cached_response(self, method, prompt_hash):
+        """Get cached model response"""
+        return LLMResponse.objects.filter(
+            method=method, model=self.backend.name, prompt_hash=prompt_hash
+        ).values_list('response', flat=True).first()
     
-    def cache_response(self, cache_key, response, timeout=3600):
-        """Cache OpenAI response"""
-        cache.set(cache_key, response, timeout=timeout)
+    def cache_response(self, method, prompt_hash, response):
+        """Cache model response"""
+        LLMResponse.objects.bulk_create(
+            [LLMResponse(method=method, model=self.backend.name, prompt_hash=prompt_hash, response=response)],
+            ignore_conflicts=True
+        )
+
+
+def parse_features(features_text):
+    """Parse a feature suggestion response into a list of features"""
+    if not features_text:
+        return []
+    return [feature.strip() for feature in features_text.split('\n') if feature.strip()]
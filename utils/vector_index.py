@@ -0,0 +1,305 @@
+"""
+On-disk vector index
+Stored property embeddings are compiled into an inverted-file (IVF) index in
+VECTOR_INDEX_DIR. K-means centroids split the vectors into lists, and the rows
+of each list are stored contiguously in a float32 matrix that is memory-mapped
+by every process. A query scores the centroids, then scans only the rows of
+the ``nprobe`` closest lists.
+
+Search can be restricted to a queryset of properties. Small restrictions are
+scored exactly by looking up their rows, and large ones are masked inside the
+probed lists. Embeddings written after the index was built are scored exactly
+from the database and take precedence over their indexed rows, so results stay
+current between rebuilds.
+"""
+
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from properties.models import PropertyEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+# Indexes with fewer rows are a single list, i.e. an exact scan
+IVF_MIN_ROWS = 10000
+
+# Centroids are trained on at most this many vectors per list
+TRAINING_ROWS_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+
+# Restrictions to at most this many properties are scored exactly
+EXACT_MAX_ROWS = 20000
+
+# Rows per matrix product while assigning or scanning
+SCAN_BLOCK_ROWS = 16384
+
+# Embeddings are re-read this far behind the build time, since updated_at is set before commit
+DELTA_OVERLAP_SECONDS = 60
+
+POINTER_FILE = 'current'
+
+
+def _assign(vectors, centroids):
+    """Index of the closest centroid of every row"""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + SCAN_BLOCK_ROWS])
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(vectors, lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """Spherical k-means centroids of ``vectors`` (unit-length rows)"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), lists * TRAINING_ROWS_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=lists)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        sums = np.add.reduceat(sample[order], starts[filled], axis=0)
+        centroids[filled] = sums
+        # Empty lists restart from random sample vectors
+        centroids[~filled] = sample[rng.choice(len(sample), int((~filled).sum()), replace=False)]
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        np.divide(centroids, norms, out=centroids, where=norms > 0)
+    return centroids
+
+
+def _top_k(scores, ids, k):
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, ids = scores[keep], ids[keep]
+    order = np.argsort(-scores, kind='stable')
+    return scores[order], ids[order]
+
+
+def _merge(results, k):
+    scores = np.concatenate([scores for scores, _ in results]) if results else np.zeros(0, dtype=np.float32)
+    ids = np.concatenate([ids for _, ids in results]) if results else np.zeros(0, dtype=np.int64)
+    return _top_k(scores, ids, k)
+
+
+def exact_scan(embeddings, query, k):
+    """Top ``k`` of a PropertyEmbedding queryset, read in blocks; returns ``(scores, ids)``"""
+    results = []
+    ids, vectors = [], []
+
+    def flush():
+        if ids:
+            block_ids = np.array(ids, dtype=np.int64)
+            block = np.frombuffer(b''.join(vectors), dtype=np.float32).reshape(len(ids), -1)
+            results.append(_top_k(block @ query, block_ids, k))
+            ids.clear()
+            vectors.clear()
+
+    for property_id, vector in embeddings.values_list('property_id', 'vector').iterator(chunk_size=SCAN_BLOCK_ROWS):
+        ids.append(property_id)
+        vectors.append(bytes(vector))
+        if len(ids) == SCAN_BLOCK_ROWS:
+            flush()
+    flush()
+    return _merge(results, k)
+
+
+class _IndexFiles:
+    """A built index, memory-mapped"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.path = path
+        self.model = meta['model']
+        self.dimensions = meta['dimensions']
+        self.count = meta['count']
+        self.built_at = parse_datetime(meta['built_at'])
+        self.ids = np.load(os.path.join(path, 'ids.npy'))
+        self.centroids = np.load(os.path.join(path, 'centroids.npy'))
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'))
+        if self.count:
+            self.vectors = np.memmap(os.path.join(path, 'vectors.f32'), dtype=np.float32, mode='r',
+                                     shape=(self.count, self.dimensions))
+        else:
+            self.vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._sorter = np.argsort(self.ids)
+
+    def rows_of(self, property_ids):
+        """Positions of the given ids that are in the index"""
+        if not len(self.ids):
+            return np.zeros(0, dtype=np.int64)
+        found = np.searchsorted(self.ids, property_ids, sorter=self._sorter)
+        found = np.minimum(found, len(self.ids) - 1)
+        rows = self._sorter[found]
+        return rows[self.ids[rows] == property_ids]
+
+    def search(self, query, k, nprobe, allowed=None, excluded=None):
+        """
+        ``(scores, ids)`` of the top ``k`` indexed rows. ``allowed`` and
+        ``excluded`` are sorted id arrays; with ``allowed`` set, more lists
+        are probed until ``k`` matches are found.
+        """
+        if allowed is not None and len(allowed) <= EXACT_MAX_ROWS:
+            rows = np.sort(self.rows_of(allowed))
+            if excluded is not None:
+                rows = rows[~np.isin(self.ids[rows], excluded)]
+            return _top_k(np.asarray(self.vectors[rows]) @ query, self.ids[rows], k)
+
+        lists = len(self.centroids)
+        ranked = np.argsort(-(self.centroids @ query))
+        results, found, probed = [], 0, 0
+        while probed < lists and (probed < nprobe or found < k):
+            for position in ranked[probed:min(probed + nprobe, lists)]:
+                start, end = self.offsets[position], self.offsets[position + 1]
+                ids = self.ids[start:end]
+                keep = np.ones(len(ids), dtype=bool)
+                if allowed is not None:
+                    keep &= np.isin(ids, allowed, assume_unique=True)
+                if excluded is not None:
+                    keep &= ~np.isin(ids, excluded, assume_unique=True)
+                if not keep.any():
+                    continue
+                block = np.asarray(self.vectors[start:end])[keep]
+                results.append(_top_k(block @ query, ids[keep], k))
+                found += len(block)
+            probed += nprobe
+        return _merge(results, k)
+
+
+def build_index(model, lists=None, directory=None):
+    """
+    Compile the stored embeddings of ``model`` into a new index and make it
+    current. Returns the number of indexed vectors.
+    """
+    directory = str(directory or settings.VECTOR_INDEX_DIR)
+    built_at = timezone.now()
+    path = os.path.join(directory, f'build-{built_at:%Y%m%d%H%M%S%f}-{os.getpid()}')
+    os.makedirs(path)
+
+    ids, blocks = [], []
+    rows = PropertyEmbedding.objects.filter(model=model).order_by('property_id').values_list('property_id', 'vector')
+    for property_id, vector in rows.iterator(chunk_size=SCAN_BLOCK_ROWS):
+        ids.append(property_id)
+        blocks.append(bytes(vector))
+    ids = np.array(ids, dtype=np.int64)
+    dimensions = len(blocks[0]) // 4 if blocks else settings.EMBEDDING_DIMENSIONS
+    vectors = np.frombuffer(b''.join(blocks), dtype=np.float32).reshape(len(ids), dimensions)
+    del blocks
+
+    if lists is None:
+        lists = 1 if len(ids) < IVF_MIN_ROWS else int(math.sqrt(len(ids)))
+    lists = max(min(lists, len(ids)), 1)
+    if lists > 1:
+        centroids = train_centroids(vectors, lists)
+        assignments = _assign(vectors, centroids)
+    else:
+        centroids = vectors.mean(axis=0, keepdims=True) if len(ids) else np.zeros((1, dimensions), dtype=np.float32)
+        assignments = np.zeros(len(ids), dtype=np.int32)
+
+    order = np.argsort(assignments, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=lists))]).astype(np.int64)
+    if len(ids):
+        matrix = np.memmap(os.path.join(path, 'vectors.f32'), dtype=np.float32, mode='w+', shape=vectors.shape)
+        matrix[:] = vectors[order]
+        matrix.flush()
+        del matrix
+    np.save(os.path.join(path, 'ids.npy'), ids[order])
+    np.save(os.path.join(path, 'centroids.npy'), centroids.astype(np.float32))
+    np.save(os.path.join(path, 'offsets.npy'), offsets)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({
+            'model': model, 'dimensions': dimensions, 'count': len(ids), 'lists': lists,
+            'built_at': built_at.isoformat(),
+        }, f)
+
+    pointer = os.path.join(directory, POINTER_FILE)
+    previous = _read_pointer(directory)
+    with open(f'{pointer}.tmp', 'w') as f:
+        f.write(os.path.basename(path))
+    os.replace(f'{pointer}.tmp', pointer)
+
+    # Keep the previous build for processes still reading it
+    for name in os.listdir(directory):
+        if name.startswith('build-') and name not in (os.path.basename(path), previous):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    return len(ids)
+
+
+def _read_pointer(directory):
+    try:
+        with open(os.path.join(directory, POINTER_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+class VectorIndex:
+    """Process-wide handle on the current index build"""
+
+    def __init__(self):
+        self._files = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Index files of the current build, or None before the first build"""
+        directory = str(settings.VECTOR_INDEX_DIR)
+        name = _read_pointer(directory)
+        if name is None:
+            return None
+        files = self._files
+        if files is not None and os.path.basename(files.path) == name:
+            return files
+        with self._lock:
+            if self._files is None or os.path.basename(self._files.path) != name:
+                self._files = _IndexFiles(os.path.join(directory, name))
+            return self._files
+
+    def search(self, query, model, k=10, restrict=None, nprobe=None):
+        """
+        ``[(property_id, score), ...]`` of the ``k`` stored embeddings of
+        ``model`` most similar to the unit vector ``query``, optionally
+        restricted to the properties of the queryset ``restrict``.
+        """
+        start = time.perf_counter()
+        nprobe = nprobe or settings.VECTOR_SEARCH_NPROBE
+        query = np.asarray(query, dtype=np.float32)
+        embeddings = PropertyEmbedding.objects.filter(model=model)
+        if restrict is not None:
+            embeddings = embeddings.filter(property__in=restrict.values('id'))
+
+        files = self.current()
+        if files is None or files.model != model or files.dimensions != len(query):
+            # No usable index: every stored embedding is scored
+            scores, ids = exact_scan(embeddings, query, k)
+        else:
+            delta = embeddings.filter(updated_at__gte=files.built_at - timedelta(seconds=DELTA_OVERLAP_SECONDS))
+            delta_scores, delta_ids = exact_scan(delta, query, k)
+            changed = np.sort(np.array(
+                list(delta.values_list('property_id', flat=True)) if len(delta_ids) else [], dtype=np.int64
+            ))
+            allowed = None
+            if restrict is not None:
+                allowed = np.sort(np.fromiter(restrict.values_list('id', flat=True).iterator(), dtype=np.int64))
+            scores, ids = _merge([
+                files.search(query, k, nprobe, allowed, changed if len(changed) else None),
+                (delta_scores, delta_ids),
+            ], k)
+
+        logger.debug(f"Vector search of {model} took {(time.perf_counter() - start) * 1000:.1f}ms")
+        return [(int(property_id), float(score)) for property_id, score in zip(ids, scores)]
+
+
+vector_index = VectorIndex()
@@ -1,69 +1,87 @@
-import openai
+import logging
 import numpy as np
-from django.conf import settings
-from django.core.cache import cache
-from properties.models import Property
-from django.db import models
+from django.utils import timezone
+from properties.models import Property, PropertyEmbedding
+from .embeddings import get_embedding_backend, property_embedding_text, embedding_text_hash
+from .vector_index import vector_index
+
+logger = logging.getLogger(__name__)
 
 
 class VectorSearch:
-    """Vector search functionality using OpenAI embeddings"""
-    
-    def __init__(self):
-        self.openai_api_key = settings.OPENAI_API_KEY
-        self.embedding_dimensions = settings.EMBEDDING_DIMENSIONS
-        
-        if self.openai_api_key:
-            openai.api_key = self.openai_api_key
-    
+    """Vector search over stored property embeddings (see utils.vector_index)"""
+
+    def __init__(self, backend=None):
+        self.backend = get_embedding_backend(backend)
+        self.embedding_dimensions = self.backend.dimensions
+
     def get_embedding(self, text):
-        """Get embedding for text using OpenAI API"""
-        if not self.openai_api_key:
-            return None
-        
+        """Get the unit-length embedding of a text"""
         try:
-            response = openai.Embedding.create(
-                input=text,
-                model="text-embedding-ada-002"
-            )
-            return response['data'][0]['embedding']
+            return self.backend.embed([text])[0]
         except Exception as e:
-            print(f"Error getting embedding: {e}")
+            logger.error(f"Error getting embedding: {e}")
             return None
-    
-    def search_similar_properties(self, query, limit=10):
-        """Search for properties similar to the query"""
-        if not self.openai_api_key:
-            return Property.objects.none()
-        
-        # Get query embedding
+
+    def search_similar_properties(self, query, limit=10, queryset=None, nprobe=None):
+        """
+        Properties most similar to the query text, most similar first, each
+        with a ``similarity`` attribute (cosine). Only properties in
+        ``queryset`` are considered when it is given.
+        """
         query_embedding = self.get_embedding(query)
-        if not query_embedding:
-            return Property.objects.none()
-        
-        # For now, return properties with similar text content
-        # In a production system, you'd store embeddings in the database
-        # and perform vector similarity search
-        
-        # Simple text-based search as fallback
-        return Property.objects.filter(
-            models.Q(title__icontains=query) |
-            models.Q(description__icontains=query) |
-            models.Q(region__icontains=query)
-        )[:limit]
-    
+        if query_embedding is None:
+            return []
+        return self._properties(vector_index.search(query_embedding, self.backend.name, limit, queryset, nprobe))
+
+    def similar_to_property(self, property_obj, limit=10, queryset=None, nprobe=None):
+        """Properties most similar to ``property_obj``, excluding itself"""
+        embedding = self.get_property_embedding(property_obj)
+        if embedding is None:
+            return []
+        matches = vector_index.search(embedding, self.backend.name, limit + 1, queryset, nprobe)
+        return self._properties([match for match in matches if match[0] != property_obj.pk][:limit])
+
+    def _properties(self, matches):
+        properties = Property.objects.in_bulk([property_id for property_id, _ in matches])
+        results = []
+        for property_id, score in matches:
+            if property_id in properties:
+                property_obj = properties[property_id]
+                property_obj.similarity = score
+                results.append(property_obj)
+        return results
+
     def get_property_embedding(self, property_obj):
-        """Get embedding for a property"""
-        # Combine relevant property fields for embedding
-        text = f"{property_obj.title} {property_obj.description or ''} {property_obj.region} {property_obj.category or ''}"
-        return self.get_embedding(text)
-    
-    def cache_property_embedding(self, property_id, embedding):
-        """Cache property embedding"""
-        cache_key = f"property_embedding_{property_id}"
-        cache.set(cache_key, embedding, timeout=3600)  # Cache for 1 hour
-    
+        """Get the embedding of a property, computing and storing it if its text changed"""
+        text = property_embedding_text(property_obj.title, property_obj.description, property_obj.region, property_obj.category)
+        text_hash = embedding_text_hash(text)
+        stored = PropertyEmbedding.objects.filter(
+            property_id=property_obj.pk, model=self.backend.name, text_hash=text_hash
+        ).values_list('vector', flat=True).first()
+        if stored is not None:
+            return np.frombuffer(stored, dtype=np.float32)
+
+        embedding = self.get_embedding(text)
+        if embedding is not None:
+            self.cache_property_embedding(property_obj.pk, embedding, text_hash)
+        return embedding
+
+    def cache_property_embedding(self, property_id, embedding, text_hash=''):
+        """Store a property embedding"""
+        PropertyEmbedding.objects.update_or_create(
+            property_id=property_id,
+            defaults={
+                'model': self.backend.name,
+                'text_hash': text_hash,
+                'vector': np.asarray(embedding, dtype=np.float32).tobytes(),
+                'checked_at': timezone.now(),
+            }
+        )
+
     def get_cached_embedding(self, property_id):
-        """Get cached property embedding"""
-        cache_key = f"property_embedding_{property_id}"
-        return cache.get(cache_key)
+        """Get the stored embedding of a property"""
+        stored = PropertyEmbedding.objects.filter(
+            property_id=property_id, model=self.backend.name
+        ).values_list('vector', flat=True).first()
+        return None if stored is None else np.frombuffer(stored, dtype=np.float32)